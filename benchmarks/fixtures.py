@@ -0,0 +1,303 @@
+"""Фикстуры для бенчмарков: каталоги, версия, её файлы и моды по локальному HTTP.
+
+Всё генерируется из seed, поэтому разные запуски скачивают одни и те же байты.
+Лаунчер ходит на сервер через обычный mirrors.json: апстримы отображаются на ``<server>/<name>``.
+"""
+import hashlib
+import http.server
+import json
+import os
+import random
+import re
+import threading
+import time
+import zipfile
+
+UPSTREAMS = {
+    "mojang": "https://launchermeta.mojang.com",
+    "piston": "https://piston-data.mojang.com",
+    "libraries": "https://libraries.minecraft.net",
+    "assets": "https://resources.download.minecraft.net",
+    "forge": "https://files.minecraftforge.net",
+    "forge-maven": "https://maven.minecraftforge.net",
+    "fabric": "https://meta.fabricmc.net",
+    "fabric-maven": "https://maven.fabricmc.net",
+}
+
+VERSION_ID = "bench-1.0"
+FABRIC_LOADER_VERSION = "0.15.9"
+
+
+def _write(root, name, relative, data):
+    path = os.path.join(root, name, *relative.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(data)
+    return {
+        "url": f"{UPSTREAMS[name]}/{relative}",
+        "sha1": hashlib.sha1(data).hexdigest(),
+        "size": len(data),
+    }
+
+
+def build_fixtures(root, assets=1000, libraries=40, seed=0):
+    """Записывает в ``root`` манифест, JSON версии, индекс ассетов, файлы и каталоги загрузчиков."""
+    rng = random.Random(seed)
+
+    objects = {}
+    for number in range(assets):
+        data = rng.randbytes(rng.randint(512, 16 * 1024))
+        sha1 = hashlib.sha1(data).hexdigest()
+        _write(root, "assets", f"{sha1[:2]}/{sha1}", data)
+        objects[f"minecraft/bench/{number}.bin"] = {"hash": sha1, "size": len(data)}
+    asset_index = _write(
+        root, "piston", "v1/packages/bench/assets.json",
+        json.dumps({"objects": objects}).encode("utf-8"),
+    )
+
+    version_libraries = []
+    for number in range(libraries):
+        path = f"org/bench/lib{number}/1.0/lib{number}-1.0.jar"
+        artifact = _write(root, "libraries", path, rng.randbytes(rng.randint(32, 256) * 1024))
+        version_libraries.append({
+            "name": f"org.bench:lib{number}:1.0",
+            "downloads": {"artifact": {**artifact, "path": path}},
+        })
+    client = _write(root, "piston", "v1/objects/bench/client.jar", rng.randbytes(4 * 1024 * 1024))
+
+    version = {
+        "id": VERSION_ID,
+        "type": "release",
+        "mainClass": "net.minecraft.client.main.Main",
+        "minecraftArguments": "--username ${auth_player_name} --version ${version_name} "
+                              "--gameDir ${game_directory} --assetIndex ${assets_index_name} "
+                              "--uuid ${auth_uuid} --accessToken ${auth_access_token}",
+        "assets": "bench",
+        "assetIndex": {"id": "bench", **asset_index},
+        "downloads": {"client": client},
+        "libraries": version_libraries,
+    }
+    version_file = _write(
+        root, "piston", f"v1/packages/bench/{VERSION_ID}.json",
+        json.dumps(version).encode("utf-8"),
+    )
+
+    releases = [f"1.{minor}.{patch}" for minor in range(21, 7, -1) for patch in range(5)]
+    _write(root, "mojang", "mc/game/version_manifest_v2.json", json.dumps({
+        "latest": {"release": VERSION_ID, "snapshot": VERSION_ID},
+        "versions": [{"id": VERSION_ID, "type": "release", **version_file}] + [
+            {"id": release, "type": "release", "url": f"{UPSTREAMS['piston']}/missing/{release}.json"}
+            for release in releases
+        ],
+    }).encode("utf-8"))
+    _write(root, "forge", "net/minecraftforge/forge/promotions_slim.json", json.dumps({
+        "homepage": "https://files.minecraftforge.net/",
+        "promos": {
+            f"{release}-{kind}": f"{40 + index}.{patch}.0"
+            for index, release in enumerate(releases)
+            for patch, kind in enumerate(("latest", "recommended"))
+        },
+    }).encode("utf-8"))
+    _write(root, "fabric", "v2/versions/loader/index.json", json.dumps([
+        {
+            "separator": ".",
+            "build": build,
+            "maven": f"net.fabricmc:fabric-loader:0.{build // 10}.{build % 10}",
+            "version": f"0.{build // 10}.{build % 10}",
+            "stable": build % 3 == 0,
+        }
+        for build in range(160, 0, -1)
+    ]).encode("utf-8"))
+    # Профиль Fabric для тестовой версии, как его отдаёт meta.fabricmc.net
+    _write(
+        root, "fabric-maven",
+        f"net/fabricmc/fabric-loader/{FABRIC_LOADER_VERSION}/fabric-loader-{FABRIC_LOADER_VERSION}.jar",
+        rng.randbytes(64 * 1024),
+    )
+    _write(
+        root, "fabric",
+        f"v2/versions/loader/{VERSION_ID}/{FABRIC_LOADER_VERSION}/profile/json",
+        json.dumps({
+            "id": f"fabric-loader-{FABRIC_LOADER_VERSION}-{VERSION_ID}",
+            "inheritsFrom": VERSION_ID,
+            "type": "release",
+            "mainClass": "net.fabricmc.loader.impl.launch.knot.KnotClient",
+            "libraries": [{
+                "name": f"net.fabricmc:fabric-loader:{FABRIC_LOADER_VERSION}",
+                "url": f"{UPSTREAMS['fabric-maven']}/",
+            }],
+        }).encode("utf-8"),
+    )
+
+
+def write_mods(folder, count, seed=0):
+    """Создаёт ``count`` jar-файлов Fabric со связями зависимостей между ними."""
+    rng = random.Random(seed)
+    os.makedirs(folder, exist_ok=True)
+    for number in range(count):
+        metadata = {
+            "schemaVersion": 1,
+            "id": f"benchmod{number}",
+            "version": f"1.{number % 7}.{number % 13}",
+            "name": f"Bench Mod {number}",
+            "depends": {"fabricloader": ">=0.14", "minecraft": "1.20.x"},
+        }
+        if number:
+            metadata["depends"][f"benchmod{rng.randrange(number)}"] = "*"
+        with zipfile.ZipFile(os.path.join(folder, f"benchmod{number}.jar"), "w") as jar:
+            jar.writestr("fabric.mod.json", json.dumps(metadata))
+            for entry in range(20):
+                jar.writestr(f"bench/mod{number}/Class{entry}.class", rng.randbytes(2048))
+
+
+def mirrors_config(base_url):
+    return {
+        "mirrors": {
+            upstream: f"{base_url}/{name}" for name, upstream in UPSTREAMS.items()
+        }
+    }
+
+
+class FixtureServer:
+    """Локальный HTTP-сервер для ``root`` с задержкой, общим лимитом канала и докачкой.
+
+    ``bandwidth`` — байт в секунду на все соединения, 0 — без ограничения.
+    Для тестов умеет оборвать ответ (``cut``) или ответить кодом ошибки (``fail``);
+    все запросы пишутся в ``log``, ответы 304 по ETag считаются в ``not_modified``.
+    """
+
+    def __init__(self, root, latency_ms=0, bandwidth=0):
+        self.root = root
+        self.latency = latency_ms / 1000
+        self.bandwidth = bandwidth
+        self.requests = 0
+        self.log = []
+        self.not_modified = 0
+        self.cuts = {}
+        self.failures = {}
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def cut(self, path, times=1):
+        """Следующие ``times`` ответов на ``path`` обрываются на середине тела."""
+        with self._lock:
+            self.cuts[path] = self.cuts.get(path, 0) + times
+
+    def fail(self, path, *statuses):
+        """Следующие ответы на ``path`` — эти коды ошибок, по одному на запрос."""
+        with self._lock:
+            self.failures.setdefault(path, []).extend(statuses)
+
+    def _take(self, path):
+        # (код ошибки или None, оборвать ли ответ) для очередного запроса
+        with self._lock:
+            self.requests += 1
+            failures = self.failures.get(path)
+            if failures:
+                return failures.pop(0), False
+            if self.cuts.get(path):
+                self.cuts[path] -= 1
+                return None, True
+            return None, False
+
+    def _throttle(self, size):
+        # Общая очередь: каждый блок ждёт, пока «канал» освободится
+        with self._lock:
+            start = max(self._next_slot, time.monotonic())
+            self._next_slot = start + size / self.bandwidth
+        delay = self._next_slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _handler(self):
+        fixture = self
+
+        class Handler(http.server.SimpleHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=fixture.root, **kwargs)
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                status, cut = fixture._take(path)
+                with fixture._lock:
+                    fixture.log.append((path, self.headers.get("Range")))
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+                if status is not None:
+                    self.send_error(status)
+                    return
+                local_path = self.translate_path(path)
+                if os.path.isdir(local_path):
+                    # Ответ API, под которым есть и вложенные пути: v2/versions/loader/...
+                    local_path = os.path.join(local_path, "index.json")
+                if not os.path.isfile(local_path):
+                    self.send_error(404)
+                    return
+
+                stat = os.stat(local_path)
+                size = stat.st_size
+                etag = f'"{size}-{stat.st_mtime_ns}"'
+                if self.headers.get("If-None-Match") == etag:
+                    with fixture._lock:
+                        fixture.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                start = 0
+                match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range") or "")
+                if match:
+                    start = int(match[1])
+                    if start >= size:
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{size}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                self.send_response(206 if start else 200)
+                if start:
+                    self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(size - start))
+                self.end_headers()
+
+                with open(local_path, "rb") as source:
+                    source.seek(start)
+                    if cut:
+                        # Обрыв соединения: половина тела, затем закрытие
+                        self.wfile.write(source.read((size - start) // 2))
+                        self.wfile.flush()
+                        self.close_connection = True
+                        return
+                    self.copyfile(source, self.wfile)
+
+            def copyfile(self, source, outputfile):
+                if not fixture.bandwidth:
+                    return super().copyfile(source, outputfile)
+                for block in iter(lambda: source.read(16 * 1024), b""):
+                    fixture._throttle(len(block))
+                    outputfile.write(block)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,112 @@
+"""Время от старта процесса до показа окна лаунчера; каждый запуск — в новом интерпретаторе.
+
+    python benchmarks/startup.py --runs 10
+    python benchmarks/startup.py --runs 10 --json startup.json --max-ms 800
+
+Без дисплея используется платформа Qt "offscreen". С ``--max-ms`` код возврата 1,
+если медиана превышает бюджет.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def measure_once():
+    # Выполняется в дочернем процессе
+    started = time.perf_counter()
+    sys.path.insert(0, SRC_DIRECTORY)
+    os.chdir(SRC_DIRECTORY)
+
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv[:1])
+    qt_ready = time.perf_counter()
+
+    import bedrock
+    from theme import apply_theme
+
+    apply_theme(app)
+    imported = time.perf_counter()
+    window = bedrock.MainWindow()
+    constructed = time.perf_counter()
+    window.show()
+
+    result = {}
+
+    def shown():
+        result.update({
+            "qt_init_ms": (qt_ready - started) * 1000,
+            "import_ms": (imported - qt_ready) * 1000,
+            "construct_ms": (constructed - imported) * 1000,
+            "window_shown_ms": (time.perf_counter() - started) * 1000,
+        })
+        app.quit()
+
+    # Срабатывает после того, как цикл событий обработал показ и первую отрисовку
+    QTimer.singleShot(0, shown)
+    app.exec_()
+    print(json.dumps(result))
+
+
+def run_child(extra_env=None):
+    env = dict(os.environ, **(extra_env or {}))
+    if not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY") and os.name != "nt":
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    total_ms = (time.perf_counter() - started) * 1000
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = total_ms
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--max-ms", type=float, help="fail if median window_shown_ms exceeds this")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_once()
+        return 0
+
+    runs = [run_child() for _ in range(args.runs)]
+    summary = {
+        key: {
+            "median": statistics.median(run[key] for run in runs),
+            "min": min(run[key] for run in runs),
+            "max": max(run[key] for run in runs),
+        }
+        for key in runs[0]
+    }
+
+    for key, stats in summary.items():
+        print(f"{key:>16}: median {stats['median']:8.1f} ms  (min {stats['min']:.1f}, max {stats['max']:.1f})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"runs": runs, "summary": summary}, file, indent=2)
+
+    if args.max_ms is not None and summary["window_shown_ms"]["median"] > args.max_ms:
+        print(f"window_shown_ms median exceeds budget of {args.max_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""Бенчмарки установки, каталогов, старта и сканирования модов на локальном HTTP-сервере.
+
+Каждый запуск идёт в новом интерпретаторе со своими кэшем и настройками:
+
+    python benchmarks/suite.py --runs 3 --json results.json
+    python benchmarks/suite.py --latency-ms 50 --bandwidth-mbps 20 --cases install
+    python benchmarks/suite.py --json new.json --compare old.json
+
+Результаты пишутся в JSON вместе с коммитом, на котором они сняты.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SRC_DIRECTORY = os.path.join(BENCHMARKS_DIRECTORY, "..", "src")
+sys.path.insert(0, BENCHMARKS_DIRECTORY)
+
+import fixtures  # noqa: E402
+
+CASES = ("catalog", "install", "startup", "mods")
+MOD_COUNTS = (10, 100, 500)
+
+
+def _ms(started):
+    return (time.perf_counter() - started) * 1000
+
+
+# --- Child cases ---
+# Выполняются в дочернем процессе с отдельными каталогами кэша и настроек
+
+def child_catalog(state):
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv[:1])
+    import bedrock
+    from cache import metadata_cache
+
+    window = bedrock.MainWindow()
+    loaded = set()
+    window.catalog_loader.catalog_loaded_signal.connect(
+        lambda version_type, versions: loaded.add(version_type)
+    )
+
+    def wait_loaded():
+        while window.catalog_loader.isRunning() or len(loaded) < 3:
+            app.processEvents()
+            time.sleep(0.001)
+
+    wait_loaded()
+    result = {}
+    # Холодный: на диске и в памяти пусто, все три каталога идут в сеть
+    metadata_cache.invalidate()
+    loaded.clear()
+    started = time.perf_counter()
+    window.update_available_versions()
+    wait_loaded()
+    result["catalog_cold_ms"] = _ms(started)
+
+    # Тёплый: каталоги свежие, сеть не нужна
+    loaded.clear()
+    started = time.perf_counter()
+    window.update_available_versions()
+    wait_loaded()
+    result["catalog_warm_ms"] = _ms(started)
+    return result
+
+
+def child_install(state):
+    from launcher import build_command, prepare_version
+    from mirrors import patch_launcher_lib
+    from progress import ProgressTracker
+
+    patch_launcher_lib()
+
+    minecraft_directory = os.path.join(state, "minecraft")
+    result = {}
+
+    def timed(name, **kwargs):
+        tracker = ProgressTracker()
+        started = time.perf_counter()
+        plan = prepare_version(
+            fixtures.VERSION_ID, minecraft_directory, callback=tracker.callback(), **kwargs
+        )
+        result[name] = _ms(started)
+        return plan
+
+    # Тот же путь, что и LaunchThread.run: установка, план запуска, команда
+    timed("install_cold_ms")
+    plan = timed("install_warm_ms")
+    timed("install_repair_ms", repair=True)
+
+    started = time.perf_counter()
+    build_command(plan, minecraft_directory, "Bench")
+    result["launch_command_ms"] = _ms(started)
+    return result
+
+
+def child_mods(state):
+    from mods import ModIndex
+
+    result = {}
+    for count in MOD_COUNTS:
+        minecraft_directory = os.path.join(state, f"mods-{count}")
+        folder = os.path.join(minecraft_directory, "mods")
+        fixtures.write_mods(folder, count)
+
+        index = ModIndex(minecraft_directory)
+        started = time.perf_counter()
+        index.scan(folder)
+        index.save()
+        result[f"mods_{count}_cold_ms"] = _ms(started)
+
+        started = time.perf_counter()
+        ModIndex(minecraft_directory).scan(folder)
+        result[f"mods_{count}_warm_ms"] = _ms(started)
+    return result
+
+
+CHILD_CASES = {
+    "catalog": child_catalog,
+    "install": child_install,
+    "mods": child_mods,
+}
+
+
+# --- Parent ---
+
+def isolated_env(state, mirrors_path):
+    env = {
+        "XDG_CACHE_HOME": os.path.join(state, "cache"),
+        "XDG_CONFIG_HOME": os.path.join(state, "config"),
+        "LOCALAPPDATA": os.path.join(state, "cache"),
+        "APPDATA": os.path.join(state, "config"),
+        "BEDROCK_MIRRORS": mirrors_path,
+    }
+    if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY") and os.name != "nt":
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    return env
+
+
+def run_case(case, state, env):
+    if case == "startup":
+        import startup
+
+        # Холодный старт — пустые кэши, тёплый — второй запуск с теми же каталогами
+        cold = startup.run_child(env)
+        warm = startup.run_child(env)
+        return {
+            "startup_cold_ms": cold["window_shown_ms"],
+            "startup_warm_ms": warm["window_shown_ms"],
+        }
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", case, "--state", state],
+        env=dict(os.environ, **env),
+        capture_output=True,
+        text=True,
+    )
+    if output.returncode != 0:
+        raise RuntimeError(f"{case} failed:\n{output.stderr}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BENCHMARKS_DIRECTORY,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=BENCHMARKS_DIRECTORY,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as file:
+        baseline = json.load(file)["results"]
+    print(f"\nCompared with {baseline_path}:")
+    for metric, stats in results.items():
+        if metric not in baseline:
+            continue
+        old, new = baseline[metric]["median"], stats["median"]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{metric:>22}: {old:10.1f} -> {new:10.1f} ms  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated: " + ", ".join(CASES))
+    parser.add_argument("--latency-ms", type=float, default=20, help="added to every request")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="server uplink, 0 for unlimited")
+    parser.add_argument("--assets", type=int, default=1000, help="asset objects in the fixture version")
+    parser.add_argument("--libraries", type=int, default=40)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", metavar="JSON", help="print changes against an earlier result file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--state", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, SRC_DIRECTORY)
+        os.chdir(SRC_DIRECTORY)
+        print(json.dumps(CHILD_CASES[args.child](args.state)))
+        return 0
+
+    cases = [case for case in args.cases.split(",") if case]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    workspace = tempfile.mkdtemp(prefix="bedrock-bench-")
+    try:
+        fixture_root = os.path.join(workspace, "fixtures")
+        fixtures.build_fixtures(fixture_root, assets=args.assets, libraries=args.libraries)
+        bandwidth = int(args.bandwidth_mbps * 1000 * 1000 / 8)
+        runs = {}
+        with fixtures.FixtureServer(fixture_root, args.latency_ms, bandwidth) as server:
+            mirrors_path = os.path.join(workspace, "mirrors.json")
+            with open(mirrors_path, "w", encoding="utf-8") as file:
+                json.dump(fixtures.mirrors_config(server.url), file)
+
+            for case in cases:
+                for run in range(args.runs):
+                    state = os.path.join(workspace, f"{case}-{run}")
+                    os.makedirs(state)
+                    result = run_case(case, state, isolated_env(state, mirrors_path))
+                    for metric, value in result.items():
+                        runs.setdefault(metric, []).append(value)
+                    shutil.rmtree(state, ignore_errors=True)
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    results = {
+        metric: {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+            "runs": values,
+        }
+        for metric, values in runs.items()
+    }
+    for metric, stats in results.items():
+        print(f"{metric:>22}: median {stats['median']:10.1f} ms  (min {stats['min']:.1f}, max {stats['max']:.1f})")
+
+    commit, dirty = git_revision()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "runs": args.runs,
+            "latency_ms": args.latency_ms,
+            "bandwidth_mbps": args.bandwidth_mbps,
+            "assets": args.assets,
+            "libraries": args.libraries,
+            "mod_counts": list(MOD_COUNTS),
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,94 +1,32 @@
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSettings, QUrl, QTimer, QSize, QPropertyAnimation, QEasingCurve
+from PyQt5.QtCore import Qt, QSettings, QTimer, QFileSystemWatcher
 from PyQt5.QtWidgets import (
     QMainWindow, QApplication, QWidget, QLabel, QLineEdit, QComboBox,
-    QPushButton, QVBoxLayout, QHBoxLayout, QSpacerItem, QSizePolicy, QFileDialog,
-    QFrame, QGridLayout, QMessageBox,
-    QStyleFactory, QTabWidget,
-    QSpinBox, QCheckBox, QStyle, QStyleOption,
-    QGraphicsDropShadowEffect, QListWidget, QInputDialog
+    QVBoxLayout, QHBoxLayout, QMessageBox, QCheckBox
 )
-from PyQt5.QtGui import QFont, QIcon, QPixmap, QColor, QPainter, QPen, QLinearGradient, QPalette
-
-from minecraft_launcher_lib.utils import get_minecraft_directory, get_version_list, get_installed_versions
-from minecraft_launcher_lib.install import install_minecraft_version
-from minecraft_launcher_lib.command import get_minecraft_command
+from PyQt5.QtGui import QIcon, QPainter
 
 import random
 import string
-from uuid import uuid1
 from sys import argv, exit
 import os
-import requests
-import subprocess
 
 from constants import *
-from widgets import RoundedWidget, RoundedButton, InstallDirectoryWidget, MemorySettingsWidget, GraphicsSettingsWidget, TabWidget, ModManagerTab
-from threads import LaunchThread
+from paths import get_minecraft_directory
+from theme import apply_theme
+import tracing
+from images import load_scaled_pixmap, render_gradient
+from registry import InstalledVersionIndex
+from widgets import RoundedButton, InstallDirectoryWidget, MemorySettingsWidget, TelemetrySummaryWidget, GraphicsSettingsWidget, TabWidget, ModManagerTab, LazyTab, InstancesWidget, TraceWidget
+from threads import InstanceManager, CatalogLoader
 
 def generate_username(length=12):
     """Генерирует случайное имя пользователя."""
     return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
 
-def get_forge_versions():
-    url = "https://files.minecraftforge.net/net/minecraftforge/forge/promotions_slim.json"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        versions = data.get('promos', {})
-        return versions
-    else:
-        print("Failed to retrieve Forge versions")
-        return None
-
-def get_fabric_versions():
-    url = "https://meta.fabricmc.net/v2/versions/loader"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        versions = [entry['version'] for entry in data]
-        return versions
-    else:
-        print("Failed to retrieve Fabric versions")
-        return None
-
-def get_forge_download_link(mc_version):
-    url = "https://files.minecraftforge.net/maven/net/minecraftforge/forge/promotions_slim.json"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        versions = data.get('promos', {})
-        for version, build in versions.items():
-            if version.startswith(mc_version + "-"):
-                return f"https://files.minecraftforge.net/maven/net/minecraftforge/forge/{version}/forge-{version}-installer.jar"
-    else:
-        print("Failed to retrieve Forge download link")
-        return None
-
-def get_fabric_download_link(mc_version):
-    url = "https://meta.fabricmc.net/v2/versions/loader"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        for entry in data:
-            if entry['loader']['version'] == mc_version:
-                return entry['loader']['build']
-    else:
-        print("Failed to retrieve Fabric download link")
-        return None
-
-def download_file(url, path):
-    response = requests.get(url, stream=True)
-    if response.status_code == 200:
-        with open(path, 'wb') as file:
-            for chunk in response.iter_content(chunk_size=1024):
-                if chunk:
-                    file.write(chunk)
-        print(f"Downloaded {path}")
-    else:
-        print(f"Failed to download {url}")
-
 class MainWindow(QMainWindow):
     def __init__(self):
+        phase = tracing.phases("startup")
+        phase("window")
         super().__init__()
 
         self.setWindowTitle(LAUNCHER_NAME)
@@ -96,10 +34,8 @@ class MainWindow(QMainWindow):
         self.setWindowFlags(
             Qt.WindowMinimizeButtonHint | Qt.WindowCloseButtonHint
         )
-        self.setStyleSheet(f"""
-            font-family: Arial;
-            background-color: {MAIN_COLOR};
-        """)
+
+        self.background_pixmap = None
 
         # --- Set Icon ---
         self.setWindowIcon(QIcon("../images/favicon.ico"))
@@ -114,10 +50,14 @@ class MainWindow(QMainWindow):
         self.main_layout.setSpacing(15)
 
         # --- Logo ---
+        phase("logo")
         self.logo_label = QLabel(self.centralwidget)
         self.logo_label.setAlignment(Qt.AlignCenter)
-        pixmap = QPixmap("../images/banner.png")
-        self.logo_label.setPixmap(pixmap.scaledToWidth(1024)) # Adjust width as needed
+        self.logo_label.setPixmap(
+            load_scaled_pixmap(
+                "../images/banner.png", 1024, self.devicePixelRatioF()
+            )
+        ) # Adjust width as needed
         self.main_layout.addWidget(self.logo_label)
 
         # --- Title Label ---
@@ -125,9 +65,7 @@ class MainWindow(QMainWindow):
             LAUNCHER_NAME, self.centralwidget
         )
         self.title_label.setAlignment(Qt.AlignCenter)
-        self.title_label.setStyleSheet(
-            f"color: {TEXT_COLOR}; font-size: 24px; font-weight: bold;"
-        )
+        self.title_label.setProperty("role", "title")
         self.main_layout.addWidget(self.title_label)
 
         # --- Tab Widget ---
@@ -135,6 +73,7 @@ class MainWindow(QMainWindow):
         self.main_layout.addWidget(self.tab_widget)
 
         # --- Settings ---
+        phase("settings")
         self.settings = QSettings(
             COMPANY_NAME, LAUNCHER_NAME
         )
@@ -143,27 +82,63 @@ class MainWindow(QMainWindow):
         )
 
         # --- Create Tabs ---
+        # Все вкладки, кроме первой, создаются при первом открытии
+        phase("launch tab")
         self.create_launch_tab()
-        self.create_memory_tab()
-        self.create_graphics_tab()
-        self.create_mod_manager_tab()
-
-        # --- Launch Thread ---
-        self.launch_thread = LaunchThread(self)
-        self.launch_thread.state_update_signal.connect(
-            self.state_update
-        )
-        self.launch_thread.progress_update_signal.connect(
-            self.update_progress_label
+        phase("lazy tabs")
+        self.memory_lazy_tab = LazyTab(self.create_memory_tab)
+        self.tab_widget.addTab(self.memory_lazy_tab, "Memory")
+        self.graphics_lazy_tab = LazyTab(self.create_graphics_tab)
+        self.tab_widget.addTab(self.graphics_lazy_tab, "Graphics")
+        self.mod_manager_lazy_tab = LazyTab(self.create_mod_manager_tab)
+        self.tab_widget.addTab(self.mod_manager_lazy_tab, "Mod Manager")
+        self.instances_lazy_tab = LazyTab(self.create_instances_tab)
+        self.tab_widget.addTab(self.instances_lazy_tab, "Instances")
+        self.debug_lazy_tab = LazyTab(self.create_debug_tab)
+        self.tab_widget.addTab(self.debug_lazy_tab, "Debug")
+
+        # --- Instances ---
+        # Каждый запуск — отдельный поток установки и отдельный процесс игры
+        self.instance_manager = InstanceManager(self)
+        self.instance_manager.instance_added_signal.connect(
+            self.instance_added
+        )
+        self.installing = 0
+
+        # --- Version Catalogs ---
+        # None означает, что список ещё загружается
+        self.vanilla_versions = None
+        self.forge_versions = None
+        self.fabric_versions = None
+        # Версия, которую нужно выбрать, когда список загрузится
+        self.pending_version = None
+        self.catalog_loader = CatalogLoader(self)
+        self.catalog_loader.catalog_loaded_signal.connect(
+            self.catalog_loaded
+        )
+
+        # --- Installed Versions Index ---
+        phase("installed versions")
+        self.installed_index = InstalledVersionIndex()
+        self.versions_watcher = QFileSystemWatcher(self)
+        self.versions_watcher.directoryChanged.connect(
+            self.versions_directory_changed
+        )
+        # Установка создаёт много файлов подряд — обновляемся один раз после серии событий
+        self.versions_refresh_timer = QTimer(self)
+        self.versions_refresh_timer.setSingleShot(True)
+        self.versions_refresh_timer.setInterval(250)
+        self.versions_refresh_timer.timeout.connect(
+            self.refresh_installed_versions
         )
 
         self.update_installed_versions(
             self.install_directory_widget.install_directory
         )
 
-        self.forge_versions = {}
-        self.fabric_versions = {}
+        phase("catalog request")
         self.update_available_versions()
+        phase.end()
 
     def create_launch_tab(self):
         self.launch_tab = QWidget()
@@ -189,14 +164,38 @@ class MainWindow(QMainWindow):
             self.update_installed_versions
         )
 
+        # --- Shared Library/Asset Store ---
+        self.shared_store_checkbox = QCheckBox(
+            "Share libraries and assets between directories", self.launch_tab
+        )
+        self.shared_store_checkbox.setChecked(
+            self.settings.value("shared_store", False, type=bool)
+        )
+        self.shared_store_checkbox.stateChanged.connect(
+            lambda: self.settings.setValue(
+                "shared_store", self.shared_store_checkbox.isChecked()
+            )
+        )
+        self.launch_tab_layout.addWidget(self.shared_store_checkbox)
+
+        # --- Offline Mode ---
+        self.offline_checkbox = QCheckBox(
+            "Offline mode (use cached files only)", self.launch_tab
+        )
+        self.offline_checkbox.setChecked(
+            self.settings.value("offline_mode", False, type=bool)
+        )
+        self.offline_checkbox.stateChanged.connect(self.set_offline_mode)
+        if self.offline_checkbox.isChecked():
+            self.set_offline_mode()
+        self.launch_tab_layout.addWidget(self.offline_checkbox)
+
         # --- Username Input ---
         self.username_layout = QHBoxLayout()
         self.username_label = QLabel(
             "Username:", self.launch_tab
         )
-        self.username_label.setStyleSheet(
-            f"color: {TEXT_COLOR}; font-size: 12px; font-weight: bold;"
-        )
+        self.username_label.setProperty("role", "label")
         self.username_layout.addWidget(
             self.username_label
         )
@@ -205,13 +204,6 @@ class MainWindow(QMainWindow):
         self.username.setPlaceholderText(
             "Enter your username"
         )
-        self.username.setStyleSheet(f"""
-            color: {TEXT_COLOR};
-            border: 1px solid {ACCENT_COLOR};
-            border-radius: 5px;
-            padding: 5px;
-            background-color: {MAIN_COLOR};
-        """)
         self.username.setText(
             self.settings.value("username", "")
         )
@@ -227,9 +219,7 @@ class MainWindow(QMainWindow):
         self.installed_versions_label.setAlignment(
             Qt.AlignCenter
         )
-        self.installed_versions_label.setStyleSheet(
-            f"color: {TEXT_COLOR}; font-size: 14px; font-weight: bold;"
-        )
+        self.installed_versions_label.setProperty("role", "heading")
         self.launch_tab_layout.addWidget(
             self.installed_versions_label
         )
@@ -237,57 +227,40 @@ class MainWindow(QMainWindow):
         self.installed_versions_combobox = QComboBox(
             self.launch_tab
         )
-        self.installed_versions_combobox.setStyleSheet(f"""
-            color: {TEXT_COLOR};
-            border: 1px solid {ACCENT_COLOR};
-            border-radius: 5px;
-            padding: 5px;
-            background-color: {MAIN_COLOR};
-        """)
+        self.installed_versions_combobox.currentIndexChanged.connect(
+            self.update_version_select
+        )
         self.launch_tab_layout.addWidget(
             self.installed_versions_combobox
         )
 
         # --- Version Type Select ---
         self.version_type_select = QComboBox(self.launch_tab)
-        self.version_type_select.setStyleSheet(f"""
-            color: {TEXT_COLOR};
-            border: 1px solid {ACCENT_COLOR};
-            border-radius: 5px;
-            padding: 5px;
-            background-color: {MAIN_COLOR};
-        """)
         self.version_type_select.addItems(["Vanilla", "Forge", "Fabric"])
         self.version_type_select.currentIndexChanged.connect(self.update_version_select)
         self.launch_tab_layout.addWidget(self.version_type_select)
 
         # --- Version Select ---
         self.version_select = QComboBox(self.launch_tab)
-        self.version_select.setStyleSheet(f"""
-            color: {TEXT_COLOR};
-            border: 1px solid {ACCENT_COLOR};
-            border-radius: 5px;
-            padding: 5px;
-            background-color: {MAIN_COLOR};
-        """)
         self.launch_tab_layout.addWidget(
             self.version_select
         )
 
         # --- Checkbox для отображения консоли ---
         self.show_console_checkbox = QCheckBox("Show Console", self.launch_tab)
-        self.show_console_checkbox.setStyleSheet(
-            f"color: {TEXT_COLOR}; font-size: 12px;"
-        )
         self.launch_tab_layout.addWidget(self.show_console_checkbox)
 
+        # --- Repair Installation ---
+        self.repair_checkbox = QCheckBox(
+            "Repair installation (recheck all files)", self.launch_tab
+        )
+        self.launch_tab_layout.addWidget(self.repair_checkbox)
+
         # --- Progress Label ---
         self.progress_label = QLabel(self.launch_tab)
         self.progress_label.setText("")
         self.progress_label.setVisible(False)
-        self.progress_label.setStyleSheet(
-            f"color: {TEXT_COLOR}; font-size: 12px; font-weight: bold;"
-        )
+        self.progress_label.setProperty("role", "label")
         self.launch_tab_layout.addWidget(
             self.progress_label
         )
@@ -322,7 +295,20 @@ class MainWindow(QMainWindow):
             self.memory_settings_widget
         )
 
-        self.tab_widget.addTab(self.memory_tab, "Memory")
+        # Сводка последней сессии: размер кучи подбирается по фактическому расходу
+        self.telemetry_summary_widget = TelemetrySummaryWidget(
+            self.install_directory_widget.install_directory,
+            self.memory_settings_widget.memory_spinbox,
+            self,
+        )
+        self.install_directory_widget.directory_changed.connect(
+            self.telemetry_summary_widget.set_install_directory
+        )
+        self.memory_tab_layout.addWidget(
+            self.telemetry_summary_widget
+        )
+
+        return self.memory_tab
 
     def create_graphics_tab(self):
         self.graphics_tab = QWidget()
@@ -341,145 +327,313 @@ class MainWindow(QMainWindow):
             self.graphics_settings_widget
         )
 
-        self.tab_widget.addTab(
-            self.graphics_tab, "Graphics"
-        )
+        return self.graphics_tab
 
     def create_mod_manager_tab(self):
         self.mod_manager_tab = ModManagerTab(
-            self.install_directory
+            self.install_directory_widget.install_directory,
+            self.get_selected_version,
+        )
+        self.mod_manager_tab.profile_activated.connect(
+            self.apply_profile
+        )
+        return self.mod_manager_tab
+
+    def create_instances_tab(self):
+        self.instances_widget = InstancesWidget(self.instance_manager)
+        return self.instances_widget
+
+    def create_debug_tab(self):
+        self.trace_widget = TraceWidget()
+        return self.trace_widget
+
+    def instance_added(self, instance):
+        instance.state_update_signal.connect(self.state_update)
+        instance.progress_update_signal.connect(self.update_progress_label)
+        instance.launch_failed_signal.connect(self.launch_failed)
+        instance.mod_problems_signal.connect(self.mod_problems)
+        instance.process_started_signal.connect(
+            lambda process: self.game_started(instance)
         )
-        self.tab_widget.addTab(
-            self.mod_manager_tab, "Mod Manager"
+
+    def game_started(self, instance):
+        # Вывод игры всегда собирается; с "Show Console" открывается вкладка с её логом
+        if self.show_console_checkbox.isChecked():
+            self.instances_lazy_tab.ensure_built()
+            self.instances_widget.show_instance(instance)
+            self.tab_widget.setCurrentWidget(self.instances_lazy_tab)
+
+    def launch_failed(self, message):
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to launch Minecraft: {message}",
         )
 
+    def mod_problems(self, report):
+        QMessageBox.critical(
+            self,
+            "Mod problems",
+            "The game cannot start with the installed mods:\n\n"
+            f"{report}\n\n"
+            "Fix or remove these mods in the Mod Manager tab and launch again.",
+        )
+
+    def get_selected_version(self):
+        """Возвращает (загрузчик, версия игры, версия загрузчика) выбранного пункта."""
+        version_type = self.version_type_select.currentText()
+        version_id = self.get_minecraft_version().replace("(installed) ", "")
+        if version_type == "Forge":
+            # Ключ промо-версии Forge: "1.20.1-recommended"
+            return (
+                version_type,
+                version_id.rsplit("-", 1)[0],
+                (self.forge_versions or {}).get(version_id, ""),
+            )
+        if version_type == "Fabric":
+            return version_type, self.fabric_minecraft_version(version_id), version_id
+        return version_type, version_id, ""
+
+    def fabric_minecraft_version(self, loader_version):
+        # В списке Fabric только версии загрузчика. Версию игры знает установленный
+        # профиль fabric-loader-<загрузчик>-<версия>, если он один; иначе берём последний релиз
+        installed = self.installed_index.fabric_minecraft_versions(loader_version)
+        if len(installed) == 1:
+            return installed[0]
+        return next(
+            (
+                version["id"] for version in self.vanilla_versions or ()
+                if version["type"] == "release"
+            ),
+            "",
+        )
+
+    def forge_promotion(self, minecraft_version, build):
+        # Пункт списка Forge, соответствующий сборке из профиля
+        promotions = self.forge_versions or {}
+        candidates = [
+            f"{minecraft_version}-{kind}" for kind in ("recommended", "latest")
+        ]
+        for promotion in candidates:
+            if promotions.get(promotion) == build:
+                return promotion
+        return next(
+            (promotion for promotion in candidates if promotion in promotions), None
+        )
+
+    def apply_profile(self, profile):
+        # Профиль помнит, под какую версию и загрузчик он собран
+        version_type = profile.get("loader") or "Vanilla"
+        minecraft_version = profile.get("minecraft_version", "")
+        loader_version = profile.get("loader_version", "")
+        if version_type == "Fabric":
+            version_id = loader_version
+        elif version_type == "Forge":
+            version_id = self.forge_promotion(minecraft_version, loader_version)
+        else:
+            version_id = minecraft_version
+        if version_id:
+            self.select_version(version_type, version_id)
+
+    def select_version(self, version_type, version_id):
+        self.pending_version = version_id
+        if self.version_type_select.currentText() != version_type:
+            self.version_type_select.setCurrentText(version_type)
+        else:
+            self.update_version_select()
+
+    def sync_offline_checkbox(self):
+        # Автономный режим включают и mirrors.json ("offline": true), и BEDROCK_OFFLINE=1.
+        # Модуль зеркал к этому моменту уже загружен потоком каталогов; в настройки
+        # такое состояние не сохраняется
+        from mirrors import mirror_config
+
+        if mirror_config.offline and not self.offline_checkbox.isChecked():
+            self.offline_checkbox.blockSignals(True)
+            self.offline_checkbox.setChecked(True)
+            self.offline_checkbox.blockSignals(False)
+
+    def set_offline_mode(self):
+        # mirrors тянет за собой requests, поэтому импортируется только когда нужен
+        from mirrors import mirror_config
+
+        offline = self.offline_checkbox.isChecked()
+        self.settings.setValue("offline_mode", offline)
+        mirror_config.set_offline(offline)
+
     def state_update(self, value):
-        self.launch_button.setDisabled(value)
-        self.progress_label.setVisible(value)
+        # Кнопка запуска не блокируется: несколько версий могут ставиться одновременно
+        self.installing += 1 if value else -1
+        self.progress_label.setVisible(self.installing > 0)
 
     def launch_game(self):
-        version_type = self.version_type_select.currentText()
-        version_id = self.get_minecraft_version().replace("(installed) ", '')
+        if not self.version_select.isEnabled():
+            return
+
+        # Настройка памяти нужна для запуска, даже если вкладка не открывалась
+        self.memory_lazy_tab.ensure_built()
+
+        version_type, minecraft_version, loader_version = self.get_selected_version()
         username = self.username.text()
         memory_mb = (
             self.memory_settings_widget.memory_spinbox.value()
         )
 
-        if version_type == "Forge":
-            forge_link = get_forge_download_link(version_id)
-            if forge_link:
-                download_file(forge_link, os.path.join(self.install_directory, f"forge-{version_id}-installer.jar"))
-        elif version_type == "Fabric":
-            fabric_link = get_fabric_download_link(version_id)
-            if fabric_link:
-                download_file(fabric_link, os.path.join(self.install_directory, f"fabric-loader-{version_id}.jar"))
-
-        # Запуск игры с или без консоли
-        if self.show_console_checkbox.isChecked():
-            command = get_minecraft_command(version_id, username, memory_mb)
-            subprocess.Popen(command, creationflags=subprocess.CREATE_NEW_CONSOLE)
-        else:
-            self.launch_thread.launch_setup_signal.emit(
-                version_id, username, memory_mb
+        # Проверка модов и установка загрузчика идут в потоке запуска
+        with tracing.span("launch_game: start instance", type=version_type):
+            self.instance_manager.launch(
+                version_type, minecraft_version, loader_version, username, memory_mb
             )
-            self.launch_thread.start()
+        # Восстановление нужно только для этого запуска
+        self.repair_checkbox.setChecked(False)
 
     def get_minecraft_version(self):
         return self.version_select.currentText()
 
     def update_progress_label(
-        self, progress, progress_max, status
+        self, progress, progress_max, status, details=""
     ):
-        self.progress_label.setText(
-            f"{status} ({progress}/{progress_max})"
-        )
+        text = f"{status} ({progress}/{progress_max})"
+        if details:
+            text = f"{text}\n{details}"
+        self.progress_label.setText(text)
 
     def update_installed_versions(self, directory=None):
         if directory is None:
             directory = (
                 self.install_directory_widget.install_directory
             )
-        self.launch_thread.wait()
-        self.update_installed_versions_combobox(
-            directory
-        )
-
-    def update_installed_versions_combobox(self, directory):
+        self.installed_index.refresh(directory)
+        self.watch_versions_directory(directory)
+        self.update_installed_versions_combobox()
+
+    def watch_versions_directory(self, directory):
+        watched = self.versions_watcher.directories()
+        if watched:
+            self.versions_watcher.removePaths(watched)
+
+        versions_directory = os.path.join(directory, "versions")
+        if not os.path.isdir(versions_directory):
+            # Папки versions ещё нет — ждём её появления
+            if os.path.isdir(directory):
+                self.versions_watcher.addPath(directory)
+            return
+
+        paths = [versions_directory]
+        for entry in os.scandir(versions_directory):
+            if entry.is_dir():
+                paths.append(entry.path)
+        self.versions_watcher.addPaths(paths)
+
+    def versions_directory_changed(self, path):
+        self.versions_refresh_timer.start()
+
+    def refresh_installed_versions(self):
+        self.watch_versions_directory(
+            self.installed_index.minecraft_directory
+        )
+        if self.installed_index.refresh():
+            self.update_installed_versions_combobox()
+
+    def update_installed_versions_combobox(self):
         self.installed_versions_combobox.clear()
-        for version in get_installed_versions(directory):
-            self.installed_versions_combobox.addItem(
-                f"{version['id']} (installed)"
-            )
-
-        self.installed_versions_combobox.currentIndexChanged.connect(
-            self.update_version_select
-        )
+        self.installed_versions_combobox.addItems([
+            f"{version['id']} (installed)"
+            for version in self.installed_index
+        ])
 
     def update_version_select(self, index=None):
         self.version_select.clear()
 
         version_type = self.version_type_select.currentText()
-        installed_versions_list = get_installed_versions(self.install_directory_widget.install_directory)
+        catalog = self.get_catalog(version_type)
+        if catalog is None:
+            self.version_select.addItem("Loading versions...")
+            self.version_select.setEnabled(False)
+            return
+        self.version_select.setEnabled(True)
+
+        installed = self.installed_index
+        items = []
         if version_type == "Vanilla":
-            for version in get_version_list():    
+            for version in catalog:
                 version_id = version["id"]
-                if version in installed_versions_list:
+                if version_id in installed:
                     version_id = f"(installed) {version_id}"
-                self.version_select.addItem(version_id)
+                items.append(version_id)
         elif version_type == "Forge":
-            for version_id in self.forge_versions.keys():
-                if version_id in installed_versions_list:
+            for version_id, build in catalog.items():
+                if installed.is_forge_installed(version_id, build):
                     version_id = f"(installed) {version_id}"
-                self.version_select.addItem(version_id)
+                items.append(version_id)
         elif version_type == "Fabric":
-            for version_id in self.fabric_versions:
-                if version_id in installed_versions_list:
+            for version_id in catalog:
+                if installed.is_fabric_installed(version_id):
                     version_id = f"(installed) {version_id}"
-                self.version_select.addItem(version_id)
-
+                items.append(version_id)
 
+        self.version_select.addItems(items)
         self.version_select.setCurrentIndex(0)
+        if self.pending_version is not None:
+            for text in (self.pending_version, f"(installed) {self.pending_version}"):
+                index = self.version_select.findText(text)
+                if index >= 0:
+                    self.version_select.setCurrentIndex(index)
+                    break
+            self.pending_version = None
+
+    def get_catalog(self, version_type):
+        if version_type == "Vanilla":
+            return self.vanilla_versions
+        elif version_type == "Forge":
+            return self.forge_versions
+        elif version_type == "Fabric":
+            return self.fabric_versions
 
     def update_available_versions(self):
-        self.forge_versions = get_forge_versions()
-        self.fabric_versions = get_fabric_versions()
+        if self.catalog_loader.isRunning():
+            return
         self.update_version_select()
+        self.catalog_loader.start()
+
+    def catalog_loaded(self, version_type, versions):
+        self.sync_offline_checkbox()
+        if version_type == "Vanilla":
+            self.vanilla_versions = versions or []
+        elif version_type == "Forge":
+            self.forge_versions = versions or {}
+        elif version_type == "Fabric":
+            self.fabric_versions = versions or []
+
+        if version_type == self.version_type_select.currentText():
+            self.update_version_select()
 
     def paintEvent(self, event):
-        # Рисуем градиент на фоне
+        # Рисуем градиент на фоне; он перерисовывается только при смене размера
+        device_pixel_ratio = self.devicePixelRatioF()
+        if (
+            self.background_pixmap is None
+            or self.background_pixmap.size() != self.size() * device_pixel_ratio
+        ):
+            self.background_pixmap = render_gradient(
+                self.size(),
+                device_pixel_ratio,
+                GRADIENT_TOP_COLOR,
+                GRADIENT_BOTTOM_COLOR,
+            )
         painter = QPainter(self)
-        gradient = QLinearGradient(
-            self.rect().topLeft(), self.rect().bottomLeft()
-        )
-        gradient.setColorAt(
-            0.0, QColor("#2c3e50")
-        ) 
-        gradient.setColorAt(
-            1.0, QColor("#4ca1af")
-        ) 
-        painter.fillRect(self.rect(), gradient)
+        painter.drawPixmap(0, 0, self.background_pixmap)
         painter.end()
 
 if __name__ == "__main__":
+    # Трассировка включается до создания окна, чтобы попали и фазы запуска
+    if os.environ.get("BEDROCK_TRACE") or QSettings(COMPANY_NAME, LAUNCHER_NAME).value(
+        "tracing", False, type=bool
+    ):
+        tracing.enable()
+
     app = QApplication(argv)
-    app.setStyle(QStyleFactory.create("Fusion"))
-
-    # Применяем темную палитру к QApplication
-    palette = QPalette()
-    palette.setColor(QPalette.Window, QColor(MAIN_COLOR))
-    palette.setColor(QPalette.WindowText, Qt.white)
-    palette.setColor(QPalette.Base, QColor(ACCENT_COLOR))
-    palette.setColor(QPalette.AlternateBase, QColor(MAIN_COLOR))
-    palette.setColor(QPalette.ToolTipBase, Qt.white)
-    palette.setColor(QPalette.ToolTipText, Qt.white)
-    palette.setColor(QPalette.Text, Qt.white)
-    palette.setColor(QPalette.Button, QColor(ACCENT_COLOR))
-    palette.setColor(QPalette.ButtonText, Qt.white)
-    palette.setColor(QPalette.BrightText, Qt.red)
-    palette.setColor(QPalette.Link, QColor(BLUE))
-    palette.setColor(QPalette.Highlight, QColor(BLUE))
-    palette.setColor(QPalette.HighlightedText, Qt.black)
-    app.setPalette(palette)
+    apply_theme(app)
 
     window = MainWindow()
     window.show()
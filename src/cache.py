@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+import time
+from email.utils import formatdate
+
+import requests
+
+from mirrors import mirror_config
+from network import http_client
+from paths import cache_directory, write_atomic
+
+
+class MetadataCache:
+    """Дисковый кэш каталогов версий: в пределах TTL без сети, потом условный GET по ETag/Last-Modified."""
+
+    def __init__(self, directory=None, timeout=10):
+        self.directory = directory or cache_directory("metadata")
+        os.makedirs(self.directory, exist_ok=True)
+        self.timeout = timeout
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _paths(self, source):
+        return (
+            os.path.join(self.directory, f"{source}.json"),
+            os.path.join(self.directory, f"{source}.meta.json"),
+        )
+
+    def _load(self, source):
+        with self._lock:
+            if source in self._entries:
+                return self._entries[source]
+
+        body_path, meta_path = self._paths(source)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            with open(body_path, "rb") as file:
+                entry["data"] = json.loads(file.read())
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self._entries[source] = entry
+        return entry
+
+    def _write_meta(self, source, entry):
+        _, meta_path = self._paths(source)
+        meta = {key: value for key, value in entry.items() if key != "data"}
+        write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _store(self, source, url, response):
+        data = response.json()
+        entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "data": data,
+        }
+        body_path, _ = self._paths(source)
+        write_atomic(body_path, response.content)
+        self._write_meta(source, entry)
+        with self._lock:
+            self._entries[source] = entry
+        return data
+
+    def _revalidate(self, source, url, entry):
+        headers = {}
+        if entry is not None and entry.get("url") == url:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            elif not entry.get("etag"):
+                headers["If-Modified-Since"] = formatdate(
+                    entry["fetched_at"], usegmt=True
+                )
+
+        response = http_client.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and headers:
+            entry["fetched_at"] = time.time()
+            self._write_meta(source, entry)
+            return entry["data"]
+        response.raise_for_status()
+        return self._store(source, url, response)
+
+    def _refresh_in_background(self, source, url):
+        with self._lock:
+            if source in self._refreshing:
+                return
+            self._refreshing.add(source)
+
+        def refresh():
+            try:
+                self._revalidate(source, url, self._load(source))
+            except (requests.RequestException, ValueError) as e:
+                print(f"Failed to refresh {source} metadata: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(source)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def get(self, source, url, ttl, stale_while_revalidate=True):
+        """Разобранный JSON источника ``source`` или None, если его не получить."""
+        entry = self._load(source)
+        if mirror_config.offline:
+            # Без сети отдаём то, что есть, сколько бы ему ни было лет
+            return entry["data"] if entry is not None else None
+        if entry is not None and entry.get("url") == url:
+            if time.time() - entry["fetched_at"] < ttl:
+                return entry["data"]
+            if stale_while_revalidate:
+                self._refresh_in_background(source, url)
+                return entry["data"]
+
+        try:
+            return self._revalidate(source, url, entry)
+        except (requests.RequestException, ValueError) as e:
+            if entry is not None:
+                print(f"Failed to refresh {source} metadata, using cached copy: {e}")
+                return entry["data"]
+            print(f"Failed to retrieve {source} metadata: {e}")
+            return None
+
+    def invalidate(self, source=None):
+        if source is None:
+            sources = [
+                filename[: -len(".meta.json")]
+                for filename in os.listdir(self.directory)
+                if filename.endswith(".meta.json")
+            ]
+        else:
+            sources = [source]
+        with self._lock:
+            for name in sources:
+                self._entries.pop(name, None)
+        for name in sources:
+            for path in self._paths(name):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+metadata_cache = MetadataCache()
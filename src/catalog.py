@@ -0,0 +1,80 @@
+from constants import *
+from cache import metadata_cache
+
+def get_vanilla_versions():
+    manifest = metadata_cache.get(
+        "mojang", MOJANG_MANIFEST_URL, METADATA_TTL["mojang"]
+    )
+    if manifest is None:
+        print("Failed to retrieve Minecraft versions")
+        return []
+    return manifest.get('versions', [])
+
+def get_forge_versions():
+    data = metadata_cache.get(
+        "forge", FORGE_PROMOTIONS_URL, METADATA_TTL["forge"]
+    )
+    if data is None:
+        print("Failed to retrieve Forge versions")
+        return None
+    versions = data.get('promos', {})
+    return versions
+
+def get_fabric_versions():
+    data = metadata_cache.get(
+        "fabric", FABRIC_LOADER_URL, METADATA_TTL["fabric"]
+    )
+    if data is None:
+        print("Failed to retrieve Fabric versions")
+        return None
+    versions = [entry['version'] for entry in data]
+    return versions
+
+def get_forge_build(mc_version):
+    """Рекомендованная (или последняя) сборка Forge для версии игры."""
+    versions = get_forge_versions() or {}
+    return versions.get(f"{mc_version}-recommended") or versions.get(f"{mc_version}-latest")
+
+def get_fabric_loader_version():
+    """Последняя стабильная версия загрузчика Fabric."""
+    data = metadata_cache.get(
+        "fabric", FABRIC_LOADER_URL, METADATA_TTL["fabric"]
+    )
+    for entry in data or []:
+        if entry.get('stable'):
+            return entry['version']
+    return None
+
+def get_fabric_profile(mc_version, loader_version):
+    """JSON версии Fabric — тот же, что пишет fabric-installer, только без запуска Java."""
+    from network import http_client
+
+    response = http_client.get(
+        f"{FABRIC_LOADER_URL}/{mc_version}/{loader_version}/profile/json"
+    )
+    if response.status_code != 200:
+        print(f"Failed to retrieve Fabric {loader_version} for {mc_version}: HTTP {response.status_code}")
+        return None
+    return response.content
+
+def get_forge_download_link(mc_version):
+    versions = get_forge_versions()
+    if versions is None:
+        print("Failed to retrieve Forge download link")
+        return None
+    for version, build in versions.items():
+        if version == mc_version or version.startswith(mc_version + "-"):
+            forge_version = f"{version.rsplit('-', 1)[0]}-{build}"
+            return f"{FORGE_MAVEN_URL}/{forge_version}/forge-{forge_version}-installer.jar"
+
+def get_fabric_download_link(mc_version):
+    data = metadata_cache.get(
+        "fabric", FABRIC_LOADER_URL, METADATA_TTL["fabric"]
+    )
+    if data is None:
+        print("Failed to retrieve Fabric download link")
+        return None
+    for entry in data:
+        if entry['version'] == mc_version:
+            group, artifact, version = entry['maven'].split(":")
+            return f"{FABRIC_MAVEN_URL}/{group.replace('.', '/')}/{artifact}/{version}/{artifact}-{version}.jar"
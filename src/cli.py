@@ -0,0 +1,325 @@
+"""Консольный вход без Qt: подготовка версий на машинах без GUI и при сборке образов.
+
+    python cli.py install 1.20.1 profile:Survival -d /srv/minecraft
+    python cli.py install fabric:1.20.1@0.15.11 forge:1.20.1
+    python cli.py launch 1.20.1 -u Steve
+
+Прогресс и результат печатаются в stdout построчно в JSON; при любой ошибке
+код возврата ненулевой.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+
+from constants import *
+from paths import get_minecraft_directory
+from progress import ProgressTracker
+import telemetry
+
+_events = sys.stdout
+
+
+def emit(event, **fields):
+    print(json.dumps({"event": event, **fields}, ensure_ascii=False), file=_events, flush=True)
+
+
+class ProgressPrinter:
+    """Печатает снимки ``ProgressTracker`` с той же частотой, что и GUI."""
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.revision = -1
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+        self.publish()
+
+    def _run(self):
+        while not self.stopped.wait(1 / PROGRESS_UPDATE_RATE):
+            self.publish()
+
+    def publish(self):
+        snapshot = self.tracker.snapshot()
+        if snapshot["revision"] == self.revision:
+            return
+        self.revision = snapshot.pop("revision")
+        emit("progress", **snapshot)
+
+
+VERSION_TYPES = {"vanilla": "Vanilla", "forge": "Forge", "fabric": "Fabric"}
+
+
+def parse_target(target):
+    # "1.20.1", "vanilla:1.20.1", "fabric:1.20.1@0.15.11", "forge:1.20.1@47.2.0",
+    # "profile:Survival"; без версии загрузчика берётся рекомендованная
+    kind, _, name = target.rpartition(":")
+    kind = kind.lower() or "vanilla"
+    if kind not in (*VERSION_TYPES, "profile"):
+        raise argparse.ArgumentTypeError(f"unknown version type: {kind}")
+    if not name:
+        raise argparse.ArgumentTypeError(f"empty version in {target!r}")
+    return kind, name
+
+
+def resolve_targets(targets, minecraft_directory):
+    """Раскрывает профили модов; возвращает [(загрузчик, версия игры, версия загрузчика)]."""
+    versions = []
+    for kind, name in targets:
+        if kind != "profile":
+            minecraft_version, _, loader_version = name.partition("@")
+            versions.append((VERSION_TYPES[kind], minecraft_version, loader_version))
+            continue
+
+        from profiles import ModProfiles
+
+        profiles = ModProfiles(minecraft_directory)
+        profile = profiles.get(name)
+        if profile is None:
+            raise LookupError(f"Mod profile {name} not found")
+        missing = profiles.missing(name)
+        if missing:
+            raise LookupError(
+                f"Mod profile {name} is missing {', '.join(missing)} in the library"
+            )
+        version_type = profile.get("loader") or "Vanilla"
+        if version_type in ("Forge", "Fabric") and not profile["minecraft_version"]:
+            raise ValueError(
+                f"Mod profile {name} does not record its Minecraft version, "
+                "install it with fabric: or forge: instead"
+            )
+        if profile["minecraft_version"]:
+            versions.append(
+                (version_type, profile["minecraft_version"], profile["loader_version"])
+            )
+        emit("profile", profile=name, mods=len(profile["mods"]))
+    return list(dict.fromkeys(versions))
+
+
+def install_loaders(versions, minecraft_directory, **kwargs):
+    """Ставит загрузчики целей; возвращает [(загрузчик, id версии для запуска)]."""
+    from launcher import install_loader
+
+    installed = []
+    for version_type, minecraft_version, loader_version in versions:
+        version_id = install_loader(
+            version_type, minecraft_version, loader_version, minecraft_directory, **kwargs
+        )
+        if version_id != minecraft_version:
+            emit("loader", type=version_type, version=version_id)
+        installed.append((version_type, version_id))
+    return installed
+
+
+def get_store(arguments):
+    if arguments.store is None:
+        return None
+    from store import ContentStore
+
+    return ContentStore(arguments.store or None)
+
+
+def install(arguments):
+    from launcher import prepare_versions
+
+    minecraft_directory = arguments.directory
+    targets = resolve_targets(arguments.targets, minecraft_directory)
+    options = {
+        "workers": arguments.workers,
+        "store": get_store(arguments),
+        "repair": arguments.repair,
+    }
+
+    tracker = ProgressTracker()
+    with ProgressPrinter(tracker):
+        # Загрузчику Fabric хватает JSON версии, его библиотеки идут в общую очередь
+        versions = install_loaders(
+            targets, minecraft_directory, callback=tracker.callback(), **options
+        )
+        prepare_versions(
+            [version_id for _, version_id in versions],
+            minecraft_directory,
+            callback=tracker.callback(),
+            **options,
+        )
+    for version_type, version_id in versions:
+        emit("installed", type=version_type, version=version_id)
+
+    if arguments.activate:
+        from profiles import ModProfiles
+
+        ModProfiles(minecraft_directory).activate(arguments.activate)
+        emit("activated", profile=arguments.activate)
+    return 0
+
+
+def launch(arguments):
+    from random_username.generate import generate_username
+    from launcher import build_command, prepare_version
+    from process import GameProcess
+
+    minecraft_directory = arguments.directory
+    if arguments.target[0] == "profile":
+        raise ValueError("launch takes a version, activate the profile with install --activate")
+    options = {
+        "workers": arguments.workers,
+        "store": get_store(arguments),
+        "repair": arguments.repair,
+    }
+
+    tracker = ProgressTracker()
+    with ProgressPrinter(tracker):
+        [(_, version_id)] = install_loaders(
+            resolve_targets([arguments.target], minecraft_directory),
+            minecraft_directory,
+            callback=tracker.callback(),
+            **options,
+        )
+        launch_plan = prepare_version(
+            version_id,
+            minecraft_directory,
+            callback=tracker.callback(),
+            **options,
+        )
+
+    telemetry_path = gc_log = None
+    if arguments.telemetry:
+        telemetry_path, gc_log = telemetry.session_paths(minecraft_directory)
+
+    username = arguments.username or generate_username()[0]
+    command = build_command(
+        launch_plan,
+        minecraft_directory,
+        username,
+        memory_mb=arguments.memory,
+        preset=arguments.preset,
+        gc_log=gc_log,
+    )
+    process = GameProcess(command, cwd=minecraft_directory)
+    if telemetry_path:
+        process.telemetry = telemetry.TelemetrySampler(
+            process, telemetry_path, gc_log, telemetry.heap_limit_mb(command)
+        ).start()
+    emit("started", version=version_id, username=username, pid=process.pid)
+
+    position = 0
+    while True:
+        running = process.is_running()
+        lines, position, dropped = process.log.since(position)
+        for line in lines:
+            emit("log", line=line)
+        if not running:
+            break
+        process.reader.join(0.2)
+    returncode = process.wait()
+    for line in process.log.since(position)[0]:
+        emit("log", line=line)
+    if process.telemetry is not None:
+        process.telemetry.thread.join(process.telemetry.interval + 1)
+        emit("telemetry", **telemetry.summarize(telemetry_path))
+    emit("exited", returncode=returncode)
+    return returncode
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description=f"{LAUNCHER_NAME} without a GUI"
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "-d", "--directory", default=get_minecraft_directory(),
+        help="Minecraft directory (default: %(default)s)",
+    )
+    common.add_argument(
+        "--workers", type=int, default=DOWNLOAD_WORKERS,
+        help="parallel downloads (default: %(default)s)",
+    )
+    common.add_argument(
+        "--store", nargs="?", const="", default=None, metavar="DIR",
+        help="link libraries and assets from a shared content store",
+    )
+    common.add_argument(
+        "--repair", action="store_true", help="re-verify every installed file"
+    )
+    common.add_argument(
+        "--mirrors", metavar="FILE", help="mirror configuration (JSON)"
+    )
+    common.add_argument(
+        "--trace", metavar="FILE", help="write a Chrome trace of the install phases"
+    )
+    common.add_argument(
+        "--offline", action="store_true",
+        help="use only cached catalogs and installed files, never the network",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    install_parser = subparsers.add_parser(
+        "install", parents=[common],
+        help="install versions, loaders and mod profiles in one shared download queue",
+    )
+    install_parser.add_argument(
+        "targets", nargs="+", type=parse_target, metavar="TARGET",
+        help="[vanilla:]VERSION, fabric:VERSION[@LOADER], forge:VERSION[@BUILD] or profile:NAME",
+    )
+    install_parser.add_argument(
+        "--activate", metavar="PROFILE", help="activate this mod profile afterwards"
+    )
+    install_parser.set_defaults(handler=install)
+
+    launch_parser = subparsers.add_parser(
+        "launch", parents=[common], help="install if needed and run the game"
+    )
+    launch_parser.add_argument("target", type=parse_target, metavar="VERSION")
+    launch_parser.add_argument("-u", "--username", default="")
+    launch_parser.add_argument(
+        "--memory", type=int, default=0, help="heap size in MB, 0 for automatic"
+    )
+    launch_parser.add_argument("--preset", default=None, help="JVM preset")
+    launch_parser.add_argument(
+        "--no-telemetry", dest="telemetry", action="store_false",
+        help="do not record RSS, CPU, threads and GC statistics of the game",
+    )
+    launch_parser.set_defaults(handler=launch)
+    return parser
+
+
+def main(argv=None):
+    arguments = build_parser().parse_args(argv)
+    arguments.directory = os.path.abspath(arguments.directory)
+    # В stdout идут только события JSON; диагностика библиотек уходит в stderr
+    global _events
+    _events = sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            if arguments.trace:
+                import tracing
+
+                tracing.enable(os.path.abspath(arguments.trace))
+            from mirrors import mirror_config, patch_launcher_lib
+
+            if arguments.mirrors:
+                mirror_config.load(arguments.mirrors)
+            if arguments.offline:
+                mirror_config.set_offline(True)
+            # Java-среды и Forge minecraft_launcher_lib скачивает сам — через те же зеркала
+            patch_launcher_lib()
+            return arguments.handler(arguments)
+    except KeyboardInterrupt:
+        emit("error", message="Interrupted")
+        return 130
+    except Exception as e:
+        emit("error", message=str(e), type=type(e).__name__)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
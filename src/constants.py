@@ -8,5 +8,60 @@ RED = "#b45063"  # Red for errors
 BLUE = "#61afef"  # Blue for active elements
 BORDER_COLOR = "#4c566a"  # Border color
 PROGRESS_BAR_COLOR = "#61afef"  # Blue for progress bar
+HOVER_COLOR = "#5e667b"  # Buttons under the mouse
+PRESSED_COLOR = "#434b5c"  # Pressed buttons
 COMPANY_NAME = "MyCompany"
-LAUNCHER_NAME = "Bedrock Launcher"
\ No newline at end of file
+LAUNCHER_NAME = "Bedrock Launcher"
+CACHE_DIRECTORY_NAME = "bedrock-launcher"
+LAUNCHER_DATA_DIRECTORY = ".bedrock-launcher"
+
+MOJANG_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+FORGE_PROMOTIONS_URL = "https://files.minecraftforge.net/net/minecraftforge/forge/promotions_slim.json"
+FABRIC_LOADER_URL = "https://meta.fabricmc.net/v2/versions/loader"
+
+# Время жизни кэша метаданных (в секундах) для каждого источника
+METADATA_TTL = {
+    "mojang": 10 * 60,
+    "forge": 60 * 60,
+    "fabric": 30 * 60,
+}
+
+FORGE_MAVEN_URL = "https://maven.minecraftforge.net/net/minecraftforge/forge"
+FABRIC_MAVEN_URL = "https://maven.fabricmc.net"
+
+# Настройки общего HTTP-клиента
+HTTP_TIMEOUT = 15
+HTTP_RETRIES = 3
+HTTP_BACKOFF = 0.5
+# Ответы сервера, после которых запрос имеет смысл повторить
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_POOL_HOSTS = 10
+HTTP_POOL_SIZE = 16
+
+LIBRARIES_URL = "https://libraries.minecraft.net"
+ASSETS_URL = "https://resources.download.minecraft.net"
+
+# Количество параллельных загрузок при установке версии
+DOWNLOAD_WORKERS = 16
+DOWNLOAD_RETRIES = 4
+DOWNLOAD_MIN_CHUNK = 64 * 1024
+DOWNLOAD_MAX_CHUNK = 1024 * 1024
+
+# Частота обновления индикатора прогресса в GUI (раз в секунду)
+PROGRESS_UPDATE_RATE = 30
+
+# Консоль игры: сколько строк лога хранить и как часто обновлять виджет (раз в секунду)
+CONSOLE_MAX_LINES = 5000
+CONSOLE_MAX_LINE_LENGTH = 8192
+CONSOLE_UPDATE_RATE = 10
+
+# Цвета фонового градиента главного окна
+GRADIENT_TOP_COLOR = "#2c3e50"
+GRADIENT_BOTTOM_COLOR = "#4ca1af"
+
+# Сколько последних файлов трассировки хранить в кэше
+TRACE_MAX_SESSIONS = 20
+
+# Телеметрия запущенной игры: интервал выборки (с) и сколько последних сессий хранить
+TELEMETRY_INTERVAL = 2.0
+TELEMETRY_MAX_SESSIONS = 20
@@ -0,0 +1,56 @@
+import os
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QLinearGradient, QPainter, QPixmap
+
+from paths import cache_directory
+
+
+def load_scaled_pixmap(source, width, device_pixel_ratio=1.0):
+    """Загружает картинку шириной ``width`` через кэш на диске (BMP для непрозрачных)."""
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return QPixmap(source)
+
+    name = os.path.splitext(os.path.basename(source))[0]
+    key = f"{name}-{width}@{device_pixel_ratio:g}x-{stat.st_size}-{stat.st_mtime_ns}"
+    directory = cache_directory("images")
+
+    pixmap = QPixmap()
+    for extension in ("bmp", "png"):
+        cached = os.path.join(directory, f"{key}.{extension}")
+        if os.path.isfile(cached) and pixmap.load(cached):
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+            return pixmap
+
+    pixmap = QPixmap(source)
+    if pixmap.isNull():
+        return pixmap
+    pixmap = pixmap.scaledToWidth(
+        round(width * device_pixel_ratio), Qt.SmoothTransformation
+    )
+    # Копии от прежних версий исходного файла больше не нужны
+    prefix = f"{name}-{width}@{device_pixel_ratio:g}x-"
+    for filename in os.listdir(directory):
+        if filename.startswith(prefix):
+            os.remove(os.path.join(directory, filename))
+    if pixmap.hasAlphaChannel():
+        pixmap.save(os.path.join(directory, f"{key}.png"), "PNG", 100)
+    else:
+        pixmap.save(os.path.join(directory, f"{key}.bmp"), "BMP")
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    return pixmap
+
+
+def render_gradient(size, device_pixel_ratio, top_color, bottom_color):
+    """Рисует вертикальный градиент в pixmap заданного размера."""
+    pixmap = QPixmap(size * device_pixel_ratio)
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    painter = QPainter(pixmap)
+    gradient = QLinearGradient(0, 0, 0, size.height())
+    gradient.setColorAt(0.0, QColor(top_color))
+    gradient.setColorAt(1.0, QColor(bottom_color))
+    painter.fillRect(0, 0, size.width(), size.height(), gradient)
+    painter.end()
+    return pixmap
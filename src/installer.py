@@ -0,0 +1,394 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Optional
+
+from minecraft_launcher_lib._helper import (
+    check_path_inside_minecraft_directory, get_library_path, inherit_json, parse_rule_list
+)
+from minecraft_launcher_lib.natives import extract_natives_file, get_natives
+from minecraft_launcher_lib.runtime import get_installed_jvm_runtimes, install_jvm_runtime
+
+from constants import *
+from cache import metadata_cache
+from network import DownloadError, download_file
+from verification import VerifiedFiles
+import tracing
+
+
+class InstallError(Exception):
+    pass
+
+
+# Две версии с одной средой Java, которые ставятся в один каталог одновременно,
+# не должны распаковывать её поверх друг друга
+_runtime_locks = {}
+_runtime_locks_lock = threading.Lock()
+
+
+def _runtime_lock(minecraft_directory, component):
+    key = (os.path.realpath(minecraft_directory), component)
+    with _runtime_locks_lock:
+        return _runtime_locks.setdefault(key, threading.Lock())
+
+
+@dataclass
+class DownloadTask:
+    url: str
+    path: str
+    sha1: Optional[str] = None
+    size: Optional[int] = None
+    optional: bool = False
+
+
+@dataclass
+class InstallPlan:
+    version_id: str
+    version_data: dict
+    downloads: list
+    natives: list
+
+
+def empty(*args):
+    pass
+
+
+def file_sha1(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def is_file_valid(path, sha1=None, size=None):
+    """Проверяет, что файл уже скачан и совпадает с ожидаемым."""
+    if not os.path.isfile(path):
+        return False
+    if size is not None and os.path.getsize(path) != size:
+        return False
+    return sha1 is None or file_sha1(path) == sha1
+
+
+def fetch(task, store=None, verified=None, on_bytes=None):
+    if verified is not None and verified.is_verified(task.path, task.sha1, task.size):
+        return
+    _fetch(task, store, on_bytes)
+    if verified is not None and os.path.isfile(task.path):
+        verified.mark(task.path, task.sha1)
+
+
+def _fetch(task, store=None, on_bytes=None):
+    use_store = store is not None and task.sha1 is not None
+    if use_store and store.is_linked(task.sha1, task.path):
+        return
+    if is_file_valid(task.path, task.sha1, task.size):
+        if use_store:
+            store.add(task.path, task.sha1)
+        return
+    try:
+        if use_store:
+            store.materialize(
+                task.url, task.sha1, task.path, task.size, on_bytes
+            )
+        else:
+            download_file(
+                task.url, task.path, task.sha1, task.size, on_bytes=on_bytes
+            )
+    except DownloadError as e:
+        if not task.optional:
+            raise InstallError(str(e)) from e
+
+
+def load_version_json(version_id, minecraft_directory):
+    path = os.path.join(
+        minecraft_directory, "versions", version_id, f"{version_id}.json"
+    )
+    if not os.path.isfile(path):
+        manifest = metadata_cache.get(
+            "mojang", MOJANG_MANIFEST_URL, METADATA_TTL["mojang"]
+        )
+        for version in (manifest or {}).get("versions", []):
+            if version["id"] == version_id:
+                fetch(DownloadTask(version["url"], path, version["sha1"]))
+                break
+        else:
+            raise InstallError(f"Version {version_id} not found")
+
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def library_tasks(library, minecraft_directory):
+    """Возвращает задачи загрузки для библиотеки и путь к её natives-архиву."""
+    tasks = []
+    native = get_natives(library)
+    downloads = library.get("downloads")
+
+    if downloads is None:
+        # Старый формат (Forge): только maven-координаты и базовый url
+        path = get_library_path(library["name"], minecraft_directory)
+        base_url = library.get("url", LIBRARIES_URL).rstrip("/")
+        relative = os.path.relpath(
+            path, os.path.join(minecraft_directory, "libraries")
+        ).replace(os.sep, "/")
+        tasks.append(DownloadTask(f"{base_url}/{relative}", path, optional=True))
+        if native:
+            path = f"{os.path.splitext(path)[0]}-{native}.jar"
+            relative = f"{os.path.splitext(relative)[0]}-{native}.jar"
+            tasks.append(DownloadTask(f"{base_url}/{relative}", path, optional=True))
+            return tasks, path
+        return tasks, None
+
+    artifact = downloads.get("artifact")
+    if artifact and artifact.get("url") and "path" in artifact:
+        tasks.append(DownloadTask(
+            artifact["url"],
+            os.path.join(minecraft_directory, "libraries", artifact["path"]),
+            artifact.get("sha1"),
+            artifact.get("size"),
+        ))
+
+    if native and native in downloads.get("classifiers", {}):
+        classifier = downloads["classifiers"][native]
+        if "path" in classifier:
+            path = os.path.join(
+                minecraft_directory, "libraries", classifier["path"]
+            )
+        else:
+            library_path = get_library_path(library["name"], minecraft_directory)
+            path = f"{os.path.splitext(library_path)[0]}-{native}.jar"
+        tasks.append(DownloadTask(
+            classifier["url"], path, classifier.get("sha1"), classifier.get("size")
+        ))
+        return tasks, path
+    return tasks, None
+
+
+def asset_tasks(version_data, minecraft_directory, verified=None):
+    if "assetIndex" not in version_data:
+        return []
+
+    asset_index = version_data["assetIndex"]
+    index_path = os.path.join(
+        minecraft_directory, "assets", "indexes", f"{version_data['assets']}.json"
+    )
+    fetch(DownloadTask(
+        asset_index["url"], index_path, asset_index.get("sha1"), asset_index.get("size")
+    ), verified=verified)
+    with open(index_path, "r", encoding="utf-8") as file:
+        objects = json.load(file)["objects"]
+
+    tasks = []
+    for asset in objects.values():
+        asset_hash = asset["hash"]
+        tasks.append(DownloadTask(
+            f"{ASSETS_URL}/{asset_hash[:2]}/{asset_hash}",
+            os.path.join(
+                minecraft_directory, "assets", "objects", asset_hash[:2], asset_hash
+            ),
+            asset_hash,
+            asset.get("size"),
+        ))
+    return tasks
+
+
+def resolve_install_plan(version_id, minecraft_directory, verified=None):
+    """Собирает полный план загрузки для версии (с учётом inheritsFrom)."""
+    version_data = load_version_json(version_id, minecraft_directory)
+    downloads = []
+    natives = []
+
+    if "inheritsFrom" in version_data:
+        parent = resolve_install_plan(
+            version_data["inheritsFrom"], minecraft_directory, verified
+        )
+        downloads.extend(parent.downloads)
+        version_data = inherit_json(version_data, minecraft_directory)
+
+    for library in version_data.get("libraries", []):
+        if "rules" in library and not parse_rule_list(library["rules"], {}):
+            continue
+        tasks, native_path = library_tasks(library, minecraft_directory)
+        downloads.extend(tasks)
+        if native_path is not None:
+            natives.append(
+                (native_path, library.get("extract", {"exclude": []}))
+            )
+
+    downloads.extend(asset_tasks(version_data, minecraft_directory, verified))
+
+    logging_file = version_data.get("logging", {}).get("client", {}).get("file")
+    if logging_file:
+        downloads.append(DownloadTask(
+            logging_file["url"],
+            os.path.join(
+                minecraft_directory, "assets", "log_configs", logging_file["id"]
+            ),
+            logging_file.get("sha1"),
+            logging_file.get("size"),
+        ))
+
+    client = version_data.get("downloads", {}).get("client")
+    if client:
+        downloads.append(DownloadTask(
+            client["url"],
+            os.path.join(
+                minecraft_directory, "versions", version_id, f"{version_id}.jar"
+            ),
+            client.get("sha1"),
+            client.get("size"),
+        ))
+
+    # Одинаковые файлы (например, общие библиотеки Forge и ванили) качаем один раз
+    unique = {}
+    for task in downloads:
+        check_path_inside_minecraft_directory(minecraft_directory, task.path)
+        unique.setdefault(os.path.normcase(os.path.abspath(task.path)), task)
+
+    return InstallPlan(version_id, version_data, list(unique.values()), natives)
+
+
+def _task_category(task):
+    parts = os.path.normpath(task.path).split(os.sep)
+    for directory, category in (
+        ("libraries", "libraries"), ("assets", "assets"), ("versions", "client"),
+    ):
+        if directory in parts:
+            return category
+    return "other"
+
+
+def _traced_fetch(categories):
+    # Для каждой категории файлов: (начало первой загрузки, конец последней, число файлов)
+    lock = threading.Lock()
+
+    def traced(task, *args):
+        start = time.perf_counter_ns()
+        try:
+            fetch(task, *args)
+        finally:
+            end = time.perf_counter_ns()
+            category = _task_category(task)
+            with lock:
+                first, last, count = categories.get(category, (start, end, 0))
+                categories[category] = (min(first, start), max(last, end), count + 1)
+
+    return traced
+
+
+def run_download_plan(tasks, callback=None, workers=DOWNLOAD_WORKERS, store=None, verified=None):
+    callback = callback or {}
+    set_progress = callback.get("setProgress", empty)
+    on_bytes = callback.get("addBytes")
+    callback.get("setStatus", empty)("Download files")
+    callback.get("setMax", empty)(len(tasks))
+    set_progress(0)
+
+    # Время загрузки по категориям собирается, только если трассировка включена
+    categories = {}
+    fetch_task = _traced_fetch(categories) if tracing.enabled() else fetch
+
+    download_span = tracing.span("download", files=len(tasks))
+    with download_span, ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [
+            executor.submit(fetch_task, task, store, verified, on_bytes)
+            for task in tasks
+        ]
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                future.result()
+                set_progress(done)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            for category, (first, last, count) in categories.items():
+                tracing.complete(f"download {category}", first, last, files=count)
+
+
+def _natives_ready(plan, minecraft_directory, verified, repair):
+    natives_directory = os.path.join(
+        minecraft_directory, "versions", plan.version_id, "natives"
+    )
+    return (
+        not repair
+        and os.path.isdir(natives_directory)
+        and bool(os.listdir(natives_directory))
+        and all(verified.is_verified(path) for path, _ in plan.natives)
+    )
+
+
+def _finish_install(plan, minecraft_directory, callback, repair, natives_ready):
+    if plan.natives and not natives_ready:
+        with tracing.span("extract natives", version=plan.version_id):
+            natives_directory = os.path.join(
+                minecraft_directory, "versions", plan.version_id, "natives"
+            )
+            callback.get("setStatus", empty)("Extract natives")
+            os.makedirs(natives_directory, exist_ok=True)
+            for native_path, extract in plan.natives:
+                if os.path.isfile(native_path):
+                    extract_natives_file(native_path, natives_directory, extract)
+
+    if "javaVersion" in plan.version_data:
+        component = plan.version_data["javaVersion"]["component"]
+        with _runtime_lock(minecraft_directory, component):
+            if repair or component not in get_installed_jvm_runtimes(minecraft_directory):
+                callback.get("setStatus", empty)("Install java runtime")
+                with tracing.span("install java runtime", component=component):
+                    install_jvm_runtime(
+                        component,
+                        minecraft_directory,
+                        callback=callback,
+                    )
+
+
+def install_version(version_id, minecraft_directory, callback=None, workers=DOWNLOAD_WORKERS, store=None, repair=False):
+    """Устанавливает версию, скачивая файлы в ``workers`` потоков.
+
+    ``store`` — общее хранилище библиотек и ассетов, ``repair`` — перепроверить хеши всех файлов.
+    """
+    return install_versions(
+        [version_id], minecraft_directory, callback, workers, store, repair
+    )[0]
+
+
+def install_versions(version_ids, minecraft_directory, callback=None, workers=DOWNLOAD_WORKERS, store=None, repair=False):
+    """Устанавливает несколько версий с общей очередью загрузки; возвращает их ``InstallPlan``."""
+    callback = callback or {}
+    minecraft_directory = str(minecraft_directory)
+    verified = VerifiedFiles(minecraft_directory)
+    if repair:
+        verified.clear()
+
+    try:
+        # Разбор идёт по очереди: версии с общим родителем пишут один и тот же JSON
+        plans = []
+        for version_id in version_ids:
+            callback.get("setStatus", empty)(f"Resolve {version_id}")
+            with tracing.span("resolve version", version=version_id):
+                plans.append(resolve_install_plan(version_id, minecraft_directory, verified))
+        natives_ready = [
+            _natives_ready(plan, minecraft_directory, verified, repair)
+            for plan in plans
+        ]
+
+        unique = {}
+        for plan in plans:
+            for task in plan.downloads:
+                unique.setdefault(os.path.normcase(os.path.abspath(task.path)), task)
+        run_download_plan(list(unique.values()), callback, workers, store, verified)
+
+        for plan, ready in zip(plans, natives_ready):
+            _finish_install(plan, minecraft_directory, callback, repair, ready)
+    finally:
+        verified.save()
+
+    callback.get("setStatus", empty)("Installation complete")
+    return plans
@@ -0,0 +1,205 @@
+import glob
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+
+from paths import cache_directory, write_atomic
+
+JAVA_EXECUTABLE = "javaw.exe" if os.name == "nt" else "java"
+
+
+@dataclass
+class JavaRuntime:
+    path: str
+    version: str
+    major: int
+    mojang: bool = False
+
+
+def parse_major(version):
+    # 1.8.0_382 -> 8, 17.0.8 -> 17, 21 -> 21
+    numbers = re.findall(r"\d+", version)
+    if not numbers:
+        return 0
+    if numbers[0] == "1" and len(numbers) > 1:
+        return int(numbers[1])
+    return int(numbers[0])
+
+
+def _candidate_homes():
+    home = os.path.expanduser("~")
+    patterns = []
+    if os.environ.get("JAVA_HOME"):
+        patterns.append(os.environ["JAVA_HOME"])
+    if platform.system() == "Windows":
+        for base in filter(None, (
+            os.environ.get("ProgramFiles"),
+            os.environ.get("ProgramFiles(x86)"),
+        )):
+            for vendor in (
+                "Java", "Eclipse Adoptium", "Eclipse Foundation", "Zulu",
+                "Microsoft", "BellSoft", "Amazon Corretto",
+            ):
+                patterns.append(os.path.join(base, vendor, "*"))
+    elif platform.system() == "Darwin":
+        patterns += [
+            "/Library/Java/JavaVirtualMachines/*/Contents/Home",
+            os.path.join(home, "Library/Java/JavaVirtualMachines/*/Contents/Home"),
+        ]
+    else:
+        patterns += ["/usr/lib/jvm/*", "/usr/java/*", "/opt/java/*", "/opt/jdk*"]
+    patterns += [
+        os.path.join(home, ".sdkman", "candidates", "java", "*"),
+        os.path.join(home, ".jdks", "*"),
+    ]
+
+    homes = []
+    for pattern in patterns:
+        homes.extend(glob.glob(pattern))
+    return homes
+
+
+def _mojang_homes(minecraft_directory):
+    # Среды, которые ставит minecraft_launcher_lib и официальный лаунчер:
+    # runtime/<компонент>/<платформа>/<компонент>
+    return glob.glob(os.path.join(minecraft_directory, "runtime", "*", "*", "*"))
+
+
+def _executable(java_home):
+    for name in (JAVA_EXECUTABLE, "java.exe", "java"):
+        path = os.path.join(java_home, "bin", name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _read_version(executable):
+    # Файл release лежит в корне любого современного JDK/JRE — процесс запускать не нужно
+    java_home = os.path.dirname(os.path.dirname(executable))
+    try:
+        with open(os.path.join(java_home, "release"), "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("JAVA_VERSION="):
+                    return line.split("=", 1)[1].strip().strip('"')
+    except OSError:
+        pass
+    try:
+        output = subprocess.run(
+            [executable, "-version"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        ).stderr
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r'version "([^"]+)"', output)
+    return match.group(1) if match else None
+
+
+class JavaRuntimeManager:
+    """Находит установленные Java и подбирает нужную; версии кэшируются по пути и mtime файла."""
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path or os.path.join(
+            cache_directory(), "java-runtimes.json"
+        )
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                self.cache = json.load(file)
+        except (OSError, ValueError):
+            self.cache = {}
+        self._dirty = False
+
+    def _version(self, executable):
+        real_path = os.path.realpath(executable)
+        try:
+            mtime = os.stat(real_path).st_mtime_ns
+        except OSError:
+            return None
+        entry = self.cache.get(real_path)
+        if entry is not None and entry["mtime"] == mtime:
+            return entry["version"]
+        version = _read_version(executable)
+        self.cache[real_path] = {"mtime": mtime, "version": version}
+        self._dirty = True
+        return version
+
+    def find(self, minecraft_directory):
+        runtimes = []
+        seen = set()
+
+        def add(executable, mojang=False):
+            if executable is None:
+                return
+            real_path = os.path.realpath(executable)
+            if real_path in seen:
+                return
+            seen.add(real_path)
+            version = self._version(executable)
+            if version:
+                runtimes.append(
+                    JavaRuntime(executable, version, parse_major(version), mojang)
+                )
+
+        for java_home in _mojang_homes(minecraft_directory):
+            add(_executable(java_home), mojang=True)
+        for java_home in _candidate_homes():
+            add(_executable(java_home))
+        add(shutil.which("java"))
+
+        self.save()
+        return runtimes
+
+    def select(self, major, minecraft_directory, component=None):
+        """Подбирает Java нужной версии.
+
+        Предпочтение: среда Mojang для этого компонента, затем любая Java той же
+        мажорной версии. Для Java 16+ годится и более новая; старые версии игры
+        (Java 8) с более новой Java часто не запускаются, поэтому там — только точное совпадение.
+        """
+        runtimes = self.find(minecraft_directory)
+        if component:
+            for runtime in runtimes:
+                if runtime.mojang and f"{os.sep}{component}{os.sep}" in runtime.path and runtime.major == major:
+                    return runtime
+        exact = [runtime for runtime in runtimes if runtime.major == major]
+        if exact:
+            return sorted(exact, key=lambda runtime: not runtime.mojang)[0]
+        if major >= 16:
+            newer = [runtime for runtime in runtimes if runtime.major > major]
+            if newer:
+                return min(newer, key=lambda runtime: runtime.major)
+        return None
+
+    def save(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        write_atomic(self.cache_path, json.dumps(self.cache, indent=1).encode("utf-8"))
+
+
+def cds_arguments(runtime, classpath):
+    """Аргументы для архива классов (AppCDS) под эту Java и этот classpath.
+
+    Первый запуск записывает архив при выходе из игры, следующие загружают
+    классы из него вместо разбора jar. Java 8–12 пропускаются: динамических
+    архивов там нет.
+    """
+    if runtime is None or runtime.major < 13:
+        return []
+    key = hashlib.sha1(
+        "\0".join([os.path.realpath(runtime.path), runtime.version, *classpath]).encode("utf-8")
+    ).hexdigest()
+    archive = os.path.join(cache_directory("cds"), f"{key}.jsa")
+
+    if runtime.major >= 19:
+        # JVM сама создаёт архив и пересоздаёт его, если он устарел
+        return [f"-XX:SharedArchiveFile={archive}", "-XX:+AutoCreateSharedArchive"]
+    if os.path.isfile(archive):
+        return [f"-XX:SharedArchiveFile={archive}"]
+    return [f"-XX:ArchiveClassesAtExit={archive}"]
@@ -0,0 +1,192 @@
+import os
+from dataclasses import dataclass
+
+# Память, которая всегда остаётся системе и самому процессу JVM (metaspace, нативные буферы)
+SYSTEM_RESERVE_MB = 2048
+# Больше этого куча почти никогда не нужна, а паузы сборщика растут
+MAX_AUTO_HEAP_MB = 16384
+
+JVM_PRESETS = {
+    # G1 с умеренной целью пауз — подходит почти всем
+    "Balanced": {"gc": "g1", "pause_ms": 130, "heap_factor": 1.0, "pretouch": False},
+    # ZGC на Java 17+ (поколенческий на 21+), иначе G1 с короткими паузами
+    "Low latency": {"gc": "zgc", "pause_ms": 50, "heap_factor": 1.25, "pretouch": False},
+    # Большие паузы, зато меньше работы сборщика — для больших сборок и серверов
+    "Throughput": {"gc": "g1", "pause_ms": 200, "heap_factor": 1.0, "pretouch": True},
+    # Для машин с 4–8 ГБ: меньше куча, меньше потоков сборщика
+    "Low memory": {"gc": "g1", "pause_ms": 200, "heap_factor": 0.75, "pretouch": False},
+}
+DEFAULT_PRESET = "Balanced"
+
+
+@dataclass
+class SystemInfo:
+    total_mb: int
+    available_mb: int
+    cpu_count: int
+
+
+def _read_meminfo():
+    values = {}
+    with open("/proc/meminfo", "r", encoding="ascii") as file:
+        for line in file:
+            key, _, value = line.partition(":")
+            values[key] = int(value.split()[0]) // 1024  # kB -> MB
+    return values["MemTotal"], values.get("MemAvailable", values.get("MemFree", 0))
+
+
+def _read_cgroup_limit():
+    # В контейнере лимит cgroup меньше, чем показывает /proc/meminfo
+    for path in (
+        "/sys/fs/cgroup/memory.max",
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+    ):
+        try:
+            with open(path, "r", encoding="ascii") as file:
+                value = file.read().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 60:
+            return int(value) // (1024 * 1024)
+    return None
+
+
+def _read_windows_memory():
+    import ctypes
+
+    class MEMORYSTATUSEX(ctypes.Structure):
+        _fields_ = [
+            ("dwLength", ctypes.c_ulong),
+            ("dwMemoryLoad", ctypes.c_ulong),
+            ("ullTotalPhys", ctypes.c_ulonglong),
+            ("ullAvailPhys", ctypes.c_ulonglong),
+            ("ullTotalPageFile", ctypes.c_ulonglong),
+            ("ullAvailPageFile", ctypes.c_ulonglong),
+            ("ullTotalVirtual", ctypes.c_ulonglong),
+            ("ullAvailVirtual", ctypes.c_ulonglong),
+            ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+        ]
+
+    status = MEMORYSTATUSEX()
+    status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+    ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+    return status.ullTotalPhys // (1024 * 1024), status.ullAvailPhys // (1024 * 1024)
+
+
+def detect_system():
+    """Определяет объём памяти и число доступных ядер."""
+    try:
+        total_mb, available_mb = _read_meminfo()
+        limit = _read_cgroup_limit()
+        if limit is not None and limit < total_mb:
+            total_mb, available_mb = limit, min(available_mb, limit)
+    except (OSError, KeyError, ValueError):
+        try:
+            if os.name == "nt":
+                total_mb, available_mb = _read_windows_memory()
+            else:
+                page_size = os.sysconf("SC_PAGE_SIZE")
+                total_mb = os.sysconf("SC_PHYS_PAGES") * page_size // (1024 * 1024)
+                available_mb = os.sysconf("SC_AVPHYS_PAGES") * page_size // (1024 * 1024)
+        except (OSError, ValueError, AttributeError):
+            total_mb = available_mb = 8192
+
+    try:
+        cpu_count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpu_count = os.cpu_count() or 2
+    return SystemInfo(total_mb, available_mb, cpu_count)
+
+
+def max_heap_mb(system):
+    """Верхняя граница для ручной настройки памяти."""
+    return max(system.total_mb - SYSTEM_RESERVE_MB, 1024)
+
+
+def count_mods(minecraft_directory):
+    try:
+        return sum(
+            1 for filename in os.listdir(os.path.join(minecraft_directory, "mods"))
+            if filename.endswith(".jar")
+        )
+    except OSError:
+        return 0
+
+
+def recommend_heap_mb(system, mod_count=0, preset=DEFAULT_PRESET):
+    """Подбирает размер кучи по числу модов и памяти машины."""
+    settings = JVM_PRESETS.get(preset, JVM_PRESETS[DEFAULT_PRESET])
+    # Ваниле хватает 2 ГБ, каждый мод в среднем добавляет несколько десятков МБ
+    heap_mb = 2048 + mod_count * 40
+    heap_mb = int(heap_mb * settings["heap_factor"])
+    heap_mb = min(heap_mb, MAX_AUTO_HEAP_MB, max_heap_mb(system))
+    # Не отнимаем у системы память, которая сейчас занята другими программами
+    if system.available_mb > 0:
+        heap_mb = min(heap_mb, max(system.available_mb - 512, 1024))
+    heap_mb = max(heap_mb, 1024)
+    return heap_mb // 256 * 256
+
+
+def gc_arguments(heap_mb, java_major, preset, cpu_count):
+    settings = JVM_PRESETS.get(preset, JVM_PRESETS[DEFAULT_PRESET])
+
+    if settings["gc"] == "zgc" and java_major >= 17:
+        arguments = ["-XX:+UseZGC"]
+        if 21 <= java_major < 23:
+            # С Java 23 поколенческий режим включён по умолчанию
+            arguments.append("-XX:+ZGenerational")
+        arguments.append(f"-XX:ConcGCThreads={max(1, cpu_count // 4)}")
+        return arguments
+
+    large = heap_mb >= 12288
+    parallel_threads = cpu_count // 2 if preset == "Low memory" else cpu_count - 1
+    arguments = [
+        "-XX:+UseG1GC",
+        "-XX:+ParallelRefProcEnabled",
+        f"-XX:MaxGCPauseMillis={settings['pause_ms']}",
+        "-XX:+UnlockExperimentalVMOptions",
+        "-XX:+DisableExplicitGC",
+        f"-XX:G1NewSizePercent={40 if large else 30}",
+        f"-XX:G1MaxNewSizePercent={50 if large else 40}",
+        f"-XX:G1HeapRegionSize={16 if large else 8}M",
+        f"-XX:G1ReservePercent={15 if large else 20}",
+        "-XX:G1HeapWastePercent=5",
+        "-XX:G1MixedGCCountTarget=4",
+        f"-XX:InitiatingHeapOccupancyPercent={20 if large else 15}",
+        "-XX:G1MixedGCLiveThresholdPercent=90",
+        "-XX:SurvivorRatio=32",
+        "-XX:MaxTenuringThreshold=1",
+        f"-XX:ParallelGCThreads={max(1, parallel_threads)}",
+        f"-XX:ConcGCThreads={max(1, cpu_count // 4)}",
+    ]
+    if java_major >= 9:
+        arguments.append("-XX:G1RSetUpdatingPauseTimePercent=5")
+    return arguments
+
+
+def jvm_arguments(
+    minecraft_directory,
+    java_major=8,
+    memory_mb=0,
+    preset=DEFAULT_PRESET,
+    system=None,
+):
+    """Собирает аргументы JVM для запуска.
+
+    ``memory_mb`` — размер кучи из настроек; 0 означает автоматический выбор
+    по числу установленных модов и памяти машины.
+    """
+    system = system or detect_system()
+    settings = JVM_PRESETS.get(preset, JVM_PRESETS[DEFAULT_PRESET])
+    if memory_mb <= 0:
+        memory_mb = recommend_heap_mb(
+            system, count_mods(minecraft_directory), preset
+        )
+
+    # Куча фиксированного размера не растёт рывками во время игры
+    initial_mb = memory_mb if settings["pretouch"] else memory_mb // 2
+    arguments = [f"-Xmx{memory_mb}M", f"-Xms{initial_mb}M"]
+    arguments += gc_arguments(memory_mb, java_major, preset, system.cpu_count)
+    if settings["pretouch"]:
+        arguments.append("-XX:+AlwaysPreTouch")
+    return arguments
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+
+from paths import launcher_directory, write_atomic
+
+LAUNCH_PLAN_VERSION = 3
+
+# Значения, которые меняются от запуска к запуску, подставляются в готовый план
+USERNAME = "@@BEDROCK_USERNAME@@"
+UUID = "@@BEDROCK_UUID@@"
+TOKEN = "@@BEDROCK_TOKEN@@"
+JVM_ARGUMENTS = "@@BEDROCK_JVM_ARGUMENTS@@"
+
+
+def version_chain_hashes(version_id, minecraft_directory):
+    """SHA-1 JSON-файлов версии и всех версий, от которых она наследуется."""
+    hashes = {}
+    while version_id and version_id not in hashes:
+        path = os.path.join(
+            minecraft_directory, "versions", version_id, f"{version_id}.json"
+        )
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        hashes[version_id] = hashlib.sha1(data).hexdigest()
+        try:
+            version_id = json.loads(data).get("inheritsFrom")
+        except ValueError:
+            return None
+    return hashes
+
+
+def _plan_path(version_id, minecraft_directory):
+    return os.path.join(
+        launcher_directory(minecraft_directory, "launch-plans"), f"{version_id}.json"
+    )
+
+
+def _library_version():
+    # Через метаданные пакета: импорт самой библиотеки занимает больше 100 мс
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("minecraft-launcher-lib")
+    except PackageNotFoundError:
+        return None
+
+
+def _inherited(version_id, minecraft_directory, key):
+    # Первое значение ключа в цепочке inheritsFrom
+    while version_id:
+        path = os.path.join(
+            minecraft_directory, "versions", version_id, f"{version_id}.json"
+        )
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if key in data:
+            return data[key]
+        version_id = data.get("inheritsFrom")
+    return None
+
+
+def _java_version(version_id, minecraft_directory):
+    # (мажорная версия, компонент Mojang)
+    java_version = _inherited(version_id, minecraft_directory, "javaVersion")
+    if java_version is None:
+        return 8, None
+    return java_version.get("majorVersion", 8), java_version.get("component")
+
+
+def load_launch_plan(version_id, minecraft_directory):
+    """Возвращает сохранённый план запуска или None, если JSON версии изменились."""
+    try:
+        with open(_plan_path(version_id, minecraft_directory), "r", encoding="utf-8") as file:
+            plan = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if (
+        plan.get("version") != LAUNCH_PLAN_VERSION
+        or plan.get("library_version") != _library_version()
+        or plan.get("hashes") != version_chain_hashes(version_id, minecraft_directory)
+    ):
+        return None
+    return plan
+
+
+def create_launch_plan(version_id, minecraft_directory):
+    """Строит команду запуска с заглушками вместо пользовательских значений и сохраняет её.
+
+    Разбор цепочки JSON, правил библиотек и classpath выполняется здесь один
+    раз; повторный запуск той же версии только подставляет значения в шаблон.
+    """
+    from minecraft_launcher_lib.command import get_minecraft_command
+
+    hashes = version_chain_hashes(version_id, minecraft_directory)
+    java_major, java_component = _java_version(version_id, minecraft_directory)
+    command = get_minecraft_command(
+        version=version_id,
+        minecraft_directory=minecraft_directory,
+        options={
+            "username": USERNAME,
+            "uuid": UUID,
+            "token": TOKEN,
+            "jvmArguments": [JVM_ARGUMENTS],
+        },
+    )
+    classpath = []
+    if "-cp" in command:
+        classpath = command[command.index("-cp") + 1].split(os.pathsep)
+    assets = _inherited(version_id, minecraft_directory, "assets")
+    natives_directory = os.path.join(minecraft_directory, "versions", version_id, "natives")
+    plan = {
+        "version": LAUNCH_PLAN_VERSION,
+        "library_version": _library_version(),
+        "hashes": hashes,
+        "java_major": java_major,
+        "java_component": java_component,
+        "command": command,
+        "classpath": classpath,
+        "asset_index": assets and os.path.join(
+            minecraft_directory, "assets", "indexes", f"{assets}.json"
+        ),
+        # Папка natives есть только у версий с нативными библиотеками
+        "natives_directory": natives_directory if _has_files(natives_directory) else None,
+    }
+    if hashes is not None:
+        write_atomic(
+            _plan_path(version_id, minecraft_directory),
+            json.dumps(plan, indent=1).encode("utf-8"),
+        )
+    return plan
+
+
+def _has_files(directory):
+    try:
+        return bool(os.listdir(directory))
+    except OSError:
+        return False
+
+
+def plan_files_exist(plan):
+    """Проверяет, что java, classpath, ассеты и natives на месте (без хеширования)."""
+    executable = plan["command"][0]
+    if os.path.isabs(executable) and not os.path.isfile(executable):
+        return False
+    if not all(os.path.isfile(path) for path in plan["classpath"]):
+        return False
+    if plan["natives_directory"] and not _has_files(plan["natives_directory"]):
+        return False
+    if plan["asset_index"]:
+        try:
+            with open(plan["asset_index"], "r", encoding="utf-8") as file:
+                objects = json.load(file)["objects"]
+        except (OSError, ValueError, KeyError):
+            return False
+        objects_directory = os.path.join(
+            os.path.dirname(os.path.dirname(plan["asset_index"])), "objects"
+        )
+        return all(
+            os.path.isfile(os.path.join(objects_directory, asset["hash"][:2], asset["hash"]))
+            for asset in objects.values()
+        )
+    return True
+
+
+def render_command(plan, username, uuid, token="", jvm_arguments=(), executable=None):
+    values = {USERNAME: username, UUID: uuid, TOKEN: token}
+    command = [executable or plan["command"][0]]
+    for argument in plan["command"][1:]:
+        if argument == JVM_ARGUMENTS:
+            command.extend(jvm_arguments)
+            continue
+        for placeholder, value in values.items():
+            if placeholder in argument:
+                argument = argument.replace(placeholder, value)
+        command.append(argument)
+    return command
@@ -0,0 +1,180 @@
+import os
+from contextlib import ExitStack
+from threading import Lock
+
+from constants import *
+import tracing
+
+# Одну и ту же версию в одном каталоге одновременно ставит только один поток
+_install_locks = {}
+_install_locks_lock = Lock()
+
+
+def install_lock(minecraft_directory, version_id):
+    key = (os.path.realpath(minecraft_directory), version_id)
+    with _install_locks_lock:
+        return _install_locks.setdefault(key, Lock())
+
+
+def prepare_versions(
+    version_ids,
+    minecraft_directory,
+    callback=None,
+    workers=DOWNLOAD_WORKERS,
+    store=None,
+    repair=False,
+):
+    """Возвращает планы запуска ``{version_id: план}``, устанавливая то, чего не хватает.
+
+    Если версия не менялась с прошлого запуска, установка и разбор JSON
+    пропускаются. Недостающие версии ставятся вместе, с общей очередью загрузки.
+    """
+    from launch_plan import create_launch_plan, load_launch_plan, plan_files_exist
+
+    version_ids = list(dict.fromkeys(version_ids))
+    with ExitStack() as stack:
+        # Блокировки берутся в одном порядке, чтобы параллельные вызовы не ждали друг друга по кругу
+        for version_id in sorted(version_ids):
+            stack.enter_context(install_lock(minecraft_directory, version_id))
+
+        plans = {}
+        missing = []
+        with tracing.span("load launch plans"):
+            for version_id in version_ids:
+                plan = None
+                if not repair:
+                    plan = load_launch_plan(version_id, minecraft_directory)
+                if plan is None or not plan_files_exist(plan):
+                    missing.append(version_id)
+                plans[version_id] = plan
+
+        if missing:
+            from installer import install_versions
+
+            install_versions(
+                missing,
+                minecraft_directory,
+                callback=callback,
+                workers=workers,
+                store=store,
+                repair=repair,
+            )
+            with tracing.span("create launch plans"):
+                for version_id in missing:
+                    plans[version_id] = create_launch_plan(version_id, minecraft_directory)
+    return plans
+
+
+def prepare_version(version_id, minecraft_directory, **kwargs):
+    return prepare_versions([version_id], minecraft_directory, **kwargs)[version_id]
+
+
+def install_loader(version_type, minecraft_version, loader_version, minecraft_directory, **kwargs):
+    """Ставит Forge или Fabric поверх версии игры и возвращает id версии для запуска.
+
+    Установленный загрузчик не ставится заново (кроме ``repair``).
+    ``kwargs`` — параметры ``prepare_versions``.
+    """
+    import catalog
+    from installer import InstallError
+    from paths import write_atomic
+
+    if version_type not in ("Forge", "Fabric"):
+        return minecraft_version
+    if not minecraft_version:
+        raise ValueError(f"{version_type} needs a Minecraft version")
+    repair = kwargs.get("repair", False)
+
+    if version_type == "Fabric":
+        loader_version = loader_version or catalog.get_fabric_loader_version()
+        if not loader_version:
+            raise InstallError("Failed to find a Fabric loader version")
+        version_id = f"fabric-loader-{loader_version}-{minecraft_version}"
+        path = os.path.join(
+            minecraft_directory, "versions", version_id, f"{version_id}.json"
+        )
+        if repair or not os.path.isfile(path):
+            with tracing.span("install fabric", version=version_id):
+                profile = catalog.get_fabric_profile(minecraft_version, loader_version)
+            if profile is None:
+                raise InstallError(
+                    f"Fabric {loader_version} is not available for Minecraft {minecraft_version}"
+                )
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomic(path, profile)
+        # Библиотеки загрузчика ставятся вместе с версией в prepare_versions
+        return version_id
+
+    build = loader_version or catalog.get_forge_build(minecraft_version)
+    if not build:
+        raise InstallError(f"Forge is not available for Minecraft {minecraft_version}")
+    version_id = f"{minecraft_version}-forge-{build}"
+    path = os.path.join(
+        minecraft_directory, "versions", version_id, f"{version_id}.json"
+    )
+    if repair or not os.path.isfile(path):
+        from minecraft_launcher_lib.forge import install_forge_version
+        from java_runtime import JavaRuntimeManager
+
+        # Установщику Forge нужна Java для его процессоров: сначала ставим
+        # ванильную версию через общую очередь и берём её Java
+        launch_plan = prepare_version(minecraft_version, minecraft_directory, **kwargs)
+        runtime = JavaRuntimeManager().select(
+            launch_plan["java_major"],
+            minecraft_directory,
+            launch_plan["java_component"],
+        )
+        with tracing.span("install forge", version=version_id):
+            install_forge_version(
+                f"{minecraft_version}-{build}",
+                minecraft_directory,
+                callback=kwargs.get("callback"),
+                java=runtime.path if runtime else None,
+            )
+    return version_id
+
+
+def build_command(
+    launch_plan,
+    minecraft_directory,
+    username,
+    memory_mb=0,
+    preset=None,
+    gc_log=None,
+):
+    """Подставляет пользователя, Java и аргументы JVM в план запуска.
+
+    Если задан ``gc_log``, JVM пишет туда журнал сборок мусора для телеметрии.
+    """
+    from uuid import uuid1
+
+    from jvm import DEFAULT_PRESET, jvm_arguments
+    from java_runtime import JavaRuntimeManager, cds_arguments
+    from launch_plan import render_command
+
+    # Java нужной версии: своя среда Mojang или установленная в системе
+    with tracing.span("select java"):
+        runtime = JavaRuntimeManager().select(
+            launch_plan["java_major"],
+            minecraft_directory,
+            launch_plan["java_component"],
+        )
+    java_major = runtime.major if runtime else launch_plan["java_major"]
+    extra_arguments = []
+    if gc_log:
+        from telemetry import gc_log_arguments
+        extra_arguments = gc_log_arguments(gc_log, java_major)
+
+    return render_command(
+        launch_plan,
+        username=username,
+        uuid=str(uuid1()),
+        token="",
+        jvm_arguments=jvm_arguments(
+            minecraft_directory,
+            java_major=java_major,
+            memory_mb=memory_mb,
+            preset=preset or DEFAULT_PRESET,
+        ) + cds_arguments(runtime, launch_plan["classpath"]) + extra_arguments,
+        executable=runtime.path if runtime else None,
+    )
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+
+import requests
+
+from paths import config_directory
+
+
+class OfflineError(requests.ConnectionError):
+    """Запрос в сеть в автономном режиме: поднимается сразу, без таймаутов и повторов."""
+
+
+class MirrorConfig:
+    """Подмена адресов зеркалами (побеждает самый длинный префикс) и автономный режим.
+
+    Путь к mirrors.json задаёт ``BEDROCK_MIRRORS``, автономный режим включает ``BEDROCK_OFFLINE=1``.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("BEDROCK_MIRRORS") or os.path.join(
+            config_directory(), "mirrors.json"
+        )
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self, path=None):
+        with self._lock:
+            if path is not None:
+                self.path = path
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+            except FileNotFoundError:
+                if path is not None:
+                    raise
+                data = {}
+            except (OSError, ValueError) as e:
+                print(f"Failed to read mirror configuration {self.path}: {e}")
+                data = {}
+            self.mirrors = {
+                upstream.rstrip("/"): mirror.rstrip("/")
+                for upstream, mirror in data.get("mirrors", {}).items()
+            }
+            self.offline = bool(data.get("offline")) or os.environ.get(
+                "BEDROCK_OFFLINE", ""
+            ) not in ("", "0")
+            # Длинные префиксы проверяются первыми
+            self._prefixes = sorted(self.mirrors, key=len, reverse=True)
+
+    def set_offline(self, offline):
+        self.offline = bool(offline)
+
+    def rewrite(self, url):
+        for prefix in self._prefixes:
+            if url == prefix or url.startswith(prefix + "/"):
+                return self.mirrors[prefix] + url[len(prefix):]
+        return url
+
+    def check(self, url):
+        """Возвращает адрес, по которому на самом деле нужно идти, или поднимает OfflineError."""
+        if self.offline:
+            raise OfflineError(f"Offline mode: {url} is not in the local cache")
+        return self.rewrite(url)
+
+
+mirror_config = MirrorConfig()
+
+
+# --- minecraft_launcher_lib ---
+
+class _MirrorSession(requests.Session):
+    def request(self, method, url, *args, **kwargs):
+        return super().request(method, mirror_config.check(url), *args, **kwargs)
+
+
+class _MirroredRequests:
+    # Подставляется вместо модуля requests в minecraft_launcher_lib: библиотека
+    # ходит в сеть напрямую, мимо общего HttpClient
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    def get(self, url, **kwargs):
+        with _MirrorSession() as session:
+            return session.get(url, **kwargs)
+
+    def session(self):
+        return _MirrorSession()
+
+    Session = _MirrorSession
+
+
+def patch_launcher_lib():
+    """Направляет загрузки minecraft_launcher_lib через зеркала (авторизация Microsoft не трогается).
+
+    Вызывается точками входа перед установкой; повторный вызов ничего не меняет.
+    """
+    import importlib
+
+    shim = _MirroredRequests()
+    for name in ("_helper", "install", "runtime", "utils", "mrpack"):
+        try:
+            module = importlib.import_module(f"minecraft_launcher_lib.{name}")
+        except ImportError:
+            continue
+        if getattr(module, "requests", None) is requests:
+            module.requests = shim
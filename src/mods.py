@@ -0,0 +1,364 @@
+import io
+import json
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+from paths import launcher_directory, write_atomic
+
+# Номер формата индекса: при его смене старый индекс перечитывается целиком
+MOD_INDEX_VERSION = 2
+# Насколько глубоко разбираются jar внутри jar (fabric-api и подобные сборки)
+NESTED_JAR_DEPTH = 3
+
+
+@dataclass
+class ModInfo:
+    id: str
+    version: str = ""
+    name: str = ""
+    loader: str = ""
+    # Диапазоны версий хранятся как есть — в синтаксисе того загрузчика, из которого они взяты
+    minecraft: str = ""
+    dependencies: dict = field(default_factory=dict)
+    provides: list = field(default_factory=list)
+    # id мода, внутри которого этот jar поставляется (jar-in-jar); пусто для самостоятельных модов
+    bundled_by: str = ""
+
+
+class ModMetadataError(Exception):
+    pass
+
+
+# --- Parsers ---
+
+def _as_range(value):
+    if isinstance(value, list):
+        return " || ".join(str(item) for item in value)
+    return str(value) if value is not None else "*"
+
+
+def _parse_fabric(data):
+    info = json.loads(data)
+    depends = {
+        mod_id: _as_range(version_range)
+        for mod_id, version_range in (info.get("depends") or {}).items()
+    }
+    minecraft = depends.pop("minecraft", "")
+    depends.pop("java", None)
+    return [ModInfo(
+        id=info["id"],
+        version=str(info.get("version", "")),
+        name=info.get("name") or info["id"],
+        loader="fabric",
+        minecraft=minecraft,
+        dependencies=depends,
+        provides=list(info.get("provides") or []),
+    )]
+
+
+_TOML_TABLE = re.compile(r"^\[\[?\s*([^\]]+?)\s*\]\]?$")
+_TOML_KEY = re.compile(r"^([A-Za-z0-9_.\-\"]+)\s*=\s*(.+)$")
+
+
+def _parse_toml_value(value):
+    value = value.strip()
+    if value[:1] in ("'", '"'):
+        quote = value[0]
+        end = value.find(quote, 1)
+        return value[1:end] if end > 0 else value[1:]
+    value = value.split("#", 1)[0].strip()
+    if value in ("true", "false"):
+        return value == "true"
+    return value
+
+
+def _parse_toml_subset(text):
+    # Запасной разбор mods.toml: без tomllib или когда файл не является строгим TOML
+    # (в модах такое встречается). Поддерживает только то, что нужно для метаданных.
+    data = {}
+    table = data
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = _TOML_TABLE.match(line)
+        if match:
+            keys = [key.strip('"') for key in match.group(1).split(".")]
+            parent = data
+            for key in keys[:-1]:
+                parent = parent.setdefault(key, {})
+            if line.startswith("[["):
+                table = {}
+                parent.setdefault(keys[-1], []).append(table)
+            else:
+                table = parent.setdefault(keys[-1], {})
+            continue
+        match = _TOML_KEY.match(line)
+        if match:
+            table[match.group(1).strip('"')] = _parse_toml_value(match.group(2))
+    return data
+
+
+def _parse_forge(data, loader, manifest_version=""):
+    text = data.decode("utf-8", errors="replace")
+    try:
+        if tomllib is None:
+            raise ValueError("tomllib is not available")
+        toml = tomllib.loads(text)
+    except ValueError:
+        toml = _parse_toml_subset(text)
+
+    dependencies = toml.get("dependencies") or {}
+    result = []
+    for mod in toml.get("mods") or []:
+        mod_id = mod.get("modId")
+        if not mod_id:
+            continue
+        version = str(mod.get("version", ""))
+        if "${file.jarVersion}" in version:
+            version = version.replace("${file.jarVersion}", manifest_version)
+
+        depends = {}
+        minecraft = ""
+        for dependency in dependencies.get(mod_id) or []:
+            dependency_id = dependency.get("modId")
+            # mandatory=true в старом формате, type="required" в новом
+            required = dependency.get("mandatory", dependency.get("type", "required"))
+            if not dependency_id or required not in (True, "required"):
+                continue
+            version_range = str(dependency.get("versionRange", "*")) or "*"
+            if dependency_id == "minecraft":
+                minecraft = version_range
+            elif dependency_id not in ("forge", "neoforge", "javafml"):
+                depends[dependency_id] = version_range
+
+        result.append(ModInfo(
+            id=mod_id,
+            version=version,
+            name=mod.get("displayName") or mod_id,
+            loader=loader,
+            minecraft=minecraft,
+            dependencies=depends,
+        ))
+    return result
+
+
+def _parse_mcmod_info(data):
+    info = json.loads(data.decode("utf-8", errors="replace"), strict=False)
+    if isinstance(info, dict):
+        info = info.get("modList") or info.get("modlist") or []
+    result = []
+    for mod in info:
+        if not isinstance(mod, dict) or not mod.get("modid"):
+            continue
+        depends = {}
+        for dependency in mod.get("requiredMods") or mod.get("dependencies") or []:
+            dependency_id, _, version_range = str(dependency).partition("@")
+            if dependency_id and dependency_id not in ("Forge", "forge", "FML"):
+                depends[dependency_id] = version_range or "*"
+        result.append(ModInfo(
+            id=mod["modid"],
+            version=str(mod.get("version", "")),
+            name=mod.get("name") or mod["modid"],
+            loader="forge",
+            minecraft=str(mod.get("mcversion", "")),
+            dependencies=depends,
+        ))
+    return result
+
+
+def _manifest_version(archive):
+    try:
+        manifest = archive.read("META-INF/MANIFEST.MF").decode("utf-8", errors="replace")
+    except KeyError:
+        return ""
+    for line in manifest.splitlines():
+        if line.startswith("Implementation-Version:"):
+            return line.split(":", 1)[1].strip()
+    return ""
+
+
+def _read_descriptors(archive, names):
+    if "fabric.mod.json" in names:
+        return _parse_fabric(archive.read("fabric.mod.json"))
+    if "META-INF/neoforge.mods.toml" in names:
+        return _parse_forge(
+            archive.read("META-INF/neoforge.mods.toml"),
+            "neoforge",
+            _manifest_version(archive),
+        )
+    if "META-INF/mods.toml" in names:
+        return _parse_forge(
+            archive.read("META-INF/mods.toml"),
+            "forge",
+            _manifest_version(archive),
+        )
+    if "mcmod.info" in names:
+        return _parse_mcmod_info(archive.read("mcmod.info"))
+    return []
+
+
+def _nested_jars(archive, names):
+    # Fabric перечисляет вложенные jar в "jars" из fabric.mod.json,
+    # Forge и NeoForge — в META-INF/jarjar/metadata.json
+    paths = []
+    if "fabric.mod.json" in names:
+        info = json.loads(archive.read("fabric.mod.json"))
+        paths += [
+            entry.get("file") for entry in info.get("jars") or [] if isinstance(entry, dict)
+        ]
+    if "META-INF/jarjar/metadata.json" in names:
+        metadata = json.loads(archive.read("META-INF/jarjar/metadata.json"))
+        paths += [
+            entry.get("path") for entry in metadata.get("jars") or [] if isinstance(entry, dict)
+        ]
+    return [path for path in dict.fromkeys(paths) if path in names]
+
+
+def _read_archive(archive, name, depth=0):
+    names = set(archive.namelist())
+    mods = _read_descriptors(archive, names)
+    if depth >= NESTED_JAR_DEPTH:
+        return mods
+    owner = mods[0].id if mods else name
+    for path in _nested_jars(archive, names):
+        try:
+            with zipfile.ZipFile(io.BytesIO(archive.read(path))) as nested:
+                nested_mods = _read_archive(nested, os.path.basename(path), depth + 1)
+        except (zipfile.BadZipFile, ValueError, KeyError, TypeError):
+            # Испорченный вложенный jar не должен скрывать сам мод
+            continue
+        for mod in nested_mods:
+            mod.bundled_by = mod.bundled_by or owner
+        mods.extend(nested_mods)
+    return mods
+
+
+def read_mod_metadata(path):
+    """Читает метаданные модов из jar.
+
+    Открывается только центральный каталог архива и нужные файлы описаний,
+    сам jar не распаковывается. Возвращает список: в одном jar может быть
+    несколько модов, включая вложенные jar (у них заполнено ``bundled_by``).
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return _read_archive(archive, os.path.basename(path))
+    except (OSError, zipfile.BadZipFile, ValueError, KeyError, TypeError) as e:
+        raise ModMetadataError(f"{os.path.basename(path)}: {e}") from e
+
+
+# --- Index ---
+
+class ModIndex:
+    """Индекс метаданных модов установки: неизменённые jar проверяются только через stat."""
+
+    def __init__(self, minecraft_directory):
+        self.minecraft_directory = minecraft_directory
+        self.path = os.path.join(
+            launcher_directory(minecraft_directory), "mods-index.json"
+        )
+        self.entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("version") == MOD_INDEX_VERSION:
+                self.entries = data["entries"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.entries = {}
+
+    def _key(self, path):
+        return os.path.relpath(path, self.minecraft_directory).replace(os.sep, "/")
+
+    @staticmethod
+    def _read(path):
+        try:
+            return [asdict(mod) for mod in read_mod_metadata(path)], None
+        except ModMetadataError as e:
+            print(f"Failed to read mod metadata: {e}")
+            return [], str(e)
+
+    def scan(self, folder, workers=8):
+        """Возвращает {путь к jar: [ModInfo, ...]} для всех jar в каталоге."""
+        try:
+            filenames = sorted(
+                filename for filename in os.listdir(folder)
+                if filename.endswith(".jar")
+            )
+        except OSError:
+            filenames = []
+
+        result = {}
+        changed = []
+        for filename in filenames:
+            path = os.path.join(folder, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entry = self.entries.get(self._key(path))
+            if (
+                entry is not None
+                and entry["size"] == stat.st_size
+                and entry["mtime"] == stat.st_mtime_ns
+            ):
+                result[path] = entry
+            else:
+                changed.append((path, stat))
+
+        if changed:
+            with ThreadPoolExecutor(max_workers=min(workers, len(changed))) as executor:
+                for (path, stat), (mods, error) in zip(
+                    changed, executor.map(self._read, [path for path, _ in changed])
+                ):
+                    entry = {
+                        "size": stat.st_size,
+                        "mtime": stat.st_mtime_ns,
+                        "mods": mods,
+                        "error": error,
+                    }
+                    result[path] = entry
+                    with self._lock:
+                        self.entries[self._key(path)] = entry
+                        self._dirty = True
+
+        # Удалённые jar из этого каталога больше не нужны
+        prefix = self._key(folder).rstrip("/") + "/"
+        if prefix == "./":
+            prefix = ""
+        seen = {self._key(path) for path in result}
+        with self._lock:
+            for key in list(self.entries):
+                if key.startswith(prefix) and "/" not in key[len(prefix):] and key not in seen:
+                    del self.entries[key]
+                    self._dirty = True
+
+        return {
+            path: [ModInfo(**mod) for mod in entry["mods"]]
+            for path, entry in result.items()
+        }
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(
+                {"version": MOD_INDEX_VERSION, "entries": self.entries},
+                separators=(",", ":"),
+            )
+            self._dirty = False
+        write_atomic(self.path, data.encode("utf-8"))
@@ -0,0 +1,247 @@
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3Error
+from urllib3.util.retry import Retry
+
+from constants import *
+from mirrors import OfflineError, mirror_config
+
+
+class _InFlightRequest:
+    def __init__(self):
+        self.event = threading.Event()
+        self.response = None
+        self.error = None
+
+    def wait(self):
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+class HttpClient:
+    """Общий HTTP-клиент: пул соединений, зеркала, автономный режим и склейка одинаковых GET."""
+
+    def __init__(
+        self,
+        pool_size=HTTP_POOL_SIZE,
+        retries=HTTP_RETRIES,
+        backoff=HTTP_BACKOFF,
+        timeout=HTTP_TIMEOUT,
+    ):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = LAUNCHER_NAME
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+        )
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_HOSTS,
+            pool_maxsize=pool_size,
+            pool_block=True,
+            max_retries=retry,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Потоковые загрузки повторяет сам download_file (с докачкой), поэтому
+        # у их сессии повторов на уровне urllib3 нет — иначе они перемножаются
+        self.stream_session = requests.Session()
+        self.stream_session.headers["User-Agent"] = LAUNCHER_NAME
+        stream_adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_HOSTS,
+            pool_maxsize=pool_size,
+            pool_block=True,
+            max_retries=0,
+        )
+        self.stream_session.mount("http://", stream_adapter)
+        self.stream_session.mount("https://", stream_adapter)
+
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, stream=False, timeout=None):
+        timeout = timeout or self.timeout
+        url = mirror_config.check(url)
+        if stream:
+            return self.stream_session.get(
+                url, headers=headers, stream=True, timeout=timeout
+            )
+
+        key = (url, tuple(sorted((headers or {}).items())))
+        with self._lock:
+            request = self._in_flight.get(key)
+            owner = request is None
+            if owner:
+                request = _InFlightRequest()
+                self._in_flight[key] = request
+
+        if not owner:
+            return request.wait()
+
+        try:
+            request.response = self.session.get(
+                url, headers=headers, timeout=timeout
+            )
+        except Exception as e:
+            request.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            request.event.set()
+        return request.response
+
+
+http_client = HttpClient()
+
+
+class DownloadError(Exception):
+    pass
+
+
+def _read_chunks(response):
+    # Буфер растёт, пока сеть успевает его заполнять: мелкие файлы не держат
+    # лишнюю память, а большие читаются крупными блоками
+    chunk_size = DOWNLOAD_MIN_CHUNK
+    while True:
+        chunk = response.raw.read(chunk_size, decode_content=True)
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) == chunk_size and chunk_size < DOWNLOAD_MAX_CHUNK:
+            chunk_size *= 2
+
+
+def _hash_existing(path, digest):
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(DOWNLOAD_MAX_CHUNK), b""):
+            digest.update(block)
+
+
+# Один файл назначения качает только один поток: общий .part иначе портится.
+# Блокировка живёт, пока её кто-то держит или ждёт, — словарь не растёт с каждым файлом
+_download_locks = {}
+_download_locks_lock = threading.Lock()
+
+
+@contextmanager
+def _download_lock(path):
+    key = os.path.realpath(path)
+    with _download_locks_lock:
+        lock, users = _download_locks.get(key, (None, 0))
+        lock = lock or threading.Lock()
+        _download_locks[key] = (lock, users + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _download_locks_lock:
+            lock, users = _download_locks[key]
+            if users == 1:
+                del _download_locks[key]
+            else:
+                _download_locks[key] = (lock, users - 1)
+
+
+def _is_complete(path, sha1, size):
+    # Без sha1 готовность проверяется только по размеру; без обоих — файл качается заново
+    try:
+        if size is not None and os.path.getsize(path) != size:
+            return False
+        if sha1 is None:
+            return size is not None
+        digest = hashlib.sha1()
+        _hash_existing(path, digest)
+    except OSError:
+        return False
+    return digest.hexdigest() == sha1
+
+
+def download_file(url, path, sha1=None, size=None, retries=DOWNLOAD_RETRIES, on_bytes=None):
+    """Скачивает файл с докачкой через Range, проверкой sha1/размера и атомарной заменой.
+
+    Готовый файл (совпал sha1, а без него — размер) повторно не качается.
+    ``on_bytes`` вызывается с размером каждого записанного блока.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with _download_lock(path):
+        if _is_complete(path, sha1, size):
+            return path
+        return _download(url, path, sha1, size, retries, on_bytes)
+
+
+def _download(url, path, sha1, size, retries, on_bytes):
+    temp_path = f"{path}.part"
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(HTTP_BACKOFF * (2 ** (attempt - 1)))
+
+        try:
+            offset = os.path.getsize(temp_path) if os.path.exists(temp_path) else 0
+            if size is not None and offset > size:
+                os.remove(temp_path)
+                offset = 0
+            headers = {"Range": f"bytes={offset}-"} if offset else None
+
+            response = http_client.get(url, headers=headers, stream=True)
+            with response:
+                if response.status_code == 206 and offset:
+                    mode = "ab"
+                elif response.status_code == 416 and offset:
+                    # Частичный файл уже целиком скачан (или испорчен) — проверим ниже
+                    mode = None
+                elif response.status_code == 200:
+                    mode = "wb"
+                    offset = 0
+                elif response.status_code in RETRY_STATUSES and attempt < retries:
+                    continue
+                else:
+                    raise DownloadError(
+                        f"Failed to download {url}: HTTP {response.status_code}"
+                    )
+
+                digest = hashlib.sha1()
+                if offset:
+                    _hash_existing(temp_path, digest)
+                if mode is not None:
+                    with open(temp_path, mode) as file:
+                        for chunk in _read_chunks(response):
+                            file.write(chunk)
+                            digest.update(chunk)
+                            if on_bytes is not None:
+                                on_bytes(len(chunk))
+
+            written = os.path.getsize(temp_path)
+            if (size is not None and written != size) or (
+                sha1 is not None and digest.hexdigest() != sha1
+            ):
+                os.remove(temp_path)
+                if attempt == retries:
+                    raise DownloadError(f"Checksum mismatch for {url}")
+                continue
+
+            os.replace(temp_path, path)
+            return path
+        except OfflineError as e:
+            raise DownloadError(str(e)) from e
+        except (requests.RequestException, Urllib3Error, OSError) as e:
+            # Файл мог заменить другой процесс — если он целый, загрузка удалась
+            if _is_complete(path, sha1, size):
+                return path
+            if attempt == retries:
+                raise DownloadError(f"Failed to download {url}: {e}") from e
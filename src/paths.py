@@ -0,0 +1,58 @@
+import os
+import platform
+import threading
+
+from constants import *
+
+
+def get_minecraft_directory():
+    """Путь к .minecraft по умолчанию (без импорта minecraft_launcher_lib)."""
+    home = os.path.expanduser("~")
+    if platform.system() == "Windows":
+        return os.path.join(
+            os.getenv("APPDATA", os.path.join(home, "AppData", "Roaming")), ".minecraft"
+        )
+    elif platform.system() == "Darwin":
+        return os.path.join(home, "Library", "Application Support", "minecraft")
+    return os.path.join(home, ".minecraft")
+
+
+def cache_directory(*parts):
+    """Возвращает (и создаёт) каталог кэша лаунчера."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+    path = os.path.join(base, CACHE_DIRECTORY_NAME, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def config_directory():
+    """Возвращает (и создаёт) каталог настроек лаунчера, которые не стоит терять вместе с кэшем."""
+    if os.name == "nt":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+            os.path.expanduser("~"), ".config"
+        )
+    path = os.path.join(base, CACHE_DIRECTORY_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def launcher_directory(minecraft_directory, *parts):
+    """Возвращает (и создаёт) служебный каталог лаунчера внутри установки."""
+    path = os.path.join(minecraft_directory, LAUNCHER_DATA_DIRECTORY, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def write_atomic(path, data):
+    """Записывает файл через временный файл, чтобы не оставить его обрезанным."""
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
@@ -0,0 +1,126 @@
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+from constants import *
+import tracing
+
+# Строки лога, которые игра пишет сразу после создания окна (LWJGL 3 и старый LWJGL 2)
+GAME_WINDOW_PATTERN = re.compile(r"Backend library: LWJGL|LWJGL Version: ")
+
+
+class LogBuffer:
+    """Последние ``max_lines`` строк вывода игры; ``since()`` отдаёт строки после позиции читателя."""
+
+    def __init__(self, max_lines=CONSOLE_MAX_LINES):
+        self._lines = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def append(self, line):
+        with self._lock:
+            self._lines.append(line)
+            self.total += 1
+
+    def extend(self, lines):
+        with self._lock:
+            for line in lines:
+                self._lines.append(line)
+                self.total += 1
+
+    def since(self, position):
+        """Возвращает (новые строки, новая позиция, число пропущенных строк)."""
+        with self._lock:
+            first = self.total - len(self._lines)
+            start = max(position, first)
+            lines = list(islice(self._lines, start - first, None))
+            return lines, self.total, start - position
+
+    def lines(self):
+        with self._lock:
+            return list(self._lines)
+
+
+class GameProcess:
+    """Запущенная игра; stdout и stderr читает поток-демон в ``LogBuffer``."""
+
+    def __init__(self, command, cwd=None, log=None):
+        self.command = command
+        self.log = log or LogBuffer()
+        self.telemetry = None  # TelemetrySampler, если запись ресурсов включена
+        self.started_ns = time.perf_counter_ns()
+        kwargs = {}
+        if os.name == "nt":
+            # Без отдельного окна консоли: вывод и так попадает в лаунчер
+            kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+        self.process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            **kwargs,
+        )
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    def _read(self):
+        # Читаем крупными блоками и режем на строки сами: построчный readline
+        # на болтливом модпаке заметно нагружает процессор
+        pending = b""
+        # Пока трассировка ждёт окна игры, строки проверяются по шаблону
+        boot_traced = not tracing.enabled()
+        first_output = True
+        with self.process.stdout as stream:
+            while True:
+                data = stream.read1(65536)
+                if not data:
+                    break
+                if first_output and not boot_traced:
+                    tracing.complete("jvm first output", self.started_ns, time.perf_counter_ns())
+                first_output = False
+                *lines, pending = (pending + data).split(b"\n")
+                if len(pending) > CONSOLE_MAX_LINE_LENGTH:
+                    lines.append(pending)
+                    pending = b""
+                if lines:
+                    decoded = [self._decode(line) for line in lines]
+                    self.log.extend(decoded)
+                    if not boot_traced and any(GAME_WINDOW_PATTERN.search(line) for line in decoded):
+                        tracing.complete("jvm boot to window", self.started_ns, time.perf_counter_ns())
+                        boot_traced = True
+        if pending:
+            self.log.append(self._decode(pending))
+
+    @staticmethod
+    def _decode(line):
+        return line[:CONSOLE_MAX_LINE_LENGTH].decode("utf-8", errors="replace").rstrip("\r")
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    @property
+    def returncode(self):
+        return self.process.returncode
+
+    def is_running(self):
+        return self.process.poll() is None
+
+    def wait(self, timeout=None):
+        returncode = self.process.wait(timeout)
+        # Дочитываем остаток вывода, чтобы последние строки не потерялись
+        self.reader.join(1)
+        return returncode
+
+    def terminate(self):
+        if self.is_running():
+            self.process.terminate()
+
+    def kill(self):
+        if self.is_running():
+            self.process.kill()
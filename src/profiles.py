@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import threading
+
+from paths import launcher_directory, write_atomic
+from store import ContentStore, link_file
+
+
+def _file_sha1(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def _upgrade(profile):
+    # Старые профили хранили в minecraft_version то, что было выбрано в списке версий:
+    # версию загрузчика Fabric или ключ промо-версии Forge ("1.20.1-recommended")
+    if "loader_version" in profile:
+        return
+    profile["loader_version"] = ""
+    if profile.get("loader") == "Fabric":
+        profile["loader_version"] = profile.get("minecraft_version", "")
+        profile["minecraft_version"] = ""
+    elif profile.get("loader") == "Forge":
+        profile["minecraft_version"] = profile.get("minecraft_version", "").rsplit("-", 1)[0]
+
+
+class ModProfiles:
+    """Именованные наборы модов установки; jar хранятся один раз и связываются с mods/ ссылками."""
+
+    DEFAULT_PROFILE = "Default"
+
+    def __init__(self, minecraft_directory):
+        self.minecraft_directory = minecraft_directory
+        self.mods_folder = os.path.join(minecraft_directory, "mods")
+        self.library = ContentStore(
+            launcher_directory(minecraft_directory, "mod-library")
+        )
+        self.path = os.path.join(
+            launcher_directory(minecraft_directory), "profiles.json"
+        )
+        self.profiles = {}
+        self.active = None
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            self.profiles = data["profiles"]
+            self.active = data.get("active")
+        except (OSError, ValueError, KeyError, TypeError):
+            self.profiles = {}
+            self.active = None
+        for profile in self.profiles.values():
+            _upgrade(profile)
+
+    def names(self):
+        return list(self.profiles)
+
+    def get(self, name=None):
+        return self.profiles.get(self.active if name is None else name)
+
+    def _jars(self):
+        try:
+            return [
+                filename for filename in os.listdir(self.mods_folder)
+                if filename.endswith(".jar")
+            ]
+        except OSError:
+            return []
+
+    def _capture(self, known=None):
+        # Собирает текущее содержимое mods/; файлы, уже связанные с библиотекой,
+        # не перехешируются — хватает сравнения inode
+        known = known or {}
+        mods = {}
+        for filename in self._jars():
+            path = os.path.join(self.mods_folder, filename)
+            sha1 = known.get(filename)
+            if sha1 is None or not self.library.is_linked(sha1, path):
+                sha1 = _file_sha1(path)
+                self.library.add(path, sha1)
+            mods[filename] = sha1
+        return mods
+
+    def missing(self, name):
+        """Файлы профиля, которых нет в библиотеке модов."""
+        return sorted(
+            filename for filename, sha1 in self.profiles[name]["mods"].items()
+            if not self.library.has(sha1)
+        )
+
+    def create(self, name, minecraft_version="", loader="", loader_version=""):
+        """Создаёт профиль из модов, которые сейчас лежат в mods/."""
+        with self._lock:
+            current = self.get()
+            self.profiles[name] = {
+                "minecraft_version": minecraft_version,
+                "loader": loader,
+                "loader_version": loader_version,
+                "mods": self._capture(current["mods"] if current else None),
+            }
+            self.active = name
+            self._save()
+        return self.profiles[name]
+
+    def activate(self, name):
+        """Делает профиль активным и раскладывает его моды в mods/."""
+        with self._lock:
+            target = self.profiles[name]
+            # Сначала проверяем весь профиль: mods/ не трогаем, если его не собрать
+            missing = self.missing(name)
+            if missing:
+                raise LookupError(
+                    f"Mod profile {name} is missing {', '.join(missing)} in the library"
+                )
+
+            # Изменения в mods/ (добавленные или удалённые вручную моды)
+            # сохраняются в текущий профиль, чтобы ничего не потерять
+            current = self.get()
+            if current is not None:
+                current["mods"] = self._capture(current["mods"])
+            else:
+                mods = self._capture()
+                if mods:
+                    self.profiles.setdefault(self.DEFAULT_PROFILE, {
+                        "minecraft_version": "",
+                        "loader": "",
+                        "loader_version": "",
+                        "mods": {},
+                    })["mods"].update(mods)
+
+            os.makedirs(self.mods_folder, exist_ok=True)
+            wanted = target["mods"]
+            for filename in self._jars():
+                path = os.path.join(self.mods_folder, filename)
+                sha1 = wanted.get(filename)
+                if sha1 is None or not self.library.is_linked(sha1, path):
+                    os.remove(path)
+            for filename, sha1 in wanted.items():
+                path = os.path.join(self.mods_folder, filename)
+                if not os.path.lexists(path):
+                    link_file(self.library.path_for(sha1), path, symlink=True)
+
+            self.active = name
+            self._save()
+        return target
+
+    def delete(self, name):
+        # Файлы в библиотеке остаются: их могут использовать другие профили
+        with self._lock:
+            self.profiles.pop(name, None)
+            if self.active == name:
+                self.active = None
+            self._save()
+
+    def _save(self):
+        data = json.dumps(
+            {"active": self.active, "profiles": self.profiles}, indent=2
+        )
+        write_atomic(self.path, data.encode("utf-8"))
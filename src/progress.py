@@ -0,0 +1,98 @@
+import threading
+import time
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if hours:
+        return f"{hours}:{minutes:02}:{seconds:02}"
+    return f"{minutes}:{seconds:02}"
+
+
+class ProgressTracker:
+    """Прогресс установки из рабочих потоков; отображение опрашивает ``snapshot()`` со своей частотой."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.revision = 0
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.status = ""
+            self.progress = 0
+            self.maximum = 0
+            self.bytes = 0
+            self.revision += 1
+            self._phase_started = time.monotonic()
+            self._phase_bytes = 0
+
+    def set_status(self, status):
+        with self._lock:
+            self.status = status
+            self.revision += 1
+
+    def set_progress(self, progress):
+        with self._lock:
+            self.progress = progress
+            self.revision += 1
+
+    def set_max(self, maximum):
+        # Новый этап — скорость считаем заново
+        with self._lock:
+            self.maximum = maximum
+            self.progress = 0
+            self._phase_started = time.monotonic()
+            self._phase_bytes = self.bytes
+            self.revision += 1
+
+    def add_bytes(self, count):
+        with self._lock:
+            self.bytes += count
+            self.revision += 1
+
+    def callback(self):
+        return {
+            "setStatus": self.set_status,
+            "setProgress": self.set_progress,
+            "setMax": self.set_max,
+            "addBytes": self.add_bytes,
+        }
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = max(time.monotonic() - self._phase_started, 1e-6)
+            files_per_second = self.progress / elapsed
+            bytes_per_second = (self.bytes - self._phase_bytes) / elapsed
+            remaining = max(self.maximum - self.progress, 0)
+            eta = remaining / files_per_second if files_per_second > 0 else None
+            return {
+                "revision": self.revision,
+                "status": self.status,
+                "progress": self.progress,
+                "max": self.maximum,
+                "files_per_second": files_per_second,
+                "bytes_per_second": bytes_per_second,
+                "eta": eta,
+            }
+
+    @staticmethod
+    def format_details(snapshot):
+        if not snapshot["max"] or not snapshot["progress"]:
+            return ""
+        details = [
+            f"{snapshot['files_per_second']:.1f} files/s",
+            f"{format_size(snapshot['bytes_per_second'])}/s",
+        ]
+        if snapshot["eta"] is not None and snapshot["progress"] < snapshot["max"]:
+            details.append(f"ETA {format_duration(snapshot['eta'])}")
+        return ", ".join(details)
@@ -0,0 +1,101 @@
+import json
+import os
+
+
+class InstalledVersionIndex:
+    """Индекс версий в ``<directory>/versions``; ``refresh()`` перечитывает только изменённые JSON."""
+
+    def __init__(self, minecraft_directory=None):
+        self.minecraft_directory = None
+        self.versions = {}
+        self._mtimes = {}
+        self._forge = {}
+        self._fabric = {}
+        if minecraft_directory is not None:
+            self.refresh(minecraft_directory)
+
+    @property
+    def versions_directory(self):
+        return os.path.join(self.minecraft_directory, "versions")
+
+    def __contains__(self, version_id):
+        return version_id in self.versions
+
+    def __iter__(self):
+        return iter(self.versions.values())
+
+    def __len__(self):
+        return len(self.versions)
+
+    def refresh(self, minecraft_directory=None):
+        """Пересканирует каталог; возвращает True, если список версий изменился."""
+        if minecraft_directory is not None and minecraft_directory != self.minecraft_directory:
+            self.minecraft_directory = minecraft_directory
+            self.versions = {}
+            self._mtimes = {}
+
+        try:
+            entries = os.listdir(self.versions_directory)
+        except OSError:
+            entries = []
+
+        changed = False
+        seen = set()
+        for version_id in entries:
+            path = os.path.join(
+                self.versions_directory, version_id, f"{version_id}.json"
+            )
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(version_id)
+            if self._mtimes.get(version_id) == mtime:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+            except (OSError, ValueError):
+                continue
+            self._mtimes[version_id] = mtime
+            self.versions[version_id] = {
+                "id": data.get("id", version_id),
+                "type": data.get("type", ""),
+                "inheritsFrom": data.get("inheritsFrom"),
+            }
+            changed = True
+
+        for version_id in set(self.versions) - seen:
+            del self.versions[version_id]
+            self._mtimes.pop(version_id, None)
+            changed = True
+
+        if changed:
+            self._rebuild_loader_index()
+        return changed
+
+    def _rebuild_loader_index(self):
+        self._forge = {}
+        self._fabric = {}
+        for version_id, version in self.versions.items():
+            minecraft_version = version["inheritsFrom"] or version_id.split("-")[0]
+            if "forge" in version_id.lower():
+                self._forge.setdefault(minecraft_version, []).append(version_id)
+            elif version_id.startswith("fabric-loader-") and version["inheritsFrom"]:
+                loader = version_id[len("fabric-loader-"):-(len(minecraft_version) + 1)]
+                self._fabric.setdefault(loader, []).append(version["inheritsFrom"])
+
+    def is_forge_installed(self, promotion, build):
+        # promotion — ключ из promotions_slim.json, например "1.20.1-recommended"
+        minecraft_version = promotion.rsplit("-", 1)[0]
+        return any(
+            build in version_id
+            for version_id in self._forge.get(minecraft_version, ())
+        )
+
+    def is_fabric_installed(self, loader_version):
+        return loader_version in self._fabric
+
+    def fabric_minecraft_versions(self, loader_version):
+        """Версии игры, под которые установлен этот загрузчик Fabric."""
+        return sorted(self._fabric.get(loader_version, ()))
@@ -0,0 +1,227 @@
+import os
+import re
+from dataclasses import dataclass
+
+# Зависимости, которые предоставляет сама игра или загрузчик, а не моды
+PLATFORM_IDS = {
+    "minecraft", "java", "fabricloader", "fabric-loader",
+    "forge", "neoforge", "javafml", "mcp", "FML",
+}
+
+LOADERS = {
+    "Forge": "forge",
+    "Fabric": "fabric",
+}
+
+
+@dataclass
+class Problem:
+    kind: str
+    mod: str
+    message: str
+
+    def __str__(self):
+        return self.message
+
+
+# --- Versions ---
+
+def _tokens(version):
+    return [
+        (1, int(token)) if token.isdigit() else (0, token.lower())
+        for token in re.findall(r"\d+|[A-Za-z]+", version)
+    ]
+
+
+def version_key(version):
+    """Ключ сравнения версий: числа сравниваются как числа, пре-релизы раньше релиза."""
+    version = version.split("+", 1)[0]
+    main, _, prerelease = version.partition("-")
+    parts = _tokens(main)
+    while parts and parts[-1] == (1, 0):
+        parts.pop()
+    return parts, 0 if prerelease else 1
+
+
+def _compare(left, right):
+    left, right = version_key(left), version_key(right)
+    return (left > right) - (left < right)
+
+
+def _bump(version, position):
+    numbers = [int(token) for token in re.findall(r"\d+", version)]
+    numbers = (numbers + [0, 0])[:max(position + 1, 1)]
+    numbers[position] += 1
+    return ".".join(str(number) for number in numbers)
+
+
+def _matches_maven(version, version_range):
+    # [1.20.1,1.20.2) — диапазоны Maven из mods.toml, через запятую можно указать несколько
+    ranges = re.findall(r"([\[(])([^\])]*)([\])])", version_range)
+    if not ranges:
+        return _compare(version, version_range) == 0
+    for opening, bounds, closing in ranges:
+        if "," not in bounds:
+            if _compare(version, bounds.strip()) == 0:
+                return True
+            continue
+        low, high = (bound.strip() for bound in bounds.split(",", 1))
+        if low:
+            result = _compare(version, low)
+            if result < 0 or (result == 0 and opening == "("):
+                continue
+        if high:
+            result = _compare(version, high)
+            if result > 0 or (result == 0 and closing == ")"):
+                continue
+        return True
+    return False
+
+
+def _matches_constraint(version, constraint):
+    # Синтаксис fabric.mod.json: >=1.2, <2, ~1.2, ^1.2, 1.20.x, =1.0
+    match = re.match(r"^(>=|<=|>|<|=|~|\^)?\s*(.+)$", constraint)
+    operator, target = match.groups()
+    if target in ("*", "x", "X"):
+        return True
+    if re.search(r"\.[xX*]$", target):
+        prefix = _tokens(target[:-2])
+        return _tokens(version.partition("-")[0])[:len(prefix)] == prefix
+    result = _compare(version, target)
+    if operator == ">=":
+        return result >= 0
+    if operator == "<=":
+        return result <= 0
+    if operator == ">":
+        return result > 0
+    if operator == "<":
+        return result < 0
+    if operator == "~":
+        return result >= 0 and _compare(version, _bump(target, 1)) < 0
+    if operator == "^":
+        return result >= 0 and _compare(version, _bump(target, 0)) < 0
+    return result == 0
+
+
+def version_matches(version, version_range):
+    """Проверяет версию по диапазону из метаданных мода.
+
+    Если версия или диапазон не распознаны (например, остались плейсхолдеры
+    сборки), считается, что условие выполнено — запуск блокируется только
+    тогда, когда несовместимость установлена точно.
+    """
+    version_range = (version_range or "").strip()
+    if not version or not version_range or version_range == "*" or "${" in version + version_range:
+        return True
+    try:
+        if version_range[0] in "[(":
+            return _matches_maven(version, version_range)
+        return any(
+            all(
+                _matches_constraint(version, constraint)
+                for constraint in alternative.split()
+            )
+            for alternative in version_range.split("||")
+        )
+    except (AttributeError, IndexError, ValueError):
+        return True
+
+
+# --- Resolver ---
+
+def resolve(mods, version_type, minecraft_version=None, loader_version=None):
+    """Проверяет набор модов перед запуском.
+
+    ``mods`` — результат ``ModIndex.scan``: ``{путь к jar: [ModInfo, ...]}``.
+    Возвращает список ``Problem``; пустой список означает, что запуск безопасен.
+    """
+    loader = LOADERS.get(version_type)
+    if loader is None:
+        # Ванильный клиент моды не загружает
+        return []
+
+    problems = []
+    present = {}
+    bundled = {}
+    for path, infos in mods.items():
+        for info in infos:
+            if info.bundled_by:
+                # Из нескольких вложенных копий загрузчик берёт новейшую, это не дубликат
+                current = bundled.get(info.id)
+                if current is None or _compare(info.version, current[1].version) > 0:
+                    bundled[info.id] = (path, info)
+                continue
+            if info.id in present and present[info.id][0] != path:
+                problems.append(Problem(
+                    "duplicate",
+                    info.id,
+                    f"{info.id} is installed twice: "
+                    f"{os.path.basename(present[info.id][0])} and {os.path.basename(path)}",
+                ))
+                continue
+            present[info.id] = (path, info)
+
+    provided = dict(present)
+    for path, info in present.values():
+        for alias in info.provides:
+            provided.setdefault(alias, (path, info))
+    # Вложенные моды закрывают зависимости, но самостоятельный мод с тем же id важнее
+    for path, info in bundled.values():
+        for mod_id in (info.id, *info.provides):
+            provided.setdefault(mod_id, (path, info))
+
+    platform = {"minecraft": minecraft_version}
+    if loader == "fabric":
+        platform["fabricloader"] = loader_version
+
+    for mod_id, (path, info) in present.items():
+        if info.loader and info.loader != loader:
+            problems.append(Problem(
+                "loader",
+                mod_id,
+                f"{info.name} ({mod_id}) is a {info.loader} mod and cannot run on {version_type}",
+            ))
+            continue
+
+        if minecraft_version and not version_matches(minecraft_version, info.minecraft):
+            problems.append(Problem(
+                "minecraft",
+                mod_id,
+                f"{info.name} ({mod_id}) requires Minecraft {info.minecraft}, "
+                f"selected {minecraft_version}",
+            ))
+
+        for dependency, version_range in info.dependencies.items():
+            if dependency in platform:
+                version = platform[dependency]
+                if version and not version_matches(version, version_range):
+                    problems.append(Problem(
+                        "version",
+                        mod_id,
+                        f"{info.name} ({mod_id}) requires {dependency} {version_range}, "
+                        f"selected {version}",
+                    ))
+                continue
+            if dependency in PLATFORM_IDS:
+                continue
+            if dependency not in provided:
+                problems.append(Problem(
+                    "missing",
+                    mod_id,
+                    f"{info.name} ({mod_id}) requires {dependency} {version_range}, "
+                    f"which is not installed",
+                ))
+                continue
+            dependency_info = provided[dependency][1]
+            if not version_matches(dependency_info.version, version_range):
+                problems.append(Problem(
+                    "version",
+                    mod_id,
+                    f"{info.name} ({mod_id}) requires {dependency} {version_range}, "
+                    f"installed {dependency_info.version}",
+                ))
+    return problems
+
+
+def format_report(problems):
+    return "\n".join(f"• {problem}" for problem in problems)
@@ -0,0 +1,98 @@
+import os
+import shutil
+import threading
+
+from paths import cache_directory
+
+# ioctl FICLONE (Linux): копия через reflink на btrfs/xfs без дублирования данных
+FICLONE = 0x40049409
+
+
+def _reflink(source, destination):
+    import fcntl
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def link_file(source, destination, symlink=False):
+    """Размещает ``source`` по пути ``destination``: hardlink, reflink или копия.
+
+    С ``symlink=True`` перед копированием пробуется символическая ссылка.
+    """
+    directory = os.path.dirname(destination)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Имя уникально и между процессами: каталог установки может быть общим
+    temp_path = f"{destination}.{os.getpid()}.{threading.get_ident()}.link"
+    if os.path.lexists(temp_path):
+        os.remove(temp_path)
+
+    try:
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            try:
+                _reflink(source, temp_path)
+            except (OSError, ImportError):
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                if symlink:
+                    try:
+                        os.symlink(os.path.abspath(source), temp_path)
+                    except OSError:
+                        symlink = False
+                if not symlink:
+                    shutil.copy2(source, temp_path)
+        os.replace(temp_path, destination)
+    except BaseException:
+        if os.path.lexists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class ContentStore:
+    """Общее хранилище проверенных библиотек и ассетов по SHA-1; установки получают на них ссылки."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or cache_directory("store")
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def path_for(self, sha1):
+        return os.path.join(self.directory, sha1[:2], sha1)
+
+    def has(self, sha1):
+        return os.path.isfile(self.path_for(sha1))
+
+    def _lock_for(self, sha1):
+        with self._locks_lock:
+            return self._locks.setdefault(sha1, threading.Lock())
+
+    def is_linked(self, sha1, path):
+        try:
+            return os.path.samefile(self.path_for(sha1), path)
+        except OSError:
+            return False
+
+    def add(self, path, sha1):
+        """Добавляет уже проверенный файл в хранилище."""
+        with self._lock_for(sha1):
+            if not self.has(sha1):
+                link_file(path, self.path_for(sha1))
+
+    def fetch(self, url, sha1, size=None, on_bytes=None):
+        """Скачивает объект в хранилище, если его там ещё нет."""
+        from network import download_file
+
+        with self._lock_for(sha1):
+            if not self.has(sha1):
+                download_file(
+                    url, self.path_for(sha1), sha1, size, on_bytes=on_bytes
+                )
+        return self.path_for(sha1)
+
+    def materialize(self, url, sha1, destination, size=None, on_bytes=None):
+        if self.is_linked(sha1, destination):
+            return
+        link_file(self.fetch(url, sha1, size, on_bytes), destination)
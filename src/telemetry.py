@@ -0,0 +1,311 @@
+import glob
+import itertools
+import json
+import os
+import re
+import threading
+import time
+
+from constants import *
+from paths import launcher_directory
+
+COLUMNS = (
+    "t", "rss_mb", "cpu_s", "threads",
+    "gc", "gc_pause_ms", "heap_before_mb", "heap_after_mb", "heap_total_mb",
+)
+
+_UNITS = {"K": 1 / 1024, "M": 1, "G": 1024}
+_session_numbers = itertools.count(1)
+_XMX = re.compile(r"-Xmx(\d+)([KkMmGg])")
+# Единое логирование (Java 9+): [12.345s][info][gc] GC(3) Pause Young ... 512M->128M(1024M) 3.456ms
+# ZGC пишет проценты: 204M(10%)->48M(2%)
+_UNIFIED_GC = re.compile(
+    r"^\[(?P<uptime>[\d.]+)s\].*\bGC\(\d+\) (?P<kind>.*?)\s*"
+    r"(?P<before>\d+)(?P<before_unit>[KMG])(?:\(\d+%\))?->"
+    r"(?P<after>\d+)(?P<after_unit>[KMG])(?:\(\d+%\))?"
+    r"(?:\((?P<total>\d+)(?P<total_unit>[KMG])\))?"
+    r"(?:\s+(?P<pause>[\d.]+)ms)?"
+)
+# Java 8, -Xloggc: 12.345: [GC (Allocation Failure)  524288K->131072K(1005056K), 0.0123456 secs]
+_LEGACY_GC = re.compile(
+    r"^(?P<uptime>[\d.]+): \[(?P<kind>Full GC|GC)[^\]]*?\s"
+    r"(?P<before>\d+)K->(?P<after>\d+)K\((?P<total>\d+)K\), (?P<pause>[\d.]+) secs\]"
+)
+
+
+def supported():
+    """Выборка процесса идёт через /proc — это есть только в Linux; лог GC читается везде."""
+    return os.path.isdir("/proc/self")
+
+
+def session_paths(minecraft_directory):
+    """Пути нового временного ряда и лога GC; старые сессии сверх лимита удаляются."""
+    directory = launcher_directory(minecraft_directory, "telemetry")
+    sessions = sorted(glob.glob(os.path.join(directory, "session-*.csv")))
+    for path in sessions[:max(len(sessions) - TELEMETRY_MAX_SESSIONS + 1, 0)]:
+        for stale in (path, path[:-len(".csv")] + "-gc.log"):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    # Несколько игр могут стартовать в одну секунду — номер делает имя уникальным
+    name = time.strftime("session-%Y%m%d-%H%M%S") + f"-{os.getpid()}-{next(_session_numbers)}"
+    return (
+        os.path.join(directory, f"{name}.csv"),
+        os.path.join(directory, f"{name}-gc.log"),
+    )
+
+
+def latest_session(minecraft_directory):
+    sessions = glob.glob(os.path.join(
+        minecraft_directory, LAUNCHER_DATA_DIRECTORY, "telemetry", "session-*.csv"
+    ))
+    return max(sessions, key=os.path.getmtime) if sessions else None
+
+
+def heap_limit_mb(command):
+    """Значение -Xmx из команды запуска, в МБ."""
+    for argument in reversed(command):
+        match = _XMX.fullmatch(argument)
+        if match:
+            return int(int(match[1]) * _UNITS[match[2].upper()])
+    return None
+
+
+def gc_log_arguments(path, java_major):
+    if java_major >= 9:
+        if os.name == "nt":
+            # В Windows путь с двоеточием нужно взять в кавычки, иначе -Xlog его разрежет
+            return [f'-Xlog:gc:file="{path}":uptime']
+        return [f"-Xlog:gc:file={path}:uptime"]
+    return [f"-Xloggc:{path}"]
+
+
+def parse_gc_line(line):
+    """Возвращает (uptime, до, после, всего МБ, пауза мс, полная сборка) или None."""
+    match = _UNIFIED_GC.match(line)
+    if match:
+        total = match["total"]
+        return (
+            float(match["uptime"]),
+            int(match["before"]) * _UNITS[match["before_unit"]],
+            int(match["after"]) * _UNITS[match["after_unit"]],
+            int(total) * _UNITS[match["total_unit"]] if total else None,
+            float(match["pause"]) if match["pause"] else 0.0,
+            "Full" in match["kind"],
+        )
+    match = _LEGACY_GC.match(line)
+    if match:
+        return (
+            float(match["uptime"]),
+            int(match["before"]) / 1024,
+            int(match["after"]) / 1024,
+            int(match["total"]) / 1024,
+            float(match["pause"]) * 1000,
+            match["kind"] == "Full GC",
+        )
+    return None
+
+
+class GcLogReader:
+    """Дочитывает лог GC с места последнего чтения."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.pending = b""
+
+    def read(self):
+        try:
+            with open(self.path, "rb") as file:
+                file.seek(self.offset)
+                data = file.read()
+        except OSError:
+            return []
+        self.offset += len(data)
+        *lines, self.pending = (self.pending + data).split(b"\n")
+        events = []
+        for line in lines:
+            event = parse_gc_line(line.decode("utf-8", errors="replace").strip())
+            if event is not None:
+                events.append(event)
+        return events
+
+
+def read_process(pid, clock_ticks=None):
+    """RSS (МБ), процессорное время (с) и число потоков процесса из /proc; None, если его уже нет."""
+    clock_ticks = clock_ticks or os.sysconf("SC_CLK_TCK")
+    try:
+        with open(f"/proc/{pid}/stat", "r", encoding="ascii") as file:
+            stat = file.read()
+        with open(f"/proc/{pid}/status", "r", encoding="ascii") as file:
+            status = file.read()
+    except OSError:
+        return None
+    # Имя процесса в скобках может содержать пробелы — поля считаем после ')'
+    fields = stat[stat.rfind(")") + 2:].split()
+    if fields[0] in ("Z", "X"):
+        return None
+    values = {}
+    for line in status.splitlines():
+        key, _, value = line.partition(":")
+        values[key] = value.split()
+    if "VmRSS" not in values:
+        return None
+    return (
+        int(values["VmRSS"][0]) / 1024,
+        (int(fields[11]) + int(fields[12])) / clock_ticks,
+        int(values["Threads"][0]),
+    )
+
+
+class TelemetrySampler:
+    """Пишет в CSV строку на интервал: RSS, CPU и потоки игры плюс сборки из лога GC."""
+
+    def __init__(self, process, path, gc_log=None, xmx_mb=None, interval=TELEMETRY_INTERVAL):
+        self.process = process
+        self.path = path
+        self.gc_log = GcLogReader(gc_log) if gc_log else None
+        self.xmx_mb = xmx_mb
+        self.interval = interval
+        self.proc = supported()
+        self.clock_ticks = os.sysconf("SC_CLK_TCK") if self.proc else None
+        self.started = time.monotonic()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("# " + json.dumps({
+                "version": 1,
+                "pid": self.process.pid,
+                "started": time.time(),
+                "xmx_mb": self.xmx_mb,
+                "interval": self.interval,
+                "gc_log": self.gc_log.path if self.gc_log else None,
+            }) + "\n")
+            file.write(",".join(COLUMNS) + "\n")
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8") as file:
+            while not self.stopped.wait(self.interval):
+                row = self.sample()
+                if row is None:
+                    break
+                file.write(row)
+                file.flush()
+            # Последние сборки, записанные перед выходом
+            if self.gc_log is not None:
+                events = self.gc_log.read()
+                if events:
+                    file.write(self._row(None, events))
+
+    def sample(self):
+        if not self.process.is_running():
+            return None
+        process = read_process(self.process.pid, self.clock_ticks) if self.proc else None
+        events = self.gc_log.read() if self.gc_log else []
+        return self._row(process, events)
+
+    def _row(self, process, events):
+        rss, cpu, threads = process or ("", "", "")
+        values = [round(time.monotonic() - self.started, 1), *(
+            round(value, 1) if isinstance(value, float) else value
+            for value in (rss, cpu, threads)
+        )]
+        if events:
+            totals = [event[3] for event in events if event[3] is not None]
+            values += [
+                len(events),
+                round(sum(event[4] for event in events), 2),
+                round(max(event[1] for event in events), 1),
+                round(max(event[2] for event in events), 1),
+                round(max(totals), 1) if totals else "",
+            ]
+        else:
+            values += [0, 0, "", "", ""]
+        return ",".join(str(value) for value in values) + "\n"
+
+
+def read_session(path):
+    """Возвращает (заголовок, строки как словари)."""
+    with open(path, "r", encoding="utf-8") as file:
+        header = json.loads(file.readline()[2:])
+        columns = file.readline().strip().split(",")
+        rows = []
+        for line in file:
+            values = line.strip().split(",")
+            if len(values) != len(columns):
+                continue
+            rows.append({
+                column: float(value) if value else None
+                for column, value in zip(columns, values)
+            })
+    return header, rows
+
+
+def summarize(path):
+    header, rows = read_session(path)
+
+    def peak(column):
+        values = [row[column] for row in rows if row[column] is not None]
+        return max(values) if values else None
+
+    cpu = [row for row in rows if row["cpu_s"] is not None]
+    duration = cpu[-1]["t"] - cpu[0]["t"] if len(cpu) > 1 else 0
+    summary = {
+        "path": path,
+        "started": header.get("started"),
+        "duration_s": rows[-1]["t"] if rows else 0,
+        "xmx_mb": header.get("xmx_mb"),
+        "peak_rss_mb": peak("rss_mb"),
+        "max_threads": peak("threads"),
+        "cpu_percent": (
+            (cpu[-1]["cpu_s"] - cpu[0]["cpu_s"]) / duration * 100 if duration else None
+        ),
+        "gc_count": int(sum(row["gc"] or 0 for row in rows)),
+        "gc_pause_ms": sum(row["gc_pause_ms"] or 0 for row in rows),
+        # Заполненность кучи перед сборкой — верхняя граница её использования,
+        # после сборки — оценка живых данных
+        "peak_heap_mb": peak("heap_before_mb"),
+        "live_heap_mb": peak("heap_after_mb"),
+    }
+    summary["recommended_mb"] = recommend_heap_mb(summary)
+    return summary
+
+
+def recommend_heap_mb(summary):
+    """Размер кучи по наблюдениям: живые данные с запасом в 2,5 раза, не меньше 1 ГБ."""
+    live = summary.get("live_heap_mb")
+    if not live:
+        return None
+    heap_mb = max(live * 2.5, 1024)
+    return int(-(-heap_mb // 256) * 256)
+
+
+def format_summary(summary):
+    lines = []
+    xmx = summary["xmx_mb"]
+    if summary["peak_heap_mb"] is not None:
+        text = f"Peak heap {summary['peak_heap_mb']:.0f} MB"
+        if xmx:
+            text += f" of {xmx} MB -Xmx ({summary['peak_heap_mb'] / xmx:.0%})"
+        lines.append(text + f", live data up to {summary['live_heap_mb']:.0f} MB")
+    elif xmx:
+        lines.append(f"-Xmx {xmx} MB, no collections recorded")
+    if summary["peak_rss_mb"] is not None:
+        lines.append(
+            f"Peak RSS {summary['peak_rss_mb']:.0f} MB, "
+            f"{summary['max_threads']:.0f} threads"
+            + (f", {summary['cpu_percent']:.0f}% CPU" if summary["cpu_percent"] is not None else "")
+        )
+    lines.append(
+        f"{summary['gc_count']} collections, {summary['gc_pause_ms']:.0f} ms paused "
+        f"over {summary['duration_s']:.0f} s"
+    )
+    return "\n".join(lines)
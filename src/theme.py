@@ -0,0 +1,131 @@
+from functools import lru_cache
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtWidgets import QStyleFactory
+
+from constants import *
+
+
+@lru_cache(maxsize=None)
+def compile_stylesheet():
+    """Собирает единую таблицу стилей приложения из палитры constants.py."""
+    return f"""
+        QMainWindow, QMainWindow QWidget {{
+            font-family: Arial;
+            background-color: {MAIN_COLOR};
+        }}
+
+        QLabel {{
+            color: {TEXT_COLOR};
+        }}
+        QLabel[role="title"] {{
+            font-size: 24px;
+            font-weight: bold;
+        }}
+        QLabel[role="heading"] {{
+            font-size: 14px;
+            font-weight: bold;
+        }}
+        QLabel[role="label"] {{
+            font-size: 12px;
+            font-weight: bold;
+        }}
+
+        QCheckBox {{
+            color: {TEXT_COLOR};
+            font-size: 12px;
+        }}
+
+        QLineEdit, QComboBox, QSpinBox, QListWidget, QPlainTextEdit, QTreeWidget {{
+            color: {TEXT_COLOR};
+            border: 1px solid {ACCENT_COLOR};
+            border-radius: 5px;
+            padding: 5px;
+            background-color: {MAIN_COLOR};
+        }}
+        ConsoleWidget {{
+            font-family: monospace;
+            font-size: 11px;
+        }}
+        QHeaderView::section {{
+            color: {TEXT_COLOR};
+            background-color: {ACCENT_COLOR};
+            border: none;
+            padding: 4px;
+        }}
+        QLineEdit:focus, QComboBox:focus, QSpinBox:focus {{
+            border: 1px solid {BLUE};
+        }}
+
+        RoundedWidget {{
+            background-color: {MAIN_COLOR};
+            border-radius: 15px;
+            padding: 10px;
+        }}
+
+        RoundedButton {{
+            background-color: {ACCENT_COLOR};
+            color: {TEXT_COLOR};
+            border-radius: 15px;
+            padding: 10px 20px;
+            font-size: 14px;
+            font-weight: bold;
+            border: none;
+        }}
+        RoundedButton:hover {{
+            background-color: {HOVER_COLOR};
+        }}
+        RoundedButton:pressed {{
+            background-color: {PRESSED_COLOR};
+        }}
+        RoundedButton:disabled {{
+            background-color: {LIGHT_GRAY};
+            color: {ACCENT_COLOR};
+        }}
+
+        TabWidget::pane {{
+            border: none;
+            top: -1px;
+        }}
+        TabWidget::tabBar {{
+            border: none;
+        }}
+        TabWidget QTabBar::tab {{
+            background-color: {MAIN_COLOR};
+            color: {TEXT_COLOR};
+            border-top-left-radius: 10px;
+            border-top-right-radius: 10px;
+            padding: 10px 20px;
+            margin-right: 2px;
+            border: none;
+        }}
+        TabWidget QTabBar::tab:selected {{
+            background-color: {ACCENT_COLOR};
+        }}
+    """
+
+
+def create_palette():
+    # Темная палитра для QApplication
+    palette = QPalette()
+    palette.setColor(QPalette.Window, QColor(MAIN_COLOR))
+    palette.setColor(QPalette.WindowText, Qt.white)
+    palette.setColor(QPalette.Base, QColor(ACCENT_COLOR))
+    palette.setColor(QPalette.AlternateBase, QColor(MAIN_COLOR))
+    palette.setColor(QPalette.ToolTipBase, Qt.white)
+    palette.setColor(QPalette.ToolTipText, Qt.white)
+    palette.setColor(QPalette.Text, Qt.white)
+    palette.setColor(QPalette.Button, QColor(ACCENT_COLOR))
+    palette.setColor(QPalette.ButtonText, Qt.white)
+    palette.setColor(QPalette.BrightText, Qt.red)
+    palette.setColor(QPalette.Link, QColor(BLUE))
+    palette.setColor(QPalette.Highlight, QColor(BLUE))
+    palette.setColor(QPalette.HighlightedText, Qt.black)
+    return palette
+
+
+def apply_theme(app):
+    app.setStyle(QStyleFactory.create("Fusion"))
+    app.setPalette(create_palette())
+    app.setStyleSheet(compile_stylesheet())
@@ -1,37 +1,29 @@
-from subprocess import call
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSettings, QUrl, QTimer, QSize, QPropertyAnimation, QEasingCurve
-from PyQt5.QtWidgets import (
-    QMainWindow, QApplication, QWidget, QLabel, QLineEdit, QComboBox,
-    QPushButton, QVBoxLayout, QHBoxLayout, QSpacerItem, QSizePolicy, QFileDialog,
-    QFrame, QGridLayout, QMessageBox,
-    QStyleFactory, QTabWidget,
-    QSpinBox, QCheckBox, QStyle, QStyleOption,
-    QGraphicsDropShadowEffect, QListWidget, QInputDialog
-)
-from PyQt5.QtGui import QFont, QIcon, QPixmap, QColor, QPainter, QPen, QLinearGradient, QPalette
-
-from minecraft_launcher_lib.utils import get_minecraft_directory, get_version_list, get_installed_versions
-from minecraft_launcher_lib.install import install_minecraft_version
-from minecraft_launcher_lib.command import get_minecraft_command
-
-from random_username.generate import generate_username
-from uuid import uuid1
-from sys import argv, exit
 import os
+from threading import Lock, Thread
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, QTimer
+
+from constants import *
+from progress import ProgressTracker
+from process import GameProcess
+import telemetry
+import tracing
 
 class LaunchThread(QThread):
-    launch_setup_signal = pyqtSignal(str, str, int)
+    launch_setup_signal = pyqtSignal(str, str, str, str, int)
     progress_update_signal = pyqtSignal(
-        int, int, str
+        int, int, str, str
     )
     state_update_signal = pyqtSignal(bool)
+    process_started_signal = pyqtSignal(object)
+    launch_failed_signal = pyqtSignal(str)
+    mod_problems_signal = pyqtSignal(str)
 
+    version_type = "Vanilla"
+    minecraft_version = ""
+    loader_version = ""
     version_id = ""
     username = ""
-    memory_mb = 2048
-    progress = 0
-    progress_max = 0
-    progress_label = ""
+    memory_mb = 0
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -39,102 +31,321 @@ class LaunchThread(QThread):
             self.launch_setup
         )
         self.parent = parent
+        self.process = None
+
+        # Рабочий поток только обновляет состояние, в GUI оно уходит по таймеру
+        self.progress_tracker = ProgressTracker()
+        self.published_revision = -1
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(1000 // PROGRESS_UPDATE_RATE)
+        self.progress_timer.timeout.connect(self.publish_progress)
+        self.started.connect(self.progress_timer.start)
+        self.finished.connect(self.stop_publishing)
 
     def launch_setup(
-        self, version_id, username, memory_mb
+        self, version_type, minecraft_version, loader_version, username, memory_mb
     ):
-        self.version_id = version_id
+        self.version_type = version_type
+        self.minecraft_version = minecraft_version
+        self.loader_version = loader_version
+        # id версии с загрузчиком становится известен после его установки
+        self.version_id = (
+            f"{version_type} {minecraft_version}"
+            if version_type in ("Forge", "Fabric") else minecraft_version
+        )
         self.username = username
         self.memory_mb = memory_mb
 
+        # Настройки снимаются в потоке GUI: пока идёт установка, пользователь
+        # может менять их для следующего запуска
+        self.minecraft_directory = self.parent.install_directory_widget.install_directory
+        self.repair = self.parent.repair_checkbox.isChecked()
+        self.preset = self.parent.settings.value("jvm_preset", None)
+        self.workers = int(
+            self.parent.settings.value("download_workers", DOWNLOAD_WORKERS)
+        )
+        self.store = self.get_content_store()
+        self.telemetry = self.parent.settings.value("telemetry", True, type=bool)
+
     def run(self):
-        self.state_update_signal.emit(True)
+        # Тяжёлые модули загружаются в рабочем потоке, а не при старте окна
+        from random_username.generate import generate_username
+        from launcher import build_command, install_loader, prepare_version
+        from mirrors import patch_launcher_lib
+
+        # Java-среды и Forge minecraft_launcher_lib скачивает сам — через те же зеркала
+        patch_launcher_lib()
 
-        minecraft_directory = self.parent.install_directory_widget.install_directory
+        self.progress_tracker.reset()
+        self.state_update_signal.emit(True)
 
+        phase = tracing.phases(f"launch {self.version_id}")
         try:
-            install_minecraft_version(
-                versionid=self.version_id,
-                minecraft_directory=minecraft_directory,
-                callback={
+            # Несовместимые моды обнаруживаются до того, как JVM потратит минуту на загрузку
+            phase("check mods")
+            problems = self.check_mods()
+            if problems:
+                from resolver import format_report
+
+                self.mod_problems_signal.emit(format_report(problems[:20]))
+                return
+
+            options = {
+                "callback": {
                     "setStatus": self.update_progress_label_text,
                     "setProgress": self.update_progress,
                     "setMax": self.update_progress_max,
+                    "addBytes": self.progress_tracker.add_bytes,
                 },
+                "workers": self.workers,
+                "store": self.store,
+                "repair": self.repair,
+            }
+            phase("install loader")
+            self.version_id = install_loader(
+                self.version_type,
+                self.minecraft_version,
+                self.loader_version,
+                self.minecraft_directory,
+                **options,
+            )
+
+            phase("prepare version")
+            launch_plan = prepare_version(
+                self.version_id, self.minecraft_directory, **options
             )
 
+            phase("build command")
             if self.username == "":
                 self.username = generate_username()[0]
 
-            options = {
-                "username": self.username,
-                "uuid": str(uuid1()),
-                "token": "",
-                "jvmArguments": [
-                    f"-Xmx{self.memory_mb}M",
-                    f"-Xms{self.memory_mb // 2}M",
-                ],
-            }
+            telemetry_path = gc_log = None
+            if self.telemetry:
+                telemetry_path, gc_log = telemetry.session_paths(self.minecraft_directory)
 
-            quality = (
-                self.parent.graphics_settings_widget.quality_combobox.currentText()
+            command = build_command(
+                launch_plan,
+                self.minecraft_directory,
+                self.username,
+                memory_mb=self.memory_mb,
+                preset=self.preset,
+                gc_log=gc_log,
             )
-            performance = (
-                self.parent.graphics_settings_widget.performance_checkbox.isChecked()
-            )
-
-            # Добавляем настройки качества и производительности в команду запуска
-            options["gameArgs"] = []
-            if quality == "Fastest":
-                options["gameArgs"].append("--fast")
-            elif quality == "Fast":
-                options["gameArgs"].append("--fast")
-            elif quality == "Fancy":
-                options["gameArgs"].append("--fancy")
-            elif quality == "Ultra":
-                options["gameArgs"].append("--ultra")
-
-            if performance:
-                options["gameArgs"].append(
-                    "--performance"
-                )
 
-            call(
-                get_minecraft_command(
-                    version=self.version_id,
-                    minecraft_directory=minecraft_directory,
-                    options=options,
-                )
-            )
+            # Поток завершается сразу после старта игры; за процессом следит InstanceManager
+            phase("spawn game")
+            self.process = GameProcess(command, cwd=self.minecraft_directory)
+            if telemetry_path:
+                self.process.telemetry = telemetry.TelemetrySampler(
+                    self.process, telemetry_path, gc_log, telemetry.heap_limit_mb(command)
+                ).start()
+            phase.end()
+            self.process_started_signal.emit(self.process)
         except Exception as e:
-            QMessageBox.critical(
-                self.parent,
-                "Error",
-                f"Failed to launch Minecraft: {e}",
-            )
+            self.launch_failed_signal.emit(str(e))
         finally:
+            phase.end()
             self.state_update_signal.emit(False)
 
-    def update_progress_label_text(self, status):
-        self.progress_label = status
-        self.progress_update_signal.emit(
-            self.progress,
-            self.progress_max,
-            self.progress_label,
+    def check_mods(self):
+        from mods import ModIndex
+        from resolver import LOADERS, resolve
+
+        if self.version_type not in LOADERS:
+            return []
+        self.update_progress_label_text("Checking mods")
+        index = ModIndex(self.minecraft_directory)
+        mods = index.scan(os.path.join(self.minecraft_directory, "mods"))
+        index.save()
+        return resolve(
+            mods,
+            self.version_type,
+            minecraft_version=self.minecraft_version or None,
+            loader_version=self.loader_version or None,
         )
 
-    def update_progress(self, progress):
-        self.progress = progress
-        self.progress_update_signal.emit(
-            self.progress,
-            self.progress_max,
-            self.progress_label,
+    def get_content_store(self):
+        if not self.parent.shared_store_checkbox.isChecked():
+            return None
+        from store import ContentStore
+        return ContentStore(
+            self.parent.settings.value("shared_store_directory", None)
         )
 
+    def update_progress_label_text(self, status):
+        self.progress_tracker.set_status(status)
+
+    def update_progress(self, progress):
+        self.progress_tracker.set_progress(progress)
+
     def update_progress_max(self, progress_max):
-        self.progress_max = progress_max
+        self.progress_tracker.set_max(progress_max)
+
+    def publish_progress(self):
+        snapshot = self.progress_tracker.snapshot()
+        if snapshot["revision"] == self.published_revision:
+            return
+        self.published_revision = snapshot["revision"]
         self.progress_update_signal.emit(
-            self.progress,
-            self.progress_max,
-            self.progress_label,
-        )
\ No newline at end of file
+            snapshot["progress"],
+            snapshot["max"],
+            snapshot["status"],
+            ProgressTracker.format_details(snapshot),
+        )
+
+    def stop_publishing(self):
+        self.progress_timer.stop()
+        self.publish_progress()
+
+class InstanceManager(QObject):
+    """Запущенные клиенты: у каждого свой поток установки, прогресс и лог."""
+
+    instance_added_signal = pyqtSignal(object)
+    instance_changed_signal = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.instances = []
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(500)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def launch(self, version_type, minecraft_version, loader_version, username, memory_mb):
+        instance = LaunchThread(self.parent)
+        instance.launch_setup(
+            version_type, minecraft_version, loader_version, username, memory_mb
+        )
+        instance.returncode = None
+        instance.error = None
+        instance.launch_failed_signal.connect(
+            lambda message: setattr(instance, "error", message)
+        )
+        instance.mod_problems_signal.connect(
+            lambda report: setattr(instance, "error", "incompatible mods")
+        )
+        instance.process_started_signal.connect(
+            lambda process: self.process_started(instance)
+        )
+        instance.finished.connect(lambda: self.instance_changed_signal.emit(instance))
+        self.instances.append(instance)
+        self.instance_added_signal.emit(instance)
+        instance.start()
+        return instance
+
+    def process_started(self, instance):
+        self.poll_timer.start()
+        self.instance_changed_signal.emit(instance)
+
+    def running(self):
+        return [
+            instance for instance in self.instances
+            if instance.isRunning()
+            or (instance.process is not None and instance.returncode is None)
+        ]
+
+    def poll(self):
+        for instance in self.instances:
+            if instance.process is None or instance.returncode is not None:
+                continue
+            if not instance.process.is_running():
+                instance.returncode = instance.process.returncode
+                instance.process.log.append(
+                    f"Process exited with code {instance.returncode}"
+                )
+                self.instance_changed_signal.emit(instance)
+        if not any(
+            instance.process is not None and instance.returncode is None
+            for instance in self.instances
+        ):
+            self.poll_timer.stop()
+
+    def stop(self, instance):
+        if instance.process is not None:
+            instance.process.terminate()
+
+    def remove_finished(self):
+        finished = [
+            instance for instance in self.instances
+            if instance not in self.running()
+        ]
+        for instance in finished:
+            self.instances.remove(instance)
+            instance.deleteLater()
+        return finished
+
+class CatalogLoader(QObject):
+    catalog_loaded_signal = pyqtSignal(str, object)
+
+    loaders = {
+        "Vanilla": "get_vanilla_versions",
+        "Forge": "get_forge_versions",
+        "Fabric": "get_fabric_versions",
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pending = set()
+
+    def isRunning(self):
+        return bool(self.pending)
+
+    def start(self):
+        # Все источники запрашиваются одновременно, результат отдаётся по мере готовности.
+        # Потоки-демоны: медленный сервер не должен мешать закрыть лаунчер
+        for version_type, loader in self.loaders.items():
+            self.pending.add(version_type)
+            Thread(
+                target=self.load, args=(version_type, loader), daemon=True
+            ).start()
+
+    def load(self, version_type, loader):
+        import catalog
+
+        try:
+            with tracing.span(f"catalog {version_type}"):
+                versions = getattr(catalog, loader)()
+        except Exception as e:
+            print(f"Failed to load {version_type} versions: {e}")
+            versions = None
+        self.pending.discard(version_type)
+        try:
+            self.catalog_loaded_signal.emit(version_type, versions)
+        except RuntimeError:
+            # Окно уже закрыто
+            pass
+
+class ModIndexer(QObject):
+    mods_indexed_signal = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.indexes = {}
+        self.lock = Lock()
+
+    def start(self, minecraft_directory, folder):
+        Thread(
+            target=self.scan, args=(minecraft_directory, folder), daemon=True
+        ).start()
+
+    def scan(self, minecraft_directory, folder):
+        from mods import ModIndex
+
+        # Один индекс на установку; параллельные пересканирования выполняются по очереди
+        with self.lock:
+            index = self.indexes.get(minecraft_directory)
+            if index is None:
+                index = self.indexes[minecraft_directory] = ModIndex(
+                    minecraft_directory
+                )
+            try:
+                mods = index.scan(folder)
+                index.save()
+            except Exception as e:
+                print(f"Failed to index mods: {e}")
+                mods = {}
+        try:
+            self.mods_indexed_signal.emit(folder, mods)
+        except RuntimeError:
+            # Окно уже закрыто
+            pass
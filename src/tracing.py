@@ -0,0 +1,237 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+
+from constants import *
+from paths import cache_directory, write_atomic
+
+_tracer = None
+_save_registered = False
+
+
+class _NullSpan:
+    # Один общий объект: выключенная трассировка ничего не выделяет и не пишет
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _NullPhases:
+    __slots__ = ()
+
+    def __call__(self, name):
+        pass
+
+    def end(self):
+        pass
+
+
+_NULL_PHASES = _NullPhases()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.args["error"] = repr(exc)
+        self.tracer.complete(
+            self.name, self.start, time.perf_counter_ns(), self.category, self.args
+        )
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+class Phases:
+    """Последовательные фазы без вложенных блоков: каждый вызов закрывает предыдущую."""
+
+    def __init__(self, tracer, prefix, category):
+        self.tracer = tracer
+        self.prefix = prefix
+        self.category = category
+        self.name = None
+        self.start = 0
+
+    def __call__(self, name):
+        self.end()
+        self.name = name
+        self.start = time.perf_counter_ns()
+
+    def end(self):
+        if self.name is not None:
+            self.tracer.complete(
+                f"{self.prefix}: {self.name}", self.start, time.perf_counter_ns(), self.category
+            )
+            self.name = None
+
+
+class Tracer:
+    """Времена фаз сессии лаунчера в формате Chrome trace; файл пишет ``save()`` и выход из процесса."""
+
+    def __init__(self, path):
+        self.path = path
+        self.pid = os.getpid()
+        self.origin = time.perf_counter_ns()
+        self.events = []
+        self._threads = set()
+        self._lock = threading.Lock()
+
+    def _timestamp(self, ns):
+        return (ns - self.origin) / 1000  # мкс от начала сессии
+
+    def _thread(self):
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            with self._lock:
+                if tid not in self._threads:
+                    self._threads.add(tid)
+                    self.events.append({
+                        "name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+                        "args": {"name": threading.current_thread().name},
+                    })
+        return tid
+
+    def complete(self, name, start_ns, end_ns, category="launcher", args=None):
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self._timestamp(start_ns),
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": self._thread(),
+            "args": args or {},
+        })
+
+    def instant(self, name, category="launcher", args=None):
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "p",
+            "ts": self._timestamp(time.perf_counter_ns()),
+            "pid": self.pid,
+            "tid": self._thread(),
+            "args": args or {},
+        })
+
+    def summary(self):
+        """[(имя, количество, суммарно мс, максимум мс)] по убыванию суммарного времени."""
+        totals = {}
+        for event in list(self.events):
+            if event["ph"] != "X":
+                continue
+            count, total, longest = totals.get(event["name"], (0, 0.0, 0.0))
+            duration = event["dur"] / 1000
+            totals[event["name"]] = (count + 1, total + duration, max(longest, duration))
+        return sorted(
+            ((name, *values) for name, values in totals.items()),
+            key=lambda row: row[2],
+            reverse=True,
+        )
+
+    def save(self):
+        write_atomic(self.path, json.dumps({
+            "traceEvents": list(self.events),
+            "displayTimeUnit": "ms",
+        }).encode("utf-8"))
+        return self.path
+
+
+def _prune(directory):
+    # Каждая сессия с включённой трассировкой оставляет файл — старые удаляются
+    traces = sorted(glob.glob(os.path.join(directory, "trace-*.json")))
+    for path in traces[:max(len(traces) - TRACE_MAX_SESSIONS + 1, 0)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def enable(path=None):
+    """Включает трассировку; события пишутся в новый файл сессии в кэше."""
+    global _tracer, _save_registered
+    if _tracer is None:
+        if path is None:
+            directory = cache_directory("traces")
+            _prune(directory)
+            path = os.path.join(
+                directory,
+                time.strftime("trace-%Y%m%d-%H%M%S") + f"-{os.getpid()}.json",
+            )
+        _tracer = Tracer(path)
+        if not _save_registered:
+            atexit.register(save)
+            _save_registered = True
+    return _tracer
+
+
+def disable():
+    global _tracer
+    if _tracer is not None:
+        _tracer.save()
+    _tracer = None
+
+
+def enabled():
+    return _tracer is not None
+
+
+def tracer():
+    return _tracer
+
+
+def span(name, category="launcher", **args):
+    """Контекстный менеджер вокруг фазы: ``with tracing.span("install"): ...``."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return Span(_tracer, name, category, args)
+
+
+def phases(prefix, category="launcher"):
+    """Последовательные фазы: ``phase = tracing.phases("startup"); phase("tabs"); ...; phase.end()``."""
+    if _tracer is None:
+        return _NULL_PHASES
+    return Phases(_tracer, prefix, category)
+
+
+def complete(name, start_ns, end_ns, category="launcher", **args):
+    # Для фаз, начало и конец которых известны заранее или приходят из разных потоков
+    if _tracer is not None:
+        _tracer.complete(name, start_ns, end_ns, category, args)
+
+
+def instant(name, category="launcher", **args):
+    if _tracer is not None:
+        _tracer.instant(name, category, args)
+
+
+def save():
+    if _tracer is not None:
+        return _tracer.save()
+    return None
@@ -0,0 +1,63 @@
+import json
+import os
+import threading
+
+from paths import launcher_directory, write_atomic
+
+
+class VerifiedFiles:
+    """Уже проверенные файлы установки: пока размер и mtime те же, хеш не пересчитывается."""
+
+    def __init__(self, minecraft_directory):
+        self.minecraft_directory = minecraft_directory
+        self.path = os.path.join(
+            launcher_directory(minecraft_directory), "verified.json"
+        )
+        self.entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                self.entries = json.load(file)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def _key(self, path):
+        return os.path.relpath(path, self.minecraft_directory).replace(os.sep, "/")
+
+    def is_verified(self, path, sha1=None, size=None):
+        entry = self.entries.get(self._key(path))
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        entry_size, entry_mtime, entry_sha1 = entry
+        if stat.st_size != entry_size or stat.st_mtime_ns != entry_mtime:
+            return False
+        if size is not None and size != entry_size:
+            return False
+        return sha1 is None or sha1 == entry_sha1
+
+    def mark(self, path, sha1=None):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self.entries[self._key(path)] = [stat.st_size, stat.st_mtime_ns, sha1]
+            self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self.entries = {}
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self.entries, separators=(",", ":"))
+            self._dirty = False
+        write_atomic(self.path, data.encode("utf-8"))
@@ -3,25 +3,23 @@ from PyQt5.QtWidgets import (
     QPushButton, QVBoxLayout, QHBoxLayout, QFileDialog,
     QMessageBox, QTabWidget,
     QSpinBox, QCheckBox,
-    QGraphicsDropShadowEffect, QListWidget, QInputDialog
+    QGraphicsDropShadowEffect, QListWidget, QListWidgetItem, QInputDialog,
+    QPlainTextEdit, QTreeWidget, QTreeWidgetItem
 )
-from PyQt5.QtCore import pyqtSignal, QSettings, Qt
+from PyQt5.QtCore import pyqtSignal, QSettings, Qt, QTimer
 from PyQt5.QtGui import QColor
 
-from minecraft_launcher_lib.utils import get_minecraft_directory
 import os
+import shutil
 
 from constants import *
+from paths import get_minecraft_directory
+from threads import ModIndexer
+import tracing
 
 class RoundedWidget(QWidget):
     def __init__(self, parent=None):
         super(RoundedWidget, self).__init__(parent)
-        self.setStyleSheet(f'''
-            background-color: {MAIN_COLOR};
-            border-radius: 15px;
-            padding: 10px;
-        ''')
-
         # Создаем эффект тени
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(10)
@@ -34,16 +32,6 @@ class RoundedWidget(QWidget):
 class RoundedButton(QPushButton):
     def __init__(self, text, parent=None):
         super(RoundedButton, self).__init__(text, parent)
-        self.setStyleSheet(f'''
-            background-color: {ACCENT_COLOR};
-            color: {TEXT_COLOR};
-            border-radius: 15px;
-            padding: 10px 20px;
-            font-size: 14px;
-            font-weight: bold;
-            border: none;
-        ''')
-
         # Создаем эффект тени
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(6)
@@ -53,28 +41,6 @@ class RoundedButton(QPushButton):
         # Применяем тень к виджету
         self.setGraphicsEffect(shadow)
 
-    def enterEvent(self, event):
-        self.setStyleSheet(f'''
-            background-color: #5e667b;
-            color: {TEXT_COLOR};
-            border-radius: 15px;
-            padding: 10px 20px;
-            font-size: 14px;
-            font-weight: bold;
-            border: none;
-        ''')
-
-    def leaveEvent(self, event):
-        self.setStyleSheet(f'''
-            background-color: {ACCENT_COLOR};
-            color: {TEXT_COLOR};
-            border-radius: 15px;
-            padding: 10px 20px;
-            font-size: 14px;
-            font-weight: bold;
-            border: none;
-        ''')
-
 class InstallDirectoryWidget(QWidget):
     directory_changed = pyqtSignal(str)
 
@@ -83,9 +49,7 @@ class InstallDirectoryWidget(QWidget):
         self.settings = QSettings(COMPANY_NAME, LAUNCHER_NAME)
         self.install_label = QLabel("Select installation directory:", self)
         self.install_label.setAlignment(Qt.AlignCenter)
-        self.install_label.setStyleSheet(
-            f"color: {TEXT_COLOR}; font-size: 12px; font-weight: bold;"
-        )
+        self.install_label.setProperty("role", "label")
 
         self.install_button = RoundedButton("Browse...", self)
         self.install_button.clicked.connect(self.select_folder)
@@ -118,34 +82,54 @@ class InstallDirectoryWidget(QWidget):
 class MemorySettingsWidget(QWidget):
     def __init__(self, parent=None):
         super(MemorySettingsWidget, self).__init__(parent)
+        from jvm import JVM_PRESETS, DEFAULT_PRESET, detect_system, max_heap_mb
+
         self.settings = QSettings(COMPANY_NAME, LAUNCHER_NAME)
+        system = detect_system()
 
         self.memory_label = QLabel("Allocate RAM (MB):", self)
-        self.memory_label.setStyleSheet(
-            f"color: {TEXT_COLOR}; font-size: 12px; font-weight: bold;"
-        )
+        self.memory_label.setProperty("role", "label")
 
         self.memory_spinbox = QSpinBox(self)
-        self.memory_spinbox.setMinimum(
-            128
-        )  # Minimal RAM
+        # 0 — размер кучи подбирается автоматически
+        self.memory_spinbox.setMinimum(0)
+        self.memory_spinbox.setSpecialValueText("Auto")
         self.memory_spinbox.setMaximum(
-            8192
-        )  # Maximum RAM (8GB)
+            max_heap_mb(system)
+        )  # Вся память машины, кроме резерва для системы
+        self.memory_spinbox.setSingleStep(256)
         self.memory_spinbox.setValue(
-            self.settings.value("memory", 2048)
-        )  # Default RAM
-        self.memory_spinbox.setStyleSheet(f"""
-            color: {TEXT_COLOR}; 
-            border: 1px solid {ACCENT_COLOR}; 
-            border-radius: 5px; 
-            padding: 5px;
-            background-color: {MAIN_COLOR};
-        """)
+            self.settings.value("memory", 0, type=int)
+        )
+        self.memory_spinbox.setToolTip(
+            f"{system.total_mb} MB total, {system.available_mb} MB available, "
+            f"{system.cpu_count} cores"
+        )
 
-        self.layout = QHBoxLayout()
-        self.layout.addWidget(self.memory_label)
-        self.layout.addWidget(self.memory_spinbox)
+        self.memory_layout = QHBoxLayout()
+        self.memory_layout.addWidget(self.memory_label)
+        self.memory_layout.addWidget(self.memory_spinbox)
+        self.memory_layout.setSpacing(10)
+        self.memory_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.preset_label = QLabel("JVM Tuning:", self)
+        self.preset_label.setProperty("role", "label")
+
+        self.preset_combobox = QComboBox(self)
+        self.preset_combobox.addItems(list(JVM_PRESETS))
+        self.preset_combobox.setCurrentText(
+            self.settings.value("jvm_preset", DEFAULT_PRESET)
+        )
+
+        self.preset_layout = QHBoxLayout()
+        self.preset_layout.addWidget(self.preset_label)
+        self.preset_layout.addWidget(self.preset_combobox)
+        self.preset_layout.setSpacing(10)
+        self.preset_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.layout = QVBoxLayout()
+        self.layout.addLayout(self.memory_layout)
+        self.layout.addLayout(self.preset_layout)
         self.layout.setSpacing(10)
         self.layout.setContentsMargins(0, 0, 0, 0)
 
@@ -154,12 +138,89 @@ class MemorySettingsWidget(QWidget):
         self.memory_spinbox.valueChanged.connect(
             self.save_memory_settings
         )
+        self.preset_combobox.currentIndexChanged.connect(
+            self.save_preset_settings
+        )
 
     def save_memory_settings(self):
         self.settings.setValue(
             "memory", self.memory_spinbox.value()
         )
 
+    def save_preset_settings(self):
+        self.settings.setValue(
+            "jvm_preset", self.preset_combobox.currentText()
+        )
+
+class TelemetrySummaryWidget(QWidget):
+    """Сводка последней игровой сессии: пик кучи против -Xmx и рекомендуемый размер."""
+
+    def __init__(self, install_directory, memory_spinbox, parent=None):
+        super(TelemetrySummaryWidget, self).__init__(parent)
+        self.settings = QSettings(COMPANY_NAME, LAUNCHER_NAME)
+        self.install_directory = install_directory
+        self.memory_spinbox = memory_spinbox
+        self.recommended_mb = None
+
+        self.enabled_checkbox = QCheckBox("Record resource usage of the game", self)
+        self.enabled_checkbox.setChecked(self.settings.value("telemetry", True, type=bool))
+        self.enabled_checkbox.stateChanged.connect(self.save_enabled)
+
+        self.summary_label = QLabel(self)
+        self.summary_label.setProperty("role", "label")
+        self.summary_label.setWordWrap(True)
+        self.summary_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        self.apply_button = RoundedButton("Use Recommended", self)
+        self.apply_button.clicked.connect(self.apply_recommendation)
+
+        self.layout = QVBoxLayout()
+        self.layout.addWidget(self.enabled_checkbox)
+        self.layout.addWidget(self.summary_label)
+        self.layout.addWidget(self.apply_button)
+        self.layout.setSpacing(10)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self.layout)
+
+    def save_enabled(self):
+        self.settings.setValue("telemetry", self.enabled_checkbox.isChecked())
+
+    def set_install_directory(self, install_directory):
+        self.install_directory = install_directory
+        self.update_summary()
+
+    def update_summary(self):
+        import telemetry
+
+        self.recommended_mb = None
+        path = telemetry.latest_session(self.install_directory)
+        summary = None
+        if path is not None:
+            try:
+                summary = telemetry.summarize(path)
+            except (OSError, ValueError, KeyError):
+                summary = None
+        if summary is None:
+            self.summary_label.setText("No recorded sessions yet. Play once to size memory from evidence.")
+        else:
+            text = "Last session: " + telemetry.format_summary(summary)
+            self.recommended_mb = summary["recommended_mb"]
+            if self.recommended_mb:
+                text += f"\nRecommended heap: {self.recommended_mb} MB"
+            self.summary_label.setText(text)
+        self.apply_button.setEnabled(
+            bool(self.recommended_mb)
+            and self.recommended_mb <= self.memory_spinbox.maximum()
+        )
+
+    def apply_recommendation(self):
+        if self.recommended_mb:
+            self.memory_spinbox.setValue(self.recommended_mb)
+
+    def showEvent(self, event):
+        self.update_summary()
+        super(TelemetrySummaryWidget, self).showEvent(event)
+
 class GraphicsSettingsWidget(QWidget):
     def __init__(self, parent=None):
         super(GraphicsSettingsWidget, self).__init__(parent)
@@ -168,9 +229,7 @@ class GraphicsSettingsWidget(QWidget):
         self.quality_label = QLabel(
             "Graphics Quality:", self
         )
-        self.quality_label.setStyleSheet(
-            f"color: {TEXT_COLOR}; font-size: 12px; font-weight: bold;"
-        )
+        self.quality_label.setProperty("role", "label")
 
         self.quality_combobox = QComboBox(self)
         self.quality_combobox.addItems(
@@ -179,13 +238,6 @@ class GraphicsSettingsWidget(QWidget):
         self.quality_combobox.setCurrentText(
             self.settings.value("quality", "Balanced")
         )
-        self.quality_combobox.setStyleSheet(f"""
-            color: {TEXT_COLOR}; 
-            border: 1px solid {ACCENT_COLOR}; 
-            border-radius: 5px; 
-            padding: 5px;
-            background-color: {MAIN_COLOR};
-        """)
 
         self.quality_layout = QHBoxLayout()
         self.quality_layout.addWidget(self.quality_label)
@@ -200,9 +252,6 @@ class GraphicsSettingsWidget(QWidget):
         self.performance_checkbox.setChecked(
             self.settings.value("performance", False) == "True"
         )
-        self.performance_checkbox.setStyleSheet(
-            f"color: {TEXT_COLOR}; font-size: 12px;"
-        )
 
         self.layout = QVBoxLayout()
         self.layout.addLayout(self.quality_layout)
@@ -237,50 +286,273 @@ class TabWidget(QTabWidget):
         self.setDocumentMode(
             True
         )  # Включаем режим документа
-        self.setStyleSheet(
-            f"""
-            QTabWidget::pane {{
-                border: none;
-                top: -1px; 
-            }}
-            QTabBar::tab {{
-                background-color: {MAIN_COLOR};
-                color: {TEXT_COLOR};
-                border-top-left-radius: 10px;
-                border-top-right-radius: 10px;
-                padding: 10px 20px;
-                margin-right: 2px;
-                border: none;  /* Убираем рамку вокруг вкладки */
-            }}
-            QTabBar::tab:selected {{
-                background-color: {ACCENT_COLOR};
-            }}
-            QTabWidget::tabBar {{
-                border: none; 
-            }}
-        """
+
+
+class LazyTab(QWidget):
+    """Вкладка, содержимое которой создаётся при первом показе."""
+
+    def __init__(self, factory, parent=None):
+        super(LazyTab, self).__init__(parent)
+        self.factory = factory
+        self.widget = None
+        self.setLayout(QVBoxLayout())
+        self.layout().setContentsMargins(0, 0, 0, 0)
+
+    def ensure_built(self):
+        if self.widget is None:
+            self.widget = self.factory()
+            self.layout().addWidget(self.widget)
+        return self.widget
+
+    def showEvent(self, event):
+        self.ensure_built()
+        super(LazyTab, self).showEvent(event)
+
+
+class ConsoleWidget(QPlainTextEdit):
+    """Вывод игры. Новые строки забираются из LogBuffer по таймеру, пачкой."""
+
+    def __init__(self, parent=None):
+        super(ConsoleWidget, self).__init__(parent)
+        self.setReadOnly(True)
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+        # Старые строки удаляются самим виджетом — документ не растёт
+        self.setMaximumBlockCount(CONSOLE_MAX_LINES)
+        self.log = None
+        self.position = 0
+
+        self.update_timer = QTimer(self)
+        self.update_timer.setInterval(1000 // CONSOLE_UPDATE_RATE)
+        self.update_timer.timeout.connect(self.poll)
+
+    def attach(self, log):
+        self.clear()
+        self.log = log
+        self.position = 0
+        self.poll()
+
+    def poll(self):
+        if self.log is None:
+            return
+        lines, self.position, dropped = self.log.since(self.position)
+        if dropped:
+            lines.insert(0, f"... {dropped} lines skipped ...")
+        if lines:
+            self.appendPlainText("\n".join(lines))
+
+    def showEvent(self, event):
+        # Скрытая консоль не тратит время на обновление
+        self.poll()
+        self.update_timer.start()
+        super(ConsoleWidget, self).showEvent(event)
+
+    def hideEvent(self, event):
+        self.update_timer.stop()
+        super(ConsoleWidget, self).hideEvent(event)
+
+
+class InstancesWidget(QWidget):
+    """Список запущенных клиентов и консоль выбранного."""
+
+    def __init__(self, manager, parent=None):
+        super(InstancesWidget, self).__init__(parent)
+        self.manager = manager
+        self.items = {}
+
+        self.instances_list = QListWidget(self)
+        self.instances_list.currentItemChanged.connect(self.select_instance)
+        self.console_widget = ConsoleWidget(self)
+
+        self.stop_button = RoundedButton("Stop", self)
+        self.stop_button.clicked.connect(self.stop_instance)
+        self.clear_button = RoundedButton("Clear Finished", self)
+        self.clear_button.clicked.connect(self.clear_finished)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.stop_button)
+        button_layout.addWidget(self.clear_button)
+
+        self.layout = QVBoxLayout()
+        self.layout.addWidget(self.instances_list, 1)
+        self.layout.addWidget(self.console_widget, 3)
+        self.layout.addLayout(button_layout)
+        self.layout.setSpacing(10)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self.layout)
+
+        self.manager.instance_added_signal.connect(self.add_instance)
+        self.manager.instance_changed_signal.connect(self.update_instance)
+        for instance in self.manager.instances:
+            self.add_instance(instance)
+
+    def add_instance(self, instance):
+        item = QListWidgetItem()
+        self.items[instance] = item
+        self.instances_list.addItem(item)
+        instance.progress_update_signal.connect(
+            lambda progress, progress_max, status, details: self.update_instance(
+                instance, f"{status} ({progress}/{progress_max})"
+            )
         )
+        self.update_instance(instance)
+        self.instances_list.setCurrentItem(item)
+
+    def update_instance(self, instance, status=None):
+        item = self.items.get(instance)
+        if item is None:
+            return
+        if instance.process is None:
+            if instance.isRunning():
+                status = status or "Installing"
+            else:
+                status = f"Failed: {instance.error}" if instance.error else "Failed"
+        elif instance.returncode is None:
+            status = f"Running (pid {instance.process.pid})"
+        else:
+            status = f"Exited with code {instance.returncode}"
+        username = instance.username or "random user"
+        item.setText(f"{instance.version_id} — {username} — {status}")
+        if item is self.instances_list.currentItem():
+            self.select_instance(item)
+
+    def current_instance(self):
+        item = self.instances_list.currentItem()
+        for instance, instance_item in self.items.items():
+            if instance_item is item:
+                return instance
+        return None
+
+    def select_instance(self, item, previous=None):
+        instance = self.current_instance()
+        log = instance.process.log if instance and instance.process else None
+        if log is not self.console_widget.log:
+            self.console_widget.attach(log)
+
+    def show_instance(self, instance):
+        item = self.items.get(instance)
+        if item is not None:
+            self.instances_list.setCurrentItem(item)
+
+    def stop_instance(self):
+        instance = self.current_instance()
+        if instance is not None:
+            self.manager.stop(instance)
+
+    def clear_finished(self):
+        for instance in self.manager.remove_finished():
+            item = self.items.pop(instance)
+            self.instances_list.takeItem(self.instances_list.row(item))
+
+
+class TraceWidget(QWidget):
+    """Отладка: запись трассировки и сводка по фазам текущей сессии."""
+
+    def __init__(self, parent=None):
+        super(TraceWidget, self).__init__(parent)
+        self.settings = QSettings(COMPANY_NAME, LAUNCHER_NAME)
+
+        self.enabled_checkbox = QCheckBox("Record launch trace", self)
+        self.enabled_checkbox.setChecked(tracing.enabled())
+        self.enabled_checkbox.stateChanged.connect(self.set_enabled)
+
+        self.path_label = QLabel(self)
+        self.path_label.setProperty("role", "label")
+        self.path_label.setWordWrap(True)
+        self.path_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        self.summary_tree = QTreeWidget(self)
+        self.summary_tree.setHeaderLabels(["Phase", "Count", "Total, ms", "Max, ms"])
+        self.summary_tree.setRootIsDecorated(False)
+        self.summary_tree.setColumnWidth(0, 220)
+
+        self.save_button = RoundedButton("Save Trace", self)
+        self.save_button.clicked.connect(self.save_trace)
+
+        self.layout = QVBoxLayout()
+        self.layout.addWidget(self.enabled_checkbox)
+        self.layout.addWidget(self.path_label)
+        self.layout.addWidget(self.summary_tree)
+        self.layout.addWidget(self.save_button)
+        self.layout.setSpacing(10)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self.layout)
+
+        self.update_timer = QTimer(self)
+        self.update_timer.setInterval(1000)
+        self.update_timer.timeout.connect(self.update_summary)
+
+    def set_enabled(self):
+        enabled = self.enabled_checkbox.isChecked()
+        self.settings.setValue("tracing", enabled)
+        if enabled:
+            tracing.enable()
+        else:
+            tracing.disable()
+        self.update_summary()
+
+    def save_trace(self):
+        path = tracing.save()
+        if path:
+            self.path_label.setText(f"Saved to {path}")
+
+    def update_summary(self):
+        tracer = tracing.tracer()
+        self.save_button.setEnabled(tracer is not None)
+        if tracer is None:
+            self.path_label.setText("Tracing is off. Set BEDROCK_TRACE=1 to also trace startup.")
+            self.summary_tree.clear()
+            return
+        self.path_label.setText(f"Trace file: {tracer.path}")
+        self.summary_tree.clear()
+        for name, count, total, longest in tracer.summary():
+            item = QTreeWidgetItem([name, str(count), f"{total:.1f}", f"{longest:.1f}"])
+            for column in (1, 2, 3):
+                item.setTextAlignment(column, Qt.AlignRight | Qt.AlignVCenter)
+            self.summary_tree.addTopLevelItem(item)
+
+    def showEvent(self, event):
+        self.update_summary()
+        self.update_timer.start()
+        super(TraceWidget, self).showEvent(event)
+
+    def hideEvent(self, event):
+        self.update_timer.stop()
+        super(TraceWidget, self).hideEvent(event)
 
 
 class ModManagerTab(QWidget):
-    def __init__(self, install_directory, parent=None):
+    profile_activated = pyqtSignal(dict)
+
+    def __init__(self, install_directory, current_version=None, parent=None):
         super().__init__(parent)
         self.install_directory = install_directory
+        # Возвращает (загрузчик, версия игры, версия загрузчика), выбранные на вкладке запуска
+        self.current_version = current_version
         self.mods_folder = os.path.join(
             self.install_directory, "mods"
         )
+        self.mods = {}
+        self.mods_indexer = ModIndexer(self)
+        self.mods_indexer.mods_indexed_signal.connect(self.mods_indexed)
         self.setLayout(QVBoxLayout())
         self.initUI()
 
     def initUI(self):
+        from profiles import ModProfiles
+
+        self.profiles = ModProfiles(self.install_directory)
+
+        profile_layout = QHBoxLayout()
+        self.profile_label = QLabel("Profile:", self)
+        self.profile_label.setProperty("role", "label")
+        profile_layout.addWidget(self.profile_label)
+        self.profile_combobox = QComboBox(self)
+        profile_layout.addWidget(self.profile_combobox, 1)
+        self.layout().addLayout(profile_layout)
+        self.update_profiles()
+        self.profile_combobox.activated[str].connect(self.activate_profile)
+
         self.mods_list = QListWidget(self)
-        self.mods_list.setStyleSheet(f"""
-            color: {TEXT_COLOR}; 
-            border: 1px solid {ACCENT_COLOR}; 
-            border-radius: 5px; 
-            padding: 5px;
-            background-color: {MAIN_COLOR};
-        """)
         self.layout().addWidget(self.mods_list)
         self.update_mods_list()
 
@@ -301,12 +573,36 @@ class ModManagerTab(QWidget):
         self.layout().addLayout(button_layout)
 
     def update_mods_list(self):
-        self.mods_list.clear()
         if not os.path.exists(self.mods_folder):
             os.makedirs(self.mods_folder)
-        for filename in os.listdir(self.mods_folder):
-            if filename.endswith(".jar"):
+        # Метаданные читаются в фоне; неизменённые jar берутся из индекса
+        self.mods_indexer.start(self.install_directory, self.mods_folder)
+
+    def mods_indexed(self, folder, mods):
+        if folder != self.mods_folder:
+            return
+        self.mods = mods
+        self.mods_list.clear()
+        for path, infos in mods.items():
+            filename = os.path.basename(path)
+            own = [info for info in infos if not info.bundled_by]
+            if not own:
                 self.mods_list.addItem(filename)
+                continue
+            text = ", ".join(
+                f"{info.name} {info.version}".strip() for info in own
+            )
+            item = QListWidgetItem(f"{text} [{own[0].loader}]")
+            tooltip = [filename]
+            if len(own) < len(infos):
+                tooltip.append(f"{len(infos) - len(own)} bundled mods")
+            for info in own:
+                if info.minecraft:
+                    tooltip.append(f"{info.id}: Minecraft {info.minecraft}")
+                for dependency, version_range in info.dependencies.items():
+                    tooltip.append(f"{info.id} requires {dependency} {version_range}")
+            item.setToolTip("\n".join(tooltip))
+            self.mods_list.addItem(item)
 
     def add_mod(self):
         (
@@ -335,6 +631,30 @@ class ModManagerTab(QWidget):
                     f"Failed to install mod: {e}",
                 )
 
+    def update_profiles(self):
+        self.profile_combobox.clear()
+        self.profile_combobox.addItems(self.profiles.names())
+        if self.profiles.active:
+            self.profile_combobox.setCurrentText(self.profiles.active)
+        else:
+            self.profile_combobox.setCurrentIndex(-1)
+
+    def activate_profile(self, name):
+        if name == self.profiles.active:
+            return
+        try:
+            profile = self.profiles.activate(name)
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "Error",
+                f"Failed to switch profile: {e}",
+            )
+            self.update_profiles()
+            return
+        self.update_mods_list()
+        self.profile_activated.emit(profile)
+
     def create_profile(self):
         (
             profile_name,
@@ -345,9 +665,26 @@ class ModManagerTab(QWidget):
             "Enter a profile name:",
         )
         if ok and profile_name:
-            # Добавьте логику для создания профиля, например, сохранение списка модов в файл
+            version_type, minecraft_version, loader_version = (
+                self.current_version() if self.current_version else ("", "", "")
+            )
+            try:
+                self.profiles.create(
+                    profile_name,
+                    minecraft_version=minecraft_version,
+                    loader=version_type,
+                    loader_version=loader_version,
+                )
+            except Exception as e:
+                QMessageBox.critical(
+                    self,
+                    "Error",
+                    f"Failed to create profile: {e}",
+                )
+                return
+            self.update_profiles()
             QMessageBox.information(
                 self,
                 "Profile Created",
                 f"Profile '{profile_name}' created successfully.",
-            )
\ No newline at end of file
+            )
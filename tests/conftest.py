@@ -0,0 +1,40 @@
+import json
+import os
+import sys
+import tempfile
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIRECTORY, "src"))
+sys.path.insert(0, os.path.join(ROOT_DIRECTORY, "benchmarks"))
+
+# Кэш и настройки лаунчера не должны попадать в домашний каталог того, кто запускает тесты
+_state = tempfile.mkdtemp(prefix="bedrock-tests-")
+os.environ["XDG_CACHE_HOME"] = os.path.join(_state, "cache")
+os.environ["XDG_CONFIG_HOME"] = os.path.join(_state, "config")
+os.environ["LOCALAPPDATA"] = os.environ["XDG_CACHE_HOME"]
+os.environ["APPDATA"] = os.environ["XDG_CONFIG_HOME"]
+os.environ.pop("BEDROCK_MIRRORS", None)
+os.environ.pop("BEDROCK_OFFLINE", None)
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def fixture_server(tmp_path_factory):
+    """Локальный HTTP-сервер с версией из бенчмарков; апстримы перенаправлены на него."""
+    import fixtures
+    from mirrors import mirror_config, patch_launcher_lib
+
+    root = tmp_path_factory.mktemp("fixtures")
+    fixtures.build_fixtures(str(root), assets=200, libraries=10)
+    with fixtures.FixtureServer(str(root)) as server:
+        mirrors_path = root / "mirrors.json"
+        mirrors_path.write_text(json.dumps(fixtures.mirrors_config(server.url)))
+        previous = mirror_config.path
+        mirror_config.load(str(mirrors_path))
+        patch_launcher_lib()
+        try:
+            yield server, root
+        finally:
+            mirror_config.path = previous
+            mirror_config.load()
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+import fixtures
+
+SUITE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "suite.py")
+
+
+def suite(*arguments):
+    return subprocess.run(
+        [sys.executable, SUITE, *arguments], capture_output=True, text=True, timeout=300
+    )
+
+
+def tree_hashes(root):
+    hashes = {}
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            with open(path, "rb") as file:
+                hashes[os.path.relpath(path, root)] = hashlib.sha1(file.read()).hexdigest()
+    return hashes
+
+
+def test_fixtures_are_reproducible(tmp_path):
+    fixtures.build_fixtures(str(tmp_path / "a"), assets=20, libraries=2)
+    fixtures.build_fixtures(str(tmp_path / "b"), assets=20, libraries=2)
+    assert tree_hashes(tmp_path / "a") == tree_hashes(tmp_path / "b")
+    fixtures.write_mods(str(tmp_path / "mods-a"), 5)
+    fixtures.write_mods(str(tmp_path / "mods-b"), 5)
+    assert tree_hashes(tmp_path / "mods-a") == tree_hashes(tmp_path / "mods-b")
+
+
+def test_suite_writes_report_and_compares(tmp_path):
+    path = tmp_path / "results.json"
+    result = suite(
+        "--cases", "catalog,install", "--runs", "2", "--assets", "20", "--libraries", "2",
+        "--latency-ms", "0", "--json", str(path),
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(path.read_text())
+    assert report["config"]["runs"] == 2
+    assert set(report["results"]) == {
+        "catalog_cold_ms", "catalog_warm_ms",
+        "install_cold_ms", "install_warm_ms", "install_repair_ms", "launch_command_ms",
+    }
+    for stats in report["results"].values():
+        assert len(stats["runs"]) == 2
+        assert stats["min"] <= stats["median"] <= stats["max"]
+    # Повторная установка только сверяет манифест проверенных файлов
+    assert report["results"]["install_warm_ms"]["median"] < report["results"]["install_cold_ms"]["median"]
+
+    result = suite(
+        "--cases", "catalog", "--runs", "1", "--assets", "20", "--libraries", "2",
+        "--latency-ms", "0", "--compare", str(path),
+    )
+    assert result.returncode == 0, result.stderr
+    comparison = result.stdout.split("Compared with", 1)[1].splitlines()[1:]
+    assert [line.split(":")[0].strip() for line in comparison] == ["catalog_cold_ms", "catalog_warm_ms"]
+    assert all("->" in line and line.endswith("%)") for line in comparison)
+
+
+def test_unknown_case_is_rejected():
+    result = suite("--cases", "install,nope")
+    assert result.returncode == 2
+    assert "unknown cases: nope" in result.stderr
@@ -0,0 +1,117 @@
+import json
+import time
+
+import pytest
+
+from cache import MetadataCache
+from fixtures import FixtureServer
+from mirrors import mirror_config
+
+
+@pytest.fixture
+def server(tmp_path):
+    root = tmp_path / "served"
+    root.mkdir()
+    (root / "manifest.json").write_text(json.dumps({"versions": ["1.0"]}))
+    with FixtureServer(str(root)) as server:
+        server.manifest = root / "manifest.json"
+        yield server
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return MetadataCache(str(tmp_path / "cache"))
+
+
+def url(server):
+    return f"{server.url}/manifest.json"
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_fresh_entry_is_served_without_network(server, cache):
+    assert cache.get("manifest", url(server), ttl=60) == {"versions": ["1.0"]}
+    assert cache.get("manifest", url(server), ttl=60) == {"versions": ["1.0"]}
+    assert len(server.log) == 1
+
+
+def test_entry_survives_restart(server, cache):
+    cache.get("manifest", url(server), ttl=60)
+    restarted = MetadataCache(cache.directory)
+    assert restarted.get("manifest", url(server), ttl=60) == {"versions": ["1.0"]}
+    assert len(server.log) == 1
+
+
+def test_expired_entry_is_revalidated_by_etag(server, cache):
+    cache.get("manifest", url(server), ttl=60)
+    fetched_at = cache._entries["manifest"]["fetched_at"]
+    assert cache.get("manifest", url(server), ttl=0, stale_while_revalidate=False) == {
+        "versions": ["1.0"]
+    }
+    assert server.not_modified == 1
+    # 304 продлевает срок жизни записи
+    assert cache._entries["manifest"]["fetched_at"] > fetched_at
+    assert cache.get("manifest", url(server), ttl=60) == {"versions": ["1.0"]}
+    assert len(server.log) == 2
+
+
+def test_changed_source_replaces_entry(server, cache):
+    cache.get("manifest", url(server), ttl=60)
+    server.manifest.write_text(json.dumps({"versions": ["1.0", "1.1"]}))
+    assert cache.get("manifest", url(server), ttl=0, stale_while_revalidate=False) == {
+        "versions": ["1.0", "1.1"]
+    }
+    assert server.not_modified == 0
+    restarted = MetadataCache(cache.directory)
+    assert restarted.get("manifest", url(server), ttl=60) == {"versions": ["1.0", "1.1"]}
+
+
+def test_stale_entry_is_returned_and_refreshed_in_background(server, cache):
+    cache.get("manifest", url(server), ttl=60)
+    server.manifest.write_text(json.dumps({"versions": ["1.0", "1.1"]}))
+    assert cache.get("manifest", url(server), ttl=0) == {"versions": ["1.0"]}
+    wait_for(lambda: cache._entries["manifest"]["data"] == {"versions": ["1.0", "1.1"]})
+    wait_for(lambda: not cache._refreshing)
+
+
+def test_failed_refresh_falls_back_to_cached_copy(server, cache):
+    cache.get("manifest", url(server), ttl=60)
+    server.fail("/manifest.json", 404)
+    assert cache.get("manifest", url(server), ttl=0, stale_while_revalidate=False) == {
+        "versions": ["1.0"]
+    }
+
+
+def test_missing_source_without_cache_is_none(server, cache):
+    server.fail("/manifest.json", 404)
+    assert cache.get("manifest", url(server), ttl=60) is None
+
+
+def test_offline_serves_expired_entry_without_network(server, cache, monkeypatch):
+    cache.get("manifest", url(server), ttl=60)
+    monkeypatch.setattr(mirror_config, "offline", True)
+    assert cache.get("manifest", url(server), ttl=0) == {"versions": ["1.0"]}
+    assert cache.get("other", url(server), ttl=0) is None
+    assert len(server.log) == 1
+
+
+def test_changed_url_is_not_served_from_cache(server, cache):
+    cache.get("manifest", url(server), ttl=60)
+    (server.manifest.parent / "other.json").write_text(json.dumps({"versions": []}))
+    assert cache.get("manifest", f"{server.url}/other.json", ttl=60) == {"versions": []}
+    # Без условных заголовков: ETag был у другого адреса
+    assert server.not_modified == 0
+
+
+def test_invalidate_drops_entries(server, cache):
+    cache.get("manifest", url(server), ttl=60)
+    cache.invalidate()
+    assert MetadataCache(cache.directory).get("manifest", url(server), ttl=60) == {
+        "versions": ["1.0"]
+    }
+    assert len(server.log) == 2
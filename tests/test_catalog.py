@@ -0,0 +1,18 @@
+import catalog
+import fixtures
+
+
+def test_forge_build_prefers_recommended(fixture_server):
+    # В каталоге фикстур у каждой версии есть latest (…0.0) и recommended (…1.0)
+    assert catalog.get_forge_build("1.21.0") == "40.1.0"
+    assert catalog.get_forge_build("0.0") is None
+
+
+def test_latest_stable_fabric_loader(fixture_server):
+    assert catalog.get_fabric_loader_version() == fixtures.FABRIC_LOADER_VERSION
+
+
+def test_fabric_profile(fixture_server):
+    profile = catalog.get_fabric_profile(fixtures.VERSION_ID, fixtures.FABRIC_LOADER_VERSION)
+    assert f'"inheritsFrom": "{fixtures.VERSION_ID}"'.encode() in profile
+    assert catalog.get_fabric_profile("0.0", fixtures.FABRIC_LOADER_VERSION) is None
@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+import cli
+import fixtures
+from mirrors import mirror_config
+from profiles import ModProfiles
+
+FABRIC_VERSION_ID = f"fabric-loader-{fixtures.FABRIC_LOADER_VERSION}-{fixtures.VERSION_ID}"
+
+
+def run(capsys, *argv):
+    returncode = cli.main(list(argv))
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return returncode, [event for event in events if event["event"] != "progress"]
+
+
+def test_fabric_profile_installs_its_loader(tmp_path, fixture_server, capsys):
+    minecraft_directory = str(tmp_path)
+    os.makedirs(tmp_path / "mods")
+    (tmp_path / "mods" / "mod.jar").write_bytes(b"mod")
+    ModProfiles(minecraft_directory).create(
+        "Modded",
+        minecraft_version=fixtures.VERSION_ID,
+        loader="Fabric",
+        loader_version=fixtures.FABRIC_LOADER_VERSION,
+    )
+
+    returncode, events = run(
+        capsys, "install", "profile:Modded", "-d", minecraft_directory, "--workers", "4"
+    )
+    assert returncode == 0, events
+    assert {"event": "installed", "type": "Fabric", "version": FABRIC_VERSION_ID} in events
+    loader = os.path.join(
+        minecraft_directory, "libraries", "net", "fabricmc", "fabric-loader",
+        fixtures.FABRIC_LOADER_VERSION, f"fabric-loader-{fixtures.FABRIC_LOADER_VERSION}.jar",
+    )
+    assert os.path.isfile(loader)
+    assert os.path.isfile(os.path.join(
+        minecraft_directory, "versions", fixtures.VERSION_ID, f"{fixtures.VERSION_ID}.jar"
+    ))
+
+
+def test_fabric_target_defaults_to_stable_loader_and_works_offline(
+    tmp_path, fixture_server, capsys, monkeypatch
+):
+    # --offline переключает общую настройку процесса, после теста она возвращается
+    monkeypatch.setattr(mirror_config, "offline", False)
+    minecraft_directory = str(tmp_path)
+    target = f"fabric:{fixtures.VERSION_ID}"
+    returncode, events = run(capsys, "install", target, "-d", minecraft_directory)
+    assert returncode == 0, events
+    assert {"event": "loader", "type": "Fabric", "version": FABRIC_VERSION_ID} in events
+
+    # Установленный загрузчик второй раз из сети не запрашивается
+    requests = len(fixture_server[0].log)
+    returncode, events = run(capsys, "install", target, "-d", minecraft_directory, "--offline")
+    assert returncode == 0, events
+    assert len(fixture_server[0].log) == requests
+
+
+def test_profile_without_minecraft_version_is_rejected(tmp_path, capsys):
+    ModProfiles(str(tmp_path)).create("Old", loader="Fabric", loader_version="0.15.11")
+    returncode, events = run(capsys, "install", "profile:Old", "-d", str(tmp_path))
+    assert returncode == 1
+    assert "does not record its Minecraft version" in events[-1]["message"]
+
+
+@pytest.mark.parametrize("target, expected", [
+    ("1.20.1", ("vanilla", "1.20.1")),
+    ("fabric:1.20.1@0.15.11", ("fabric", "1.20.1@0.15.11")),
+    ("Forge:1.20.1", ("forge", "1.20.1")),
+    ("profile:Survival", ("profile", "Survival")),
+])
+def test_parse_target(target, expected):
+    assert cli.parse_target(target) == expected
+
+
+def test_resolve_targets_splits_loader_version(tmp_path):
+    targets = [("fabric", "1.20.1@0.15.11"), ("forge", "1.20.1"), ("vanilla", "1.20.1")]
+    assert cli.resolve_targets(targets, str(tmp_path)) == [
+        ("Fabric", "1.20.1", "0.15.11"),
+        ("Forge", "1.20.1", ""),
+        ("Vanilla", "1.20.1", ""),
+    ]
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QSize, Qt  # noqa: E402
+from PyQt5.QtGui import QColor, QPixmap  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from images import load_scaled_pixmap, render_gradient  # noqa: E402
+from paths import cache_directory  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def write_image(path, color, width=400, height=100, format="PNG"):
+    pixmap = QPixmap(width, height)
+    pixmap.fill(color)
+    assert pixmap.save(str(path), format)
+    return str(path)
+
+
+def cached(name):
+    return sorted(
+        filename for filename in os.listdir(cache_directory("images"))
+        if filename.startswith(f"{name}-")
+    )
+
+
+def color_at(pixmap, x=0, y=0):
+    return pixmap.toImage().pixelColor(x, y).name()
+
+
+def test_scaled_image_is_cached_on_disk(app, tmp_path):
+    source = write_image(tmp_path / "opaque.png", QColor("#ff0000"))
+    pixmap = load_scaled_pixmap(source, 200)
+    assert (pixmap.width(), pixmap.height()) == (200, 50)
+    (filename,) = cached("opaque")
+    assert filename.endswith(".bmp")
+
+    # Второй раз картинка берётся из кэша, а не масштабируется заново
+    write_image(os.path.join(cache_directory("images"), filename), QColor("#00ff00"), 200, 50, "BMP")
+    assert color_at(load_scaled_pixmap(source, 200)) == "#00ff00"
+
+
+def test_changed_source_replaces_cached_copy(app, tmp_path):
+    source = write_image(tmp_path / "changing.png", QColor("#ff0000"))
+    load_scaled_pixmap(source, 200)
+    (old,) = cached("changing")
+
+    write_image(tmp_path / "changing.png", QColor("#0000ff"), 800, 100)
+    pixmap = load_scaled_pixmap(source, 200)
+    assert color_at(pixmap) == "#0000ff"
+    assert pixmap.height() == 25
+    (new,) = cached("changing")
+    assert new != old
+
+
+def test_transparent_image_and_device_pixel_ratio(app, tmp_path):
+    source = write_image(tmp_path / "transparent.png", Qt.transparent)
+    pixmap = load_scaled_pixmap(source, 200, device_pixel_ratio=2.0)
+    assert pixmap.width() == 400
+    assert pixmap.devicePixelRatio() == 2.0
+    (filename,) = cached("transparent")
+    assert "-200@2x-" in filename
+    assert filename.endswith(".png")
+    assert load_scaled_pixmap(source, 200, device_pixel_ratio=2.0).hasAlphaChannel()
+
+
+def test_missing_image_is_null(app, tmp_path):
+    assert load_scaled_pixmap(str(tmp_path / "missing.png"), 200).isNull()
+
+
+def test_gradient(app):
+    pixmap = render_gradient(QSize(10, 100), 2.0, "#000000", "#ffffff")
+    assert (pixmap.width(), pixmap.height()) == (20, 200)
+    image = pixmap.toImage()
+    assert image.pixelColor(0, 0).lightness() < 10
+    assert image.pixelColor(0, 199).lightness() > 245
@@ -0,0 +1,90 @@
+import json
+import os
+import platform
+from collections import Counter
+from urllib.parse import urlsplit
+
+import pytest
+
+from fixtures import UPSTREAMS, VERSION_ID
+from installer import InstallError, install_version, install_versions, resolve_install_plan
+from mirrors import mirror_config
+
+
+def add_child(minecraft_directory, version_id, libraries):
+    directory = os.path.join(minecraft_directory, "versions", version_id)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{version_id}.json"), "w", encoding="utf-8") as file:
+        json.dump({
+            "id": version_id,
+            "inheritsFrom": VERSION_ID,
+            "mainClass": "org.bench.Main",
+            "libraries": libraries,
+        }, file)
+
+
+def test_install_downloads_each_file_once_and_reports_progress(tmp_path, fixture_server):
+    server, _ = fixture_server
+    start = len(server.log)
+    calls = Counter()
+    state = {"bytes": 0}
+    callback = {
+        "setStatus": lambda status: calls.update(["status"]),
+        "setMax": lambda maximum: state.update(max=maximum),
+        "setProgress": lambda progress: state.update(progress=progress),
+        "addBytes": lambda count: state.update(bytes=state["bytes"] + count),
+    }
+    plan = install_version(VERSION_ID, str(tmp_path), callback, workers=8)
+
+    requests = Counter(path for path, _ in server.log[start:])
+    assert max(requests.values()) == 1
+    for task in plan.downloads:
+        assert requests[urlsplit(mirror_config.rewrite(task.url)).path] == 1
+    assert state["max"] == state["progress"] == len(plan.downloads)
+    assert state["bytes"] > 4 * 1024 * 1024
+    for task in plan.downloads:
+        assert os.path.isfile(task.path)
+
+
+def test_versions_share_one_download_queue(tmp_path, fixture_server):
+    server, _ = fixture_server
+    add_child(str(tmp_path), "child-a", [])
+    add_child(str(tmp_path), "child-b", [])
+    start = len(server.log)
+    plans = install_versions(["child-a", "child-b"], str(tmp_path), workers=8)
+
+    requests = Counter(path for path, _ in server.log[start:])
+    libraries = [path for path in requests if path.startswith("/libraries/")]
+    assert len(libraries) == 10
+    assert max(requests[path] for path in libraries) == 1
+    assert [plan.version_data["mainClass"] for plan in plans] == ["org.bench.Main"] * 2
+
+
+def test_rules_and_optional_legacy_libraries(tmp_path, fixture_server):
+    other_os = "osx" if platform.system() != "Darwin" else "linux"
+    add_child(str(tmp_path), "child", [
+        {"name": "org.other:excluded:1.0", "rules": [{"action": "allow", "os": {"name": other_os}}]},
+        # Старый формат Forge: только координаты, файла на сервере нет
+        {"name": "org.legacy:missing:1.0", "url": f"{UPSTREAMS['libraries']}/"},
+    ])
+    plan = resolve_install_plan("child", str(tmp_path))
+    names = [os.path.basename(task.path) for task in plan.downloads]
+    assert "excluded-1.0.jar" not in names
+    legacy = [task for task in plan.downloads if task.path.endswith("missing-1.0.jar")]
+    assert [task.optional for task in legacy] == [True]
+    # Отсутствующая необязательная библиотека не срывает установку
+    install_version("child", str(tmp_path), workers=4)
+
+
+def test_failed_download_raises_install_error(tmp_path, fixture_server):
+    server, _ = fixture_server
+    plan = resolve_install_plan(VERSION_ID, str(tmp_path))
+    library = next(task for task in plan.downloads if task.url.startswith(UPSTREAMS["libraries"]))
+    server.fail(urlsplit(mirror_config.rewrite(library.url)).path, 404)
+    with pytest.raises(InstallError, match="404"):
+        install_version(VERSION_ID, str(tmp_path), workers=4)
+
+
+def test_unknown_version_is_reported(tmp_path, fixture_server):
+    with pytest.raises(InstallError, match="not found"):
+        install_version("no-such-version", str(tmp_path))
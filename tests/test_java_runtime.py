@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+import java_runtime
+from java_runtime import JavaRuntime, JavaRuntimeManager, cds_arguments, parse_major
+
+
+def make_java(home, version, release=True):
+    executable = home / "bin" / "java"
+    executable.parent.mkdir(parents=True)
+    if release:
+        executable.write_text("")
+        (home / "release").write_text(f'JAVA_VERSION="{version}"\n')
+    else:
+        # Старая Java без файла release: версию сообщает сам процесс
+        executable.write_text(f"#!/bin/sh\necho 'java version \"{version}\"' >&2\n")
+    executable.chmod(0o755)
+    return str(executable)
+
+
+@pytest.fixture
+def runtimes(tmp_path, monkeypatch):
+    minecraft_directory = tmp_path / "minecraft"
+    mojang = make_java(
+        minecraft_directory / "runtime" / "java-runtime-gamma" / "linux" / "java-runtime-gamma",
+        "17.0.3",
+    )
+    homes = {
+        "17": tmp_path / "jdk-17",
+        "21": tmp_path / "jdk-21",
+        "8": tmp_path / "jdk-8",
+    }
+    make_java(homes["17"], "17.0.8")
+    make_java(homes["21"], "21.0.2")
+    make_java(homes["8"], "1.8.0_382", release=False)
+    monkeypatch.setattr(java_runtime, "_candidate_homes", lambda: [str(home) for home in homes.values()])
+    monkeypatch.setattr(java_runtime.shutil, "which", lambda name: None)
+    return str(minecraft_directory), mojang, homes
+
+
+def test_parse_major():
+    assert parse_major("1.8.0_382") == 8
+    assert parse_major("17.0.8") == 17
+    assert parse_major("21") == 21
+    assert parse_major("") == 0
+
+
+@pytest.mark.skipif(os.name == "nt", reason="shell script as java")
+def test_find_reads_release_files_and_version_output(runtimes, tmp_path):
+    minecraft_directory, mojang, _ = runtimes
+    found = JavaRuntimeManager(str(tmp_path / "runtimes.json")).find(minecraft_directory)
+    assert [(runtime.major, runtime.mojang) for runtime in found] == [
+        (17, True), (17, False), (21, False), (8, False),
+    ]
+    assert found[0].path == mojang
+    assert found[3].version == "1.8.0_382"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="shell script as java")
+def test_versions_are_cached_by_mtime(runtimes, tmp_path, monkeypatch):
+    minecraft_directory, _, homes = runtimes
+    cache_path = str(tmp_path / "runtimes.json")
+    JavaRuntimeManager(cache_path).find(minecraft_directory)
+
+    read = []
+    read_version = java_runtime._read_version
+    monkeypatch.setattr(java_runtime, "_read_version", lambda path: read.append(path) or read_version(path))
+    JavaRuntimeManager(cache_path).find(minecraft_directory)
+    assert read == []
+
+    executable = homes["21"] / "bin" / "java"
+    stat = os.stat(executable)
+    os.utime(executable, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    JavaRuntimeManager(cache_path).find(minecraft_directory)
+    assert read == [str(executable)]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="shell script as java")
+def test_select_prefers_the_component_runtime(runtimes, tmp_path):
+    minecraft_directory, mojang, homes = runtimes
+    manager = JavaRuntimeManager(str(tmp_path / "runtimes.json"))
+    assert manager.select(17, minecraft_directory, "java-runtime-gamma").path == mojang
+    assert manager.select(21, minecraft_directory).path == str(homes["21"] / "bin" / "java")
+    # Java 16+ заменяется ближайшей более новой, Java 8 — только точным совпадением
+    assert manager.select(18, minecraft_directory).major == 21
+    assert manager.select(8, minecraft_directory).major == 8
+    assert manager.select(11, minecraft_directory) is None
+    assert manager.select(22, minecraft_directory) is None
+
+
+def test_cds_arguments_depend_on_java_version(tmp_path):
+    classpath = [str(tmp_path / "client.jar")]
+    assert cds_arguments(None, classpath) == []
+    assert cds_arguments(JavaRuntime("/jdk8/bin/java", "1.8.0_382", 8), classpath) == []
+
+    runtime = JavaRuntime("/jdk17/bin/java", "17.0.8", 17)
+    (dump,) = cds_arguments(runtime, classpath)
+    assert dump.startswith("-XX:ArchiveClassesAtExit=")
+    archive = dump.split("=", 1)[1]
+    open(archive, "wb").close()
+    try:
+        assert cds_arguments(runtime, classpath) == [f"-XX:SharedArchiveFile={archive}"]
+        # Другой classpath — другой архив
+        assert cds_arguments(runtime, classpath + ["mod.jar"])[0].startswith("-XX:ArchiveClassesAtExit=")
+    finally:
+        os.remove(archive)
+
+    newer = cds_arguments(JavaRuntime("/jdk21/bin/java", "21.0.2", 21), classpath)
+    assert newer[1] == "-XX:+AutoCreateSharedArchive"
@@ -0,0 +1,75 @@
+import jvm
+from jvm import SystemInfo, gc_arguments, jvm_arguments, max_heap_mb, recommend_heap_mb
+
+DESKTOP = SystemInfo(total_mb=16384, available_mb=12000, cpu_count=8)
+
+
+def test_container_limit_caps_memory(monkeypatch):
+    monkeypatch.setattr(jvm, "_read_meminfo", lambda: (65536, 60000))
+    monkeypatch.setattr(jvm, "_read_cgroup_limit", lambda: 4096)
+    system = jvm.detect_system()
+    assert (system.total_mb, system.available_mb) == (4096, 4096)
+    assert system.cpu_count >= 1
+
+    monkeypatch.setattr(jvm, "_read_cgroup_limit", lambda: None)
+    assert jvm.detect_system().total_mb == 65536
+
+
+def test_heap_grows_with_mods_within_limits():
+    assert recommend_heap_mb(DESKTOP) == 2048
+    assert recommend_heap_mb(DESKTOP, mod_count=100) == 5888
+    assert recommend_heap_mb(DESKTOP, mod_count=100, preset="Low memory") == 4352
+    assert recommend_heap_mb(DESKTOP, mod_count=100, preset="Unknown") == 5888
+    workstation = SystemInfo(total_mb=65536, available_mb=60000, cpu_count=16)
+    assert recommend_heap_mb(workstation, mod_count=400, preset="Low latency") == jvm.MAX_AUTO_HEAP_MB
+
+
+def test_heap_leaves_memory_to_the_system():
+    busy = SystemInfo(total_mb=16384, available_mb=3000, cpu_count=8)
+    assert recommend_heap_mb(busy, mod_count=100) == 2304
+    small = SystemInfo(total_mb=2048, available_mb=500, cpu_count=2)
+    assert max_heap_mb(small) == 1024
+    assert recommend_heap_mb(small, mod_count=100) == 1024
+    assert max_heap_mb(DESKTOP) == 16384 - jvm.SYSTEM_RESERVE_MB
+
+
+def test_zgc_depends_on_java_version():
+    assert gc_arguments(4096, 17, "Low latency", 8) == ["-XX:+UseZGC", "-XX:ConcGCThreads=2"]
+    assert "-XX:+ZGenerational" in gc_arguments(4096, 21, "Low latency", 8)
+    assert "-XX:+ZGenerational" not in gc_arguments(4096, 23, "Low latency", 8)
+    # На Java 8 ZGC нет — остаётся G1 с короткими паузами
+    legacy = gc_arguments(4096, 8, "Low latency", 8)
+    assert "-XX:+UseG1GC" in legacy
+    assert "-XX:MaxGCPauseMillis=50" in legacy
+    assert "-XX:G1RSetUpdatingPauseTimePercent=5" not in legacy
+
+
+def test_g1_regions_and_threads_follow_heap_and_cpus():
+    small = gc_arguments(4096, 17, "Balanced", 8)
+    assert "-XX:G1HeapRegionSize=8M" in small
+    assert "-XX:ParallelGCThreads=7" in small
+    large = gc_arguments(12288, 17, "Balanced", 8)
+    assert "-XX:G1HeapRegionSize=16M" in large
+    assert "-XX:ParallelGCThreads=4" in gc_arguments(4096, 17, "Low memory", 8)
+    assert "-XX:ParallelGCThreads=1" in gc_arguments(4096, 17, "Balanced", 1)
+
+
+def test_jvm_arguments_use_mods_for_auto_heap(tmp_path):
+    mods = tmp_path / "mods"
+    mods.mkdir()
+    for index in range(100):
+        (mods / f"mod{index}.jar").write_bytes(b"")
+    (mods / "readme.txt").write_text("")
+    assert jvm.count_mods(str(tmp_path)) == 100
+    assert jvm.count_mods(str(tmp_path / "missing")) == 0
+
+    arguments = jvm_arguments(str(tmp_path), 17, system=DESKTOP)
+    assert arguments[:2] == ["-Xmx5888M", "-Xms2944M"]
+    assert "-XX:+AlwaysPreTouch" not in arguments
+
+
+def test_manual_heap_and_pretouch(tmp_path):
+    arguments = jvm_arguments(str(tmp_path), 17, memory_mb=6144, preset="Throughput", system=DESKTOP)
+    assert arguments[:2] == ["-Xmx6144M", "-Xms6144M"]
+    assert arguments[-1] == "-XX:+AlwaysPreTouch"
+    assert "-XX:MaxGCPauseMillis=200" in arguments
@@ -0,0 +1,144 @@
+import glob
+import json
+import os
+import threading
+
+import fixtures
+from launcher import prepare_versions
+
+
+def add_version(minecraft_directory, fixture_root, version_id):
+    # Клиент с другим id, но теми же библиотеками и ассетами
+    path = os.path.join(
+        fixture_root, "piston", "v1", "packages", "bench", f"{fixtures.VERSION_ID}.json"
+    )
+    with open(path, "r", encoding="utf-8") as file:
+        version = json.load(file)
+    version["id"] = version_id
+    directory = os.path.join(minecraft_directory, "versions", version_id)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{version_id}.json"), "w", encoding="utf-8") as file:
+        json.dump(version, file)
+
+
+def test_concurrent_prepare_versions_share_one_directory(tmp_path, fixture_server):
+    server, fixture_root = fixture_server
+    minecraft_directory = str(tmp_path / "minecraft")
+    version_ids = ("bench-a", "bench-b", "bench-c")
+    for version_id in version_ids:
+        add_version(minecraft_directory, str(fixture_root), version_id)
+
+    barrier = threading.Barrier(len(version_ids))
+    plans = {}
+    errors = []
+
+    def prepare(version_id):
+        barrier.wait()
+        try:
+            plans.update(prepare_versions([version_id], minecraft_directory, workers=4))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=prepare, args=(version_id,)) for version_id in version_ids
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(plans) == sorted(version_ids)
+    assert glob.glob(os.path.join(minecraft_directory, "**", "*.part"), recursive=True) == []
+    for version_id in version_ids:
+        assert os.path.isfile(
+            os.path.join(minecraft_directory, "versions", version_id, f"{version_id}.jar")
+        )
+    objects = glob.glob(os.path.join(minecraft_directory, "assets", "objects", "*", "*"))
+    assert len(objects) == 200
+
+
+def test_missing_assets_and_natives_invalidate_the_plan(tmp_path, fixture_server):
+    from launch_plan import plan_files_exist
+
+    minecraft_directory = str(tmp_path)
+    plan = prepare_versions([fixtures.VERSION_ID], minecraft_directory, workers=4)[fixtures.VERSION_ID]
+    assert plan_files_exist(plan)
+
+    [asset] = glob.glob(os.path.join(minecraft_directory, "assets", "objects", "*", "*"))[:1]
+    os.remove(asset)
+    assert not plan_files_exist(plan)
+    plan = prepare_versions([fixtures.VERSION_ID], minecraft_directory)[fixtures.VERSION_ID]
+    assert os.path.isfile(asset)
+
+    os.remove(plan["asset_index"])
+    assert not plan_files_exist(plan)
+
+    natives = tmp_path / "natives"
+    natives.mkdir()
+    assert not plan_files_exist({**plan, "asset_index": None, "natives_directory": str(natives)})
+    (natives / "liblwjgl.so").write_bytes(b"")
+    assert plan_files_exist({**plan, "asset_index": None, "natives_directory": str(natives)})
+
+
+def test_command_has_only_the_version_arguments(tmp_path, fixture_server):
+    from launcher import build_command
+
+    minecraft_directory = str(tmp_path)
+    plan = prepare_versions([fixtures.VERSION_ID], minecraft_directory)[fixtures.VERSION_ID]
+    command = build_command(plan, minecraft_directory, "Steve")
+    assert command[command.index("net.minecraft.client.main.Main") + 1:] == [
+        "--username", "Steve", "--version", fixtures.VERSION_ID,
+        "--gameDir", minecraft_directory, "--assetIndex", "bench",
+        "--uuid", command[command.index("--uuid") + 1], "--accessToken", "",
+    ]
+
+
+def test_unchanged_version_reuses_the_plan(tmp_path, fixture_server, monkeypatch):
+    import installer
+    import launch_plan
+
+    minecraft_directory = str(tmp_path)
+    plan = prepare_versions([fixtures.VERSION_ID], minecraft_directory)[fixtures.VERSION_ID]
+
+    installs = []
+    install_versions = installer.install_versions
+    monkeypatch.setattr(
+        installer, "install_versions",
+        lambda *args, **kwargs: installs.append(args[0]) or install_versions(*args, **kwargs),
+    )
+    assert prepare_versions([fixtures.VERSION_ID], minecraft_directory)[fixtures.VERSION_ID] == plan
+    assert installs == []
+
+    # Изменённый JSON версии делает план недействительным
+    path = os.path.join(minecraft_directory, "versions", fixtures.VERSION_ID, f"{fixtures.VERSION_ID}.json")
+    with open(path, "r", encoding="utf-8") as file:
+        version = json.load(file)
+    version["mainClass"] = "org.bench.Main"
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(version, file)
+    assert launch_plan.load_launch_plan(fixtures.VERSION_ID, minecraft_directory) is None
+    plan = prepare_versions([fixtures.VERSION_ID], minecraft_directory)[fixtures.VERSION_ID]
+    assert installs == [[fixtures.VERSION_ID]]
+    assert "org.bench.Main" in plan["command"]
+
+    monkeypatch.setattr(launch_plan, "LAUNCH_PLAN_VERSION", launch_plan.LAUNCH_PLAN_VERSION + 1)
+    assert launch_plan.load_launch_plan(fixtures.VERSION_ID, minecraft_directory) is None
+
+
+def test_rendered_command_has_no_placeholders(tmp_path, fixture_server):
+    from launch_plan import JVM_ARGUMENTS, TOKEN, USERNAME, UUID, render_command
+
+    plan = prepare_versions([fixtures.VERSION_ID], str(tmp_path))[fixtures.VERSION_ID]
+    command = render_command(plan, "Steve", "uuid-1", "token-1", ["-Xmx2G", "-Xms1G"], executable="/opt/java/bin/java")
+    assert command[0] == "/opt/java/bin/java"
+    start = command.index("-Xmx2G")
+    assert command[start:start + 2] == ["-Xmx2G", "-Xms1G"]
+    assert len(command) == len(plan["command"]) + 1
+    for option, value in (("--username", "Steve"), ("--uuid", "uuid-1"), ("--accessToken", "token-1")):
+        assert command[command.index(option) + 1] == value
+    text = " ".join(command)
+    for placeholder in (USERNAME, UUID, TOKEN, JVM_ARGUMENTS):
+        assert placeholder not in text
+    # Шаблон в плане не меняется
+    assert USERNAME in " ".join(plan["command"])
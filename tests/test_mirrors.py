@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from mirrors import MirrorConfig, OfflineError
+
+SRC_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def write_config(tmp_path, data):
+    path = tmp_path / "mirrors.json"
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def test_longest_prefix_wins(tmp_path):
+    config = MirrorConfig(write_config(tmp_path, {"mirrors": {
+        "https://example.net": "http://lan/all",
+        "https://example.net/libraries/": "http://lan/libraries",
+    }}))
+    assert config.rewrite("https://example.net/libraries/a.jar") == "http://lan/libraries/a.jar"
+    assert config.rewrite("https://example.net/assets/b") == "http://lan/all/assets/b"
+    assert config.rewrite("https://example.network/c") == "https://example.network/c"
+
+
+@pytest.mark.parametrize("data, environment, offline", [
+    ({}, "", False),
+    ({"offline": True}, "", True),
+    ({}, "1", True),
+    ({}, "0", False),
+])
+def test_offline_switches(tmp_path, monkeypatch, data, environment, offline):
+    monkeypatch.setenv("BEDROCK_OFFLINE", environment)
+    config = MirrorConfig(write_config(tmp_path, data))
+    assert config.offline is offline
+    if offline:
+        with pytest.raises(OfflineError):
+            config.check("https://example.net/a")
+
+
+def test_launcher_lib_is_patched_only_on_request():
+    # Отдельный интерпретатор: в этом процессе библиотеку уже пропатчили фикстуры
+    script = (
+        "import minecraft_launcher_lib._helper as helper, requests, installer, mirrors\n"
+        "print(helper.requests is requests)\n"
+        "mirrors.patch_launcher_lib()\n"
+        "shim = helper.requests\n"
+        "mirrors.patch_launcher_lib()\n"
+        "print(shim is not requests and helper.requests is shim)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=SRC_DIRECTORY,
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    assert output == ["True", "True"]
@@ -0,0 +1,206 @@
+import io
+import json
+import os
+import zipfile
+
+import mods as mods_module
+from mods import ModIndex, read_mod_metadata
+from resolver import resolve
+
+
+def jar_bytes(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def fabric_jar(mod_id, version="1.0.0", depends=None, nested=None, **extra):
+    metadata = {"schemaVersion": 1, "id": mod_id, "version": version, "depends": depends or {}}
+    files = {}
+    for name, data in (nested or {}).items():
+        files[f"META-INF/jars/{name}"] = data
+    if nested:
+        metadata["jars"] = [{"file": f"META-INF/jars/{name}"} for name in nested]
+    metadata.update(extra)
+    files["fabric.mod.json"] = json.dumps(metadata)
+    return jar_bytes(files)
+
+
+def fabric_api(version="0.92.0"):
+    return fabric_jar("fabric-api", version, nested={
+        "fabric-api-base-0.4.31.jar": fabric_jar("fabric-api-base", "0.4.31"),
+        "fabric-rendering-data-attachment-v1-0.3.38.jar": fabric_jar(
+            "fabric-rendering-data-attachment-v1", "0.3.38",
+            depends={"fabric-api-base": "*"},
+        ),
+    })
+
+
+def write_mods(folder, jars):
+    folder.mkdir(parents=True, exist_ok=True)
+    for name, data in jars.items():
+        (folder / name).write_bytes(data)
+
+
+def test_fabric_nested_jars_are_indexed_as_bundled(tmp_path):
+    path = tmp_path / "fabric-api.jar"
+    path.write_bytes(fabric_api())
+    mods = {mod.id: mod for mod in read_mod_metadata(str(path))}
+    assert mods["fabric-api"].bundled_by == ""
+    assert mods["fabric-api-base"].bundled_by == "fabric-api"
+    assert mods["fabric-rendering-data-attachment-v1"].version == "0.3.38"
+
+
+def test_forge_jarjar_is_indexed(tmp_path):
+    inner = jar_bytes({
+        "META-INF/mods.toml": 'modLoader="javafml"\n[[mods]]\nmodId="inner"\nversion="2.1"\n',
+    })
+    outer = jar_bytes({
+        "META-INF/mods.toml": 'modLoader="javafml"\n[[mods]]\nmodId="outer"\nversion="1.0"\n',
+        "META-INF/jarjar/inner.jar": inner,
+        "META-INF/jarjar/metadata.json": json.dumps({"jars": [{
+            "identifier": {"group": "org.example", "artifact": "inner"},
+            "version": {"range": "[2,)", "artifactVersion": "2.1"},
+            "path": "META-INF/jarjar/inner.jar",
+        }]}),
+    })
+    path = tmp_path / "outer.jar"
+    path.write_bytes(outer)
+    mods = {mod.id: mod for mod in read_mod_metadata(str(path))}
+    assert mods["inner"].bundled_by == "outer"
+    assert mods["inner"].version == "2.1"
+
+
+def test_bundled_modules_satisfy_dependencies(tmp_path):
+    folder = tmp_path / "mods"
+    write_mods(folder, {
+        "fabric-api.jar": fabric_api(),
+        "sodium.jar": fabric_jar("sodium", depends={
+            "fabric-rendering-data-attachment-v1": ">=0.3", "fabric-api-base": "*",
+        }),
+        # Ещё один мод со своей копией модуля — это не дубликат
+        "other.jar": fabric_jar("other", nested={
+            "fabric-api-base-0.4.30.jar": fabric_jar("fabric-api-base", "0.4.30"),
+        }),
+    })
+    mods = ModIndex(str(tmp_path)).scan(str(folder))
+    assert resolve(mods, "Fabric", loader_version="0.15.11") == []
+
+
+def test_missing_module_is_still_reported(tmp_path):
+    folder = tmp_path / "mods"
+    write_mods(folder, {
+        "sodium.jar": fabric_jar("sodium", depends={"fabric-rendering-data-attachment-v1": "*"}),
+    })
+    mods = ModIndex(str(tmp_path)).scan(str(folder))
+    assert [problem.kind for problem in resolve(mods, "Fabric")] == ["missing"]
+
+
+CREATE_TOML = """
+modLoader="javafml"
+[[mods]]
+modId="create"
+version="${file.jarVersion}"
+displayName="Create"
+[[dependencies.create]]
+    modId="forge"
+    mandatory=true
+    versionRange="[47,)"
+[[dependencies.create]]
+    modId="minecraft"
+    mandatory=true
+    versionRange="[1.20.1,1.20.2)"
+[[dependencies.create]]
+    modId="flywheel"
+    type="required"
+    versionRange="[0.6.10,)"
+[[dependencies.create]]
+    modId="jei"
+    type="optional"
+"""
+
+
+def read_one(tmp_path, files):
+    path = tmp_path / "mod.jar"
+    path.write_bytes(jar_bytes(files))
+    (mod,) = read_mod_metadata(str(path))
+    return mod
+
+
+def test_forge_mods_toml(tmp_path):
+    mod = read_one(tmp_path, {
+        "META-INF/mods.toml": CREATE_TOML,
+        "META-INF/MANIFEST.MF": "Manifest-Version: 1.0\nImplementation-Version: 0.5.1.f\n",
+    })
+    assert (mod.id, mod.name, mod.version, mod.loader) == ("create", "Create", "0.5.1.f", "forge")
+    assert mod.minecraft == "[1.20.1,1.20.2)"
+    assert mod.dependencies == {"flywheel": "[0.6.10,)"}
+
+
+def test_loose_toml_is_still_read(tmp_path):
+    # Значение без кавычек — не TOML, но такие mods.toml встречаются
+    mod = read_one(tmp_path, {
+        "META-INF/neoforge.mods.toml": 'license=All rights reserved\n[[mods]]\nmodId="loose"\nversion="1.0"\n',
+    })
+    assert (mod.id, mod.version, mod.loader) == ("loose", "1.0", "neoforge")
+
+
+def test_legacy_mcmod_info(tmp_path):
+    mod = read_one(tmp_path, {"mcmod.info": json.dumps([{
+        "modid": "jei", "version": "4.16", "mcversion": "1.12.2",
+        "requiredMods": ["Forge@[14.23,)", "baubles@[1.5,)", "mantle"],
+    }])})
+    assert (mod.id, mod.minecraft, mod.loader) == ("jei", "1.12.2", "forge")
+    assert mod.dependencies == {"baubles": "[1.5,)", "mantle": "*"}
+
+
+def test_fabric_metadata(tmp_path):
+    mod = read_one(tmp_path, {"fabric.mod.json": json.dumps({
+        "schemaVersion": 1, "id": "sodium", "version": "0.5.8",
+        "depends": {"minecraft": ["1.20.1", "1.20.2"], "java": ">=17", "fabricloader": ">=0.12"},
+        "provides": ["indium-compat"],
+    })})
+    assert mod.minecraft == "1.20.1 || 1.20.2"
+    assert mod.dependencies == {"fabricloader": ">=0.12"}
+    assert mod.provides == ["indium-compat"]
+
+
+def test_index_rereads_only_changed_jars(tmp_path, monkeypatch):
+    folder = tmp_path / "mods"
+    write_mods(folder, {
+        "sodium.jar": fabric_jar("sodium"),
+        "lithium.jar": fabric_jar("lithium"),
+        "broken.jar": b"not a zip",
+    })
+    index = ModIndex(str(tmp_path))
+    scanned = index.scan(str(folder))
+    assert [mod.id for mod in scanned[str(folder / "sodium.jar")]] == ["sodium"]
+    assert scanned[str(folder / "broken.jar")] == []
+    assert index.entries["mods/broken.jar"]["error"]
+    index.save()
+
+    read = []
+    read_mod_metadata = mods_module.read_mod_metadata
+    monkeypatch.setattr(mods_module, "read_mod_metadata", lambda path: read.append(path) or read_mod_metadata(path))
+    index = ModIndex(str(tmp_path))
+    assert len(index.scan(str(folder))) == 3
+    assert read == []
+
+    (folder / "lithium.jar").write_bytes(fabric_jar("lithium", "0.12.0"))
+    os.remove(folder / "sodium.jar")
+    scanned = index.scan(str(folder))
+    assert read == [str(folder / "lithium.jar")]
+    assert scanned[str(folder / "lithium.jar")][0].version == "0.12.0"
+    assert sorted(index.entries) == ["mods/broken.jar", "mods/lithium.jar"]
+
+
+def test_index_of_another_folder_is_kept(tmp_path):
+    write_mods(tmp_path / "mods", {"sodium.jar": fabric_jar("sodium")})
+    write_mods(tmp_path / "library", {"lithium.jar": fabric_jar("lithium")})
+    index = ModIndex(str(tmp_path))
+    index.scan(str(tmp_path / "mods"))
+    index.scan(str(tmp_path / "library"))
+    assert sorted(index.entries) == ["library/lithium.jar", "mods/sodium.jar"]
+    assert index.scan(str(tmp_path / "missing")) == {}
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import threading
+
+import pytest
+
+import network
+from fixtures import FixtureServer
+from mirrors import OfflineError, mirror_config
+from network import DownloadError, HttpClient, download_file
+
+DATA = bytes(range(256)) * 4096  # 1 МБ
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(network, "HTTP_BACKOFF", 0)
+    root = tmp_path / "served"
+    root.mkdir()
+    (root / "file.bin").write_bytes(DATA)
+    with FixtureServer(str(root)) as server:
+        yield server
+
+
+def fetch(server, path, **kwargs):
+    kwargs.setdefault("sha1", hashlib.sha1(DATA).hexdigest())
+    kwargs.setdefault("size", len(DATA))
+    return download_file(f"{server.url}/file.bin", str(path), **kwargs)
+
+
+def test_download_is_verified_and_atomic(server, tmp_path):
+    path = tmp_path / "out" / "file.bin"
+    received = []
+    assert fetch(server, path, on_bytes=received.append) == str(path)
+    assert path.read_bytes() == DATA
+    assert sum(received) == len(DATA)
+    assert not os.path.exists(f"{path}.part")
+
+
+def test_broken_transfer_resumes_with_range(server, tmp_path):
+    path = tmp_path / "file.bin"
+    server.cut("/file.bin")
+    fetch(server, path)
+    assert path.read_bytes() == DATA
+    (_, first_range), (_, second_range) = server.log
+    assert first_range is None
+    # Продолжение с того места, до которого дошёл обрыв
+    offset = int(second_range[len("bytes="):-1])
+    assert 0 < offset <= len(DATA) // 2
+
+
+def test_part_file_from_previous_run_is_resumed(server, tmp_path):
+    path = tmp_path / "file.bin"
+    (tmp_path / "file.bin.part").write_bytes(DATA[:1000])
+    fetch(server, path)
+    assert path.read_bytes() == DATA
+    assert server.log == [("/file.bin", "bytes=1000-")]
+
+
+def test_checksum_mismatch_fails_without_leaving_files(server, tmp_path):
+    path = tmp_path / "file.bin"
+    with pytest.raises(DownloadError, match="Checksum mismatch"):
+        fetch(server, path, sha1="0" * 40, retries=1)
+    assert os.listdir(tmp_path) == ["served"]
+
+
+def test_server_errors_are_retried_once_per_attempt(server, tmp_path):
+    server.fail("/file.bin", 503, 503)
+    fetch(server, tmp_path / "file.bin")
+    # Повторы только во внешнем цикле: urllib3 для потоков их не делает
+    assert len(server.log) == 3
+
+
+def test_missing_file_fails_immediately(server, tmp_path):
+    with pytest.raises(DownloadError, match="HTTP 404"):
+        download_file(f"{server.url}/missing.bin", str(tmp_path / "missing.bin"))
+    assert len(server.log) == 1
+
+
+def test_complete_destination_is_not_downloaded_again(server, tmp_path):
+    path = tmp_path / "file.bin"
+    path.write_bytes(DATA)
+    fetch(server, path)
+    fetch(server, path, sha1=None)
+    assert server.log == []
+
+
+def test_concurrent_writers_of_one_path_download_once(server, tmp_path):
+    path = tmp_path / "file.bin"
+    barrier = threading.Barrier(4)
+    errors = []
+
+    def run():
+        barrier.wait()
+        try:
+            fetch(server, path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert path.read_bytes() == DATA
+    assert len(server.log) == 1
+    assert network._download_locks == {}
+
+
+def concurrently(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(index):
+        barrier.wait()
+        results[index] = target(index)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_gets_in_flight_share_one_request(server):
+    server.latency = 0.2
+    client = HttpClient()
+    responses = concurrently(4, lambda _: client.get(f"{server.url}/file.bin"))
+    assert len(server.log) == 1
+    assert all(response is responses[0] for response in responses)
+    assert responses[0].content == DATA
+    assert client._in_flight == {}
+
+
+def test_gets_with_different_headers_are_not_merged(server):
+    server.latency = 0.2
+    client = HttpClient()
+    ranges = [{"Range": "bytes=0-"}, {"Range": "bytes=1000-"}]
+    responses = concurrently(2, lambda index: client.get(
+        f"{server.url}/file.bin", headers=ranges[index]
+    ))
+    assert sorted(entry[1] for entry in server.log) == ["bytes=0-", "bytes=1000-"]
+    assert [len(response.content) for response in responses] == [len(DATA), len(DATA) - 1000]
+
+
+def test_offline_get_fails_without_network(server, monkeypatch):
+    monkeypatch.setattr(mirror_config, "offline", True)
+    with pytest.raises(OfflineError):
+        HttpClient().get(f"{server.url}/file.bin")
+    assert server.log == []
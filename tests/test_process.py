@@ -0,0 +1,59 @@
+import sys
+
+from constants import CONSOLE_MAX_LINE_LENGTH
+from process import GameProcess, LogBuffer
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+def test_reader_gets_only_new_lines():
+    log = LogBuffer(max_lines=3)
+    log.extend(["a", "b"])
+    lines, position, skipped = log.since(0)
+    assert (lines, position, skipped) == (["a", "b"], 2, 0)
+    assert log.since(position) == ([], 2, 0)
+
+    log.append("c")
+    assert log.since(position) == (["c"], 3, 0)
+
+
+def test_slow_reader_is_told_how_many_lines_it_missed():
+    log = LogBuffer(max_lines=3)
+    log.extend(str(index) for index in range(10))
+    assert log.lines() == ["7", "8", "9"]
+    assert log.since(2) == (["7", "8", "9"], 10, 5)
+
+
+def test_process_output_is_collected():
+    code = (
+        "import sys\n"
+        "print('first', flush=True)\n"
+        "print('error', file=sys.stderr, flush=True)\n"
+        "sys.stdout.buffer.write(b'crlf\\r\\nbad \\xff\\nno newline')\n"
+        "sys.exit(3)\n"
+    )
+    game = GameProcess(python(code))
+    assert game.wait(10) == 3
+    assert game.returncode == 3
+    assert not game.is_running()
+    # stderr идёт в тот же лог, \r и битые байты не ломают строки
+    assert game.log.lines() == ["first", "error", "crlf", "bad \ufffd", "no newline"]
+
+
+def test_long_lines_are_cut():
+    code = f"print('x' * {CONSOLE_MAX_LINE_LENGTH * 3}); print('after')"
+    game = GameProcess(python(code))
+    game.wait(10)
+    lines = game.log.lines()
+    assert lines[-1] == "after"
+    assert all(len(line) <= CONSOLE_MAX_LINE_LENGTH for line in lines)
+
+
+def test_terminate_stops_the_process():
+    game = GameProcess(python("import time; print('ready', flush=True); time.sleep(60)"))
+    assert game.is_running()
+    game.terminate()
+    assert game.wait(10) != 0
+    game.kill()
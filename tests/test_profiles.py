@@ -0,0 +1,73 @@
+import json
+import os
+
+import pytest
+
+from profiles import ModProfiles
+
+
+def add_mod(minecraft_directory, filename, data):
+    folder = os.path.join(minecraft_directory, "mods")
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, filename), "wb") as file:
+        file.write(data)
+
+
+def test_profile_keeps_game_and_loader_versions_apart(tmp_path):
+    add_mod(str(tmp_path), "sodium.jar", b"sodium")
+    profiles = ModProfiles(str(tmp_path))
+    profiles.create("Modded", minecraft_version="1.20.1", loader="Fabric", loader_version="0.15.11")
+
+    profile = ModProfiles(str(tmp_path)).get("Modded")
+    assert profile["minecraft_version"] == "1.20.1"
+    assert profile["loader_version"] == "0.15.11"
+    assert list(profile["mods"]) == ["sodium.jar"]
+
+
+def test_switching_profiles_swaps_mods(tmp_path):
+    mods = tmp_path / "mods"
+    add_mod(str(tmp_path), "a.jar", b"a")
+    profiles = ModProfiles(str(tmp_path))
+    profiles.create("A")
+    os.remove(mods / "a.jar")
+    add_mod(str(tmp_path), "b.jar", b"b")
+    profiles.create("B")
+
+    profiles.activate("A")
+    assert sorted(os.listdir(mods)) == ["a.jar"]
+    profiles.activate("B")
+    assert sorted(os.listdir(mods)) == ["b.jar"]
+
+
+def test_incomplete_profile_leaves_mods_untouched(tmp_path):
+    mods = tmp_path / "mods"
+    add_mod(str(tmp_path), "a.jar", b"a")
+    profiles = ModProfiles(str(tmp_path))
+    profiles.create("A")
+    os.remove(mods / "a.jar")
+    add_mod(str(tmp_path), "b.jar", b"b")
+    add_mod(str(tmp_path), "c.jar", b"c")
+    profiles.create("B")
+    profiles.activate("A")
+    os.remove(profiles.library.path_for(profiles.get("B")["mods"]["c.jar"]))
+
+    with pytest.raises(LookupError, match="c.jar"):
+        profiles.activate("B")
+    assert sorted(os.listdir(mods)) == ["a.jar"]
+    assert profiles.active == "A"
+
+
+@pytest.mark.parametrize("stored, minecraft_version, loader_version", [
+    ({"loader": "Fabric", "minecraft_version": "0.15.11"}, "", "0.15.11"),
+    ({"loader": "Forge", "minecraft_version": "1.20.1-recommended"}, "1.20.1", ""),
+    ({"loader": "Vanilla", "minecraft_version": "1.20.1"}, "1.20.1", ""),
+])
+def test_old_profiles_are_upgraded(tmp_path, stored, minecraft_version, loader_version):
+    directory = tmp_path / ".bedrock-launcher"
+    directory.mkdir()
+    (directory / "profiles.json").write_text(json.dumps({
+        "active": None, "profiles": {"Old": {**stored, "mods": {}}},
+    }))
+    profile = ModProfiles(str(tmp_path)).get("Old")
+    assert profile["minecraft_version"] == minecraft_version
+    assert profile["loader_version"] == loader_version
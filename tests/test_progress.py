@@ -0,0 +1,79 @@
+import threading
+
+import progress
+from progress import ProgressTracker, format_duration, format_size
+
+
+def test_formatting():
+    assert format_size(512) == "512.0 B"
+    assert format_size(1536) == "1.5 KB"
+    assert format_size(3 * 1024 ** 3) == "3.0 GB"
+    assert format_size(5 * 1024 ** 4) == "5120.0 GB"
+    assert format_duration(59.9) == "0:59"
+    assert format_duration(61) == "1:01"
+    assert format_duration(3723) == "1:02:03"
+
+
+def test_updates_from_many_threads_are_counted():
+    tracker = ProgressTracker()
+    callback = tracker.callback()
+    callback["setMax"](400)
+    revision = tracker.snapshot()["revision"]
+
+    def work():
+        for _ in range(100):
+            callback["addBytes"](1024)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert tracker.bytes == 400 * 1024
+    assert tracker.snapshot()["revision"] == revision + 400
+
+
+def test_unchanged_tracker_keeps_its_revision():
+    # Отображение по номеру ревизии пропускает снимки без изменений
+    tracker = ProgressTracker()
+    first = tracker.snapshot()
+    assert tracker.snapshot()["revision"] == first["revision"]
+    tracker.set_status("Download")
+    assert tracker.snapshot()["revision"] > first["revision"]
+
+
+def test_rates_and_eta_are_per_phase(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(progress.time, "monotonic", lambda: now[0])
+    tracker = ProgressTracker()
+    tracker.add_bytes(10 * 1024 ** 2)
+
+    tracker.set_max(100)
+    now[0] += 10
+    tracker.set_progress(50)
+    tracker.add_bytes(20 * 1024 ** 2)
+    snapshot = tracker.snapshot()
+    assert snapshot["files_per_second"] == 5
+    assert snapshot["bytes_per_second"] == 2 * 1024 ** 2
+    assert snapshot["eta"] == 10
+    assert ProgressTracker.format_details(snapshot) == "5.0 files/s, 2.0 MB/s, ETA 0:10"
+
+    tracker.set_max(10)
+    snapshot = tracker.snapshot()
+    assert snapshot["progress"] == 0
+    assert snapshot["eta"] is None
+    assert ProgressTracker.format_details(snapshot) == ""
+
+
+def test_finished_phase_has_no_eta(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(progress.time, "monotonic", lambda: now[0])
+    tracker = ProgressTracker()
+    tracker.set_max(4)
+    now[0] += 2
+    tracker.set_progress(4)
+    assert ProgressTracker.format_details(tracker.snapshot()) == "2.0 files/s, 0.0 B/s"
+
+    tracker.reset()
+    snapshot = tracker.snapshot()
+    assert (snapshot["status"], snapshot["progress"], snapshot["max"]) == ("", 0, 0)
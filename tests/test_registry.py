@@ -0,0 +1,73 @@
+import json
+import os
+
+from registry import InstalledVersionIndex
+
+
+def install(directory, version_id, **data):
+    folder = directory / "versions" / version_id
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"{version_id}.json"
+    path.write_text(json.dumps({"id": version_id, **data}))
+    return path
+
+
+def test_scan_lists_installed_versions(tmp_path):
+    install(tmp_path, "1.20.1", type="release")
+    install(tmp_path, "broken")
+    (tmp_path / "versions" / "broken" / "broken.json").write_text("{")
+    (tmp_path / "versions" / "empty").mkdir()
+    index = InstalledVersionIndex(str(tmp_path))
+    assert "1.20.1" in index
+    assert len(index) == 1
+    assert list(index) == [{"id": "1.20.1", "type": "release", "inheritsFrom": None}]
+
+
+def test_refresh_rereads_only_changes(tmp_path):
+    path = install(tmp_path, "1.20.1", type="release")
+    index = InstalledVersionIndex(str(tmp_path))
+    assert index.refresh() is False
+
+    install(tmp_path, "1.19.4", type="release")
+    path.write_text(json.dumps({"id": "1.20.1", "type": "snapshot"}))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert index.refresh() is True
+    assert sorted(index.versions) == ["1.19.4", "1.20.1"]
+    assert index.versions["1.20.1"]["type"] == "snapshot"
+
+    os.remove(path)
+    assert index.refresh() is True
+    assert "1.20.1" not in index
+
+
+def test_switching_directory_starts_over(tmp_path):
+    install(tmp_path / "a", "1.20.1")
+    install(tmp_path / "b", "1.19.4")
+    index = InstalledVersionIndex(str(tmp_path / "a"))
+    assert index.refresh(str(tmp_path / "b")) is True
+    assert list(index.versions) == ["1.19.4"]
+
+
+def test_missing_directory_is_empty(tmp_path):
+    index = InstalledVersionIndex(str(tmp_path / "missing"))
+    assert len(index) == 0
+    assert index.refresh() is False
+
+
+def test_loader_lookups(tmp_path):
+    install(tmp_path, "1.20.1")
+    install(tmp_path, "1.20.1-forge-47.2.0", inheritsFrom="1.20.1")
+    install(tmp_path, "fabric-loader-0.15.9-1.20.1", inheritsFrom="1.20.1")
+    install(tmp_path, "fabric-loader-0.15.9-1.19.4", inheritsFrom="1.19.4")
+    index = InstalledVersionIndex(str(tmp_path))
+
+    assert index.is_forge_installed("1.20.1-recommended", "47.2.0")
+    assert not index.is_forge_installed("1.20.1-latest", "47.3.0")
+    assert not index.is_forge_installed("1.19.4-recommended", "47.2.0")
+    assert index.is_fabric_installed("0.15.9")
+    assert not index.is_fabric_installed("0.15.10")
+    assert index.fabric_minecraft_versions("0.15.9") == ["1.19.4", "1.20.1"]
+
+    os.remove(tmp_path / "versions" / "1.20.1-forge-47.2.0" / "1.20.1-forge-47.2.0.json")
+    index.refresh()
+    assert not index.is_forge_installed("1.20.1-recommended", "47.2.0")
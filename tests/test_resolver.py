@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from mods import ModInfo
+from registry import InstalledVersionIndex
+from resolver import resolve, version_key, version_matches
+
+
+@pytest.mark.parametrize("left, right", [
+    ("1.20", "1.20.1"),
+    ("1.9", "1.10"),
+    ("1.20-pre1", "1.20"),
+    ("0.14.9", "0.15.0"),
+])
+def test_version_key_orders_versions(left, right):
+    assert version_key(left) < version_key(right)
+
+
+@pytest.mark.parametrize("left, right", [
+    ("1.20", "1.20.0"),
+    ("0.15.11+build.3", "0.15.11"),
+])
+def test_version_key_ignores_trailing_zeros_and_build_metadata(left, right):
+    assert version_key(left) == version_key(right)
+
+
+@pytest.mark.parametrize("version, version_range, expected", [
+    ("1.20.1", "[1.20,1.21)", True),
+    ("1.21", "[1.20,1.21)", False),
+    ("1.20", "(1.20,1.21)", False),
+    ("1.20", "[1.20,)", True),
+    ("1.19.4", "[1.20,)", False),
+    ("1.19.4", "(,1.20]", True),
+    ("1.20.1", "[1.20.1]", True),
+    ("1.20.2", "[1.20.1]", False),
+    ("1.18.2", "[1.16,1.17),[1.18,1.19)", True),
+    ("1.17.1", "[1.16,1.17),[1.18,1.19)", False),
+])
+def test_maven_ranges(version, version_range, expected):
+    assert version_matches(version, version_range) is expected
+
+
+@pytest.mark.parametrize("version, version_range, expected", [
+    ("0.15.11", ">=0.14", True),
+    ("0.13.3", ">=0.14", False),
+    ("1.20.1", "1.20.x", True),
+    ("1.21", "1.20.x", False),
+    ("1.20.4", "~1.20.1", True),
+    ("1.21", "~1.20.1", False),
+    ("1.9.0", "^1.2", True),
+    ("2.0.0", "^1.2", False),
+    ("1.20.1", ">=1.20 <1.21", True),
+    ("1.21", ">=1.20 <1.21", False),
+    ("1.19.2", "1.18.2 || 1.19.2", True),
+    ("1.19.3", "1.18.2 || 1.19.2", False),
+    ("1.20.1", "=1.20.1", True),
+    ("1.20.1", "<1.20.1", False),
+])
+def test_fabric_constraints(version, version_range, expected):
+    assert version_matches(version, version_range) is expected
+
+
+@pytest.mark.parametrize("version, version_range", [
+    ("", ">=1.0"),
+    ("1.0", ""),
+    ("1.0", "*"),
+    ("${version}", ">=2.0"),
+    ("1.0", "${mc_range}"),
+])
+def test_unknown_versions_do_not_block(version, version_range):
+    assert version_matches(version, version_range)
+
+
+def fabric_mod(mod_id, **kwargs):
+    return ModInfo(id=mod_id, version="1.0", name=mod_id, loader="fabric", **kwargs)
+
+
+def test_fabric_minecraft_range_is_checked():
+    mods = {"a.jar": [fabric_mod("a", minecraft="~1.19")]}
+    problems = resolve(mods, "Fabric", minecraft_version="1.20.1", loader_version="0.15.11")
+    assert [problem.kind for problem in problems] == ["minecraft"]
+    assert resolve(mods, "Fabric", minecraft_version="1.19.2", loader_version="0.15.11") == []
+
+
+def test_resolver_reports_duplicates_loader_and_versions():
+    mods = {
+        "a.jar": [fabric_mod("a", dependencies={"b": ">=2.0", "fabricloader": ">=0.16"})],
+        "a-copy.jar": [fabric_mod("a")],
+        "b.jar": [fabric_mod("b")],
+        "forge.jar": [ModInfo(id="f", version="1.0", name="f", loader="forge")],
+    }
+    kinds = sorted(problem.kind for problem in resolve(mods, "Fabric", loader_version="0.15.11"))
+    assert kinds == ["duplicate", "loader", "version", "version"]
+
+
+def test_installed_fabric_profiles_give_minecraft_version(tmp_path):
+    for version_id, parent in (
+        ("fabric-loader-0.15.11-1.20.1", "1.20.1"),
+        ("fabric-loader-0.14.21-1.19.2", "1.19.2"),
+        ("fabric-loader-0.14.21-1.20.1", "1.20.1"),
+    ):
+        directory = tmp_path / "versions" / version_id
+        directory.mkdir(parents=True)
+        (directory / f"{version_id}.json").write_text(
+            json.dumps({"id": version_id, "inheritsFrom": parent})
+        )
+    index = InstalledVersionIndex(str(tmp_path))
+    assert index.fabric_minecraft_versions("0.15.11") == ["1.20.1"]
+    assert index.fabric_minecraft_versions("0.14.21") == ["1.19.2", "1.20.1"]
+    assert index.fabric_minecraft_versions("0.16.0") == []
+    assert index.is_fabric_installed("0.15.11")
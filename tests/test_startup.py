@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIRECTORY = os.path.join(ROOT_DIRECTORY, "src")
+STARTUP = os.path.join(ROOT_DIRECTORY, "benchmarks", "startup.py")
+
+WINDOW_STATE = """
+import json, sys
+from PyQt5.QtWidgets import QApplication
+app = QApplication([])
+import bedrock
+heavy = sorted(name for name in ("requests", "minecraft_launcher_lib") if name in sys.modules)
+window = bedrock.MainWindow()
+lazy = [tab.widget is None for tab in window.findChildren(bedrock.LazyTab)]
+print(json.dumps({"heavy": heavy, "lazy": lazy}))
+"""
+
+
+def run(arguments, **kwargs):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    return subprocess.run(
+        [sys.executable, *arguments], env=env, capture_output=True, text=True, timeout=60, **kwargs
+    )
+
+
+def test_window_module_does_not_import_network_libraries():
+    result = run(["-c", WINDOW_STATE], cwd=SRC_DIRECTORY)
+    assert result.returncode == 0, result.stderr
+    state = json.loads(result.stdout.strip().splitlines()[-1])
+    assert state["heavy"] == []
+    # Вкладки строятся при первом показе, а не в конструкторе окна
+    assert state["lazy"] and all(state["lazy"])
+
+
+def test_startup_benchmark_reports_and_checks_budget(tmp_path):
+    path = tmp_path / "startup.json"
+    result = run([STARTUP, "--runs", "1", "--json", str(path)])
+    assert result.returncode == 0, result.stderr
+    report = json.loads(path.read_text())
+    assert set(report["summary"]) == {
+        "qt_init_ms", "import_ms", "construct_ms", "window_shown_ms", "process_ms",
+    }
+    assert report["runs"][0]["window_shown_ms"] > 0
+
+    result = run([STARTUP, "--runs", "1", "--max-ms", "0.001"])
+    assert result.returncode == 1
+    assert "exceeds budget" in result.stdout
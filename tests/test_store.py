@@ -0,0 +1,74 @@
+import hashlib
+import os
+
+import pytest
+
+import store
+from store import ContentStore, link_file
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.bin"
+    path.write_bytes(b"library")
+    return path
+
+
+def failing(message):
+    def fail(*args):
+        raise OSError(message)
+    return fail
+
+
+def no_hardlinks(monkeypatch):
+    monkeypatch.setattr(os, "link", failing("cross-device link"))
+
+
+def no_reflinks(monkeypatch):
+    monkeypatch.setattr(store, "_reflink", failing("reflink not supported"))
+
+
+def test_hardlink_is_preferred(tmp_path, source):
+    destination = tmp_path / "out" / "lib.jar"
+    link_file(str(source), str(destination))
+    assert os.path.samefile(source, destination)
+
+
+def test_symlink_fallback_when_allowed(tmp_path, source, monkeypatch):
+    no_hardlinks(monkeypatch)
+    no_reflinks(monkeypatch)
+    destination = tmp_path / "lib.jar"
+    link_file(str(source), str(destination), symlink=True)
+    assert os.path.islink(destination)
+    assert destination.read_bytes() == b"library"
+
+
+def test_copy_is_the_last_resort(tmp_path, source, monkeypatch):
+    no_hardlinks(monkeypatch)
+    no_reflinks(monkeypatch)
+    monkeypatch.setattr(os, "symlink", failing("denied"))
+    destination = tmp_path / "lib.jar"
+    destination.write_bytes(b"old")
+    link_file(str(source), str(destination), symlink=True)
+    assert not os.path.islink(destination)
+    assert not os.path.samefile(source, destination)
+    assert destination.read_bytes() == b"library"
+    assert sorted(os.listdir(tmp_path)) == ["lib.jar", "source.bin"]
+
+
+def test_failed_link_leaves_no_temporary_file(tmp_path, source, monkeypatch):
+    monkeypatch.setattr(os, "replace", failing("busy"))
+    with pytest.raises(OSError, match="busy"):
+        link_file(str(source), str(tmp_path / "lib.jar"))
+    assert os.listdir(tmp_path) == ["source.bin"]
+
+
+def test_store_links_added_files_into_installs(tmp_path, source):
+    content = ContentStore(str(tmp_path / "store"))
+    sha1 = hashlib.sha1(b"library").hexdigest()
+    content.add(str(source), sha1)
+    assert content.has(sha1)
+
+    destination = tmp_path / "minecraft" / "libraries" / "lib.jar"
+    content.materialize("http://unused", sha1, str(destination))
+    assert content.is_linked(sha1, str(destination))
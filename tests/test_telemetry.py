@@ -0,0 +1,154 @@
+import json
+import os
+import sys
+
+import pytest
+
+import telemetry
+from process import GameProcess
+from telemetry import (
+    COLUMNS, GcLogReader, TelemetrySampler, format_summary, gc_log_arguments,
+    heap_limit_mb, parse_gc_line, recommend_heap_mb, summarize,
+)
+
+G1_YOUNG = "[12.345s][info][gc] GC(3) Pause Young (Normal) (G1 Evacuation Pause) 512M->128M(1024M) 3.456ms"
+G1_FULL = "[20.000s][info][gc] GC(4) Pause Full (System.gc()) 600M->200M(1024M) 150.000ms"
+
+
+def test_unified_gc_lines():
+    assert parse_gc_line(G1_YOUNG) == (12.345, 512, 128, 1024, 3.456, False)
+    assert parse_gc_line(G1_FULL)[5] is True
+    assert parse_gc_line(
+        "[1.5s][info][gc] GC(0) Pause Young (Normal) 524288K->131072K(1048576K) 1.5ms"
+    ) == (1.5, 512, 128, 1024, 1.5, False)
+
+
+def test_zgc_percentages_and_missing_pause():
+    assert parse_gc_line(
+        "[30.100s][info][gc] GC(5) Garbage Collection (Allocation Rate) 204M(10%)->48M(2%)"
+    ) == (30.1, 204, 48, None, 0.0, False)
+
+
+def test_legacy_gc_lines():
+    assert parse_gc_line(
+        "12.345: [GC (Allocation Failure)  524288K->131072K(1005056K), 0.0123456 secs]"
+    ) == pytest.approx((12.345, 512, 128, 981.5, 12.3456, False))
+    assert parse_gc_line(
+        "20.0: [Full GC (Ergonomics)  614400K->204800K(1005056K), 0.5 secs]"
+    )[4:] == (500.0, True)
+
+
+def test_other_lines_are_ignored():
+    assert parse_gc_line("[0.010s][info][gc] Using G1") is None
+    assert parse_gc_line("") is None
+
+
+def test_reader_keeps_partial_lines(tmp_path):
+    path = tmp_path / "gc.log"
+    reader = GcLogReader(str(path))
+    assert reader.read() == []
+
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(G1_YOUNG + "\n" + G1_FULL[:30])
+    assert [event[0] for event in reader.read()] == [12.345]
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(G1_FULL[30:] + "\n")
+    assert [event[0] for event in reader.read()] == [20.0]
+    assert reader.read() == []
+
+
+def test_heap_limit_and_gc_log_arguments():
+    assert heap_limit_mb(["java", "-Xmx2G", "-Xmx4096M", "-cp", "x"]) == 4096
+    assert heap_limit_mb(["java", "-Xmx524288k"]) == 512
+    assert heap_limit_mb(["java", "-Xms1G"]) is None
+    assert gc_log_arguments("gc.log", 8) == ["-Xloggc:gc.log"]
+    if os.name != "nt":
+        assert gc_log_arguments("gc.log", 17) == ["-Xlog:gc:file=gc.log:uptime"]
+
+
+def test_old_sessions_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry, "TELEMETRY_MAX_SESSIONS", 3)
+    directory = tmp_path / telemetry.LAUNCHER_DATA_DIRECTORY / "telemetry"
+    directory.mkdir(parents=True)
+    for index in range(5):
+        (directory / f"session-2024010{index}.csv").write_text("")
+        (directory / f"session-2024010{index}-gc.log").write_text("")
+
+    csv_path, gc_path = telemetry.session_paths(str(tmp_path))
+    assert telemetry.session_paths(str(tmp_path))[0] != csv_path
+    assert os.path.dirname(csv_path) == os.path.dirname(gc_path) == str(directory)
+    # Место под новую сессию: остаются две последние
+    assert sorted(os.listdir(directory)) == [
+        "session-20240103-gc.log", "session-20240103.csv",
+        "session-20240104-gc.log", "session-20240104.csv",
+    ]
+
+
+def write_session(path, rows):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("# " + json.dumps({"version": 1, "pid": 1, "started": 100.0, "xmx_mb": 4096}) + "\n")
+        file.write(",".join(COLUMNS) + "\n")
+        file.writelines(row + "\n" for row in rows)
+
+
+def test_summary_and_recommendation(tmp_path):
+    path = str(tmp_path / "session.csv")
+    write_session(path, [
+        "1.0,500.0,2.0,40,0,0,,,",
+        "2.0,600.0,2.5,42,2,8.5,900.0,300.0,4096.0",
+        "broken",
+        "3.0,,,,1,1.5,1000.0,350.0,4096.0",
+    ])
+    summary = summarize(path)
+    assert summary["duration_s"] == 3.0
+    assert summary["peak_rss_mb"] == 600
+    assert summary["cpu_percent"] == 50
+    assert summary["gc_count"] == 3
+    assert summary["gc_pause_ms"] == 10
+    assert (summary["peak_heap_mb"], summary["live_heap_mb"]) == (1000, 350)
+    assert summary["recommended_mb"] == 1024
+    assert format_summary(summary) == (
+        "Peak heap 1000 MB of 4096 MB -Xmx (24%), live data up to 350 MB\n"
+        "Peak RSS 600 MB, 42 threads, 50% CPU\n"
+        "3 collections, 10 ms paused over 3 s"
+    )
+
+    assert recommend_heap_mb({"live_heap_mb": 1000}) == 2560
+    assert recommend_heap_mb({"live_heap_mb": None}) is None
+
+
+def test_empty_session(tmp_path):
+    path = str(tmp_path / "session.csv")
+    write_session(path, [])
+    summary = summarize(path)
+    assert summary["gc_count"] == 0
+    assert summary["recommended_mb"] is None
+    assert format_summary(summary) == (
+        "-Xmx 4096 MB, no collections recorded\n"
+        "0 collections, 0 ms paused over 0 s"
+    )
+
+
+def test_sampler_records_process_and_gc_log(tmp_path):
+    gc_log = tmp_path / "gc.log"
+    gc_log.write_text(G1_YOUNG + "\n")
+    game = GameProcess([
+        sys.executable, "-c",
+        f"import time; time.sleep(0.3); open({str(gc_log)!r}, 'a').write({G1_FULL + chr(10)!r})",
+    ])
+    path = str(tmp_path / "session.csv")
+    sampler = TelemetrySampler(game, path, str(gc_log), xmx_mb=1024, interval=0.05).start()
+    game.wait(10)
+    sampler.thread.join(10)
+
+    header, rows = telemetry.read_session(path)
+    assert header["pid"] == game.pid
+    assert header["xmx_mb"] == 1024
+    assert rows
+    if telemetry.supported():
+        assert rows[0]["rss_mb"] > 0
+        assert rows[0]["threads"] >= 1
+    # Сборка, записанная перед самым выходом, тоже попадает в ряд
+    summary = summarize(path)
+    assert summary["gc_count"] == 2
+    assert summary["peak_heap_mb"] == 600
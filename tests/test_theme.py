@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtGui import QColor, QPalette  # noqa: E402
+from PyQt5.QtWidgets import QApplication, QLabel  # noqa: E402
+
+from constants import ACCENT_COLOR, HOVER_COLOR, MAIN_COLOR  # noqa: E402
+from theme import apply_theme, compile_stylesheet  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance() or QApplication([])
+    apply_theme(app)
+    return app
+
+
+def test_stylesheet_is_compiled_once():
+    stylesheet = compile_stylesheet()
+    assert compile_stylesheet() is stylesheet
+    for color in (MAIN_COLOR, ACCENT_COLOR, HOVER_COLOR):
+        assert color in stylesheet
+
+
+def test_application_gets_palette_and_stylesheet(app):
+    assert app.styleSheet() == compile_stylesheet()
+    assert app.palette().color(QPalette.Window) == QColor(MAIN_COLOR)
+
+
+@pytest.mark.parametrize("role, size", [("title", 24), ("heading", 14), ("label", 12)])
+def test_label_roles_are_styled_by_the_application(app, role, size):
+    label = QLabel("text")
+    label.setProperty("role", role)
+    label.ensurePolished()
+    assert label.styleSheet() == ""
+    assert label.font().pixelSize() == size
+    assert label.font().bold()
+
+
+def test_buttons_have_no_stylesheet_of_their_own(app):
+    from widgets import RoundedButton
+
+    button = RoundedButton("Play")
+    button.ensurePolished()
+    assert button.styleSheet() == ""
+    assert button.font().pixelSize() == 14
+    assert button.font().bold()
@@ -0,0 +1,146 @@
+import json
+import os
+import sys
+import time
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QObject  # noqa: E402
+from PyQt5.QtWidgets import QApplication, QCheckBox  # noqa: E402
+
+import catalog  # noqa: E402
+import launcher  # noqa: E402
+from fixtures import FABRIC_LOADER_VERSION, VERSION_ID  # noqa: E402
+from threads import CatalogLoader, InstanceManager  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def process_events_until(app, condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        app.processEvents()
+        time.sleep(0.01)
+    app.processEvents()
+
+
+def test_catalogs_load_in_parallel_without_blocking(app, monkeypatch):
+    def slow(versions):
+        def load():
+            time.sleep(0.5)
+            return versions
+        return load
+
+    def broken():
+        raise OSError("no network")
+
+    monkeypatch.setattr(catalog, "get_vanilla_versions", slow(["1.20.1"]))
+    monkeypatch.setattr(catalog, "get_forge_versions", slow({"1.20.1-latest": "47.2.0"}))
+    monkeypatch.setattr(catalog, "get_fabric_versions", broken)
+
+    loader = CatalogLoader()
+    loaded = {}
+    loader.catalog_loaded_signal.connect(lambda version_type, versions: loaded.update({version_type: versions}))
+    started = time.monotonic()
+    loader.start()
+    assert time.monotonic() - started < 0.1
+    assert loader.isRunning()
+
+    process_events_until(app, lambda: len(loaded) == 3)
+    # Источники грузятся одновременно, а не один за другим
+    assert time.monotonic() - started < 0.9
+    assert not loader.isRunning()
+    assert loaded == {
+        "Vanilla": ["1.20.1"],
+        "Forge": {"1.20.1-latest": "47.2.0"},
+        "Fabric": None,
+    }
+
+
+class Settings:
+    def __init__(self, **values):
+        self.values = values
+
+    def value(self, key, default=None, type=None):
+        return self.values.get(key, default)
+
+
+class Window(QObject):
+    # Только то, что LaunchThread читает у главного окна
+    def __init__(self, minecraft_directory):
+        super().__init__()
+        self.install_directory_widget = SimpleNamespace(install_directory=minecraft_directory)
+        self.repair_checkbox = QCheckBox()
+        self.shared_store_checkbox = QCheckBox()
+        self.settings = Settings(telemetry=False)
+
+
+@pytest.fixture
+def manager(app, tmp_path, fixture_server):
+    return InstanceManager(Window(str(tmp_path)))
+
+
+def settle(app, manager):
+    process_events_until(app, lambda: not any(instance.isRunning() for instance in manager.instances))
+    for instance in manager.instances:
+        if instance.process is not None:
+            instance.process.wait(10)
+    manager.poll()
+
+
+def test_instances_launch_concurrently_and_are_tracked(app, manager, monkeypatch):
+    monkeypatch.setattr(launcher, "build_command", lambda *args, **kwargs: [
+        sys.executable, "-c", "print('game started')",
+    ])
+    changed = []
+    manager.instance_changed_signal.connect(changed.append)
+    first = manager.launch("Vanilla", VERSION_ID, "", "Steve", 0)
+    second = manager.launch("Vanilla", VERSION_ID, "", "Alex", 0)
+    assert manager.instances == [first, second]
+
+    settle(app, manager)
+    for instance in (first, second):
+        assert instance.error is None
+        assert instance.returncode == 0
+        assert instance.process.log.lines() == ["game started", "Process exited with code 0"]
+        assert instance in changed
+    assert manager.running() == []
+    assert not manager.poll_timer.isActive()
+    assert manager.remove_finished() == [first, second]
+    assert manager.instances == []
+
+
+def test_incompatible_mods_stop_the_launch(app, manager, tmp_path):
+    (tmp_path / "mods").mkdir()
+    with zipfile.ZipFile(tmp_path / "mods" / "sodium.jar", "w") as archive:
+        archive.writestr("fabric.mod.json", json.dumps({
+            "schemaVersion": 1, "id": "sodium", "version": "0.5.8", "depends": {"indium": "*"},
+        }))
+    reports = []
+    manager.instance_added_signal.connect(
+        lambda instance: instance.mod_problems_signal.connect(reports.append)
+    )
+    instance = manager.launch("Fabric", VERSION_ID, FABRIC_LOADER_VERSION, "Steve", 0)
+    settle(app, manager)
+    assert instance.error == "incompatible mods"
+    assert instance.process is None
+    assert "indium" in reports[0]
+
+
+def test_failed_launch_keeps_the_error(app, manager, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("no suitable Java")
+
+    monkeypatch.setattr(launcher, "build_command", fail)
+    instance = manager.launch("Vanilla", VERSION_ID, "", "Steve", 0)
+    settle(app, manager)
+    assert instance.error == "no suitable Java"
+    assert manager.running() == []
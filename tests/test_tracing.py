@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+
+import pytest
+
+import tracing
+from constants import TRACE_MAX_SESSIONS
+from paths import cache_directory
+
+
+def test_old_traces_are_pruned():
+    directory = cache_directory("traces")
+    for number in range(TRACE_MAX_SESSIONS + 5):
+        with open(os.path.join(directory, f"trace-20240101-0000{number:02d}-1.json"), "w") as file:
+            file.write("{}")
+    tracer = tracing.enable()
+    try:
+        with tracing.span("phase"):
+            pass
+    finally:
+        tracing.disable()
+
+    traces = sorted(name for name in os.listdir(directory) if name.startswith("trace-"))
+    assert len(traces) == TRACE_MAX_SESSIONS
+    assert os.path.basename(tracer.path) in traces
+    assert "trace-20240101-000000-1.json" not in traces
+
+
+def test_disabled_span_is_shared_no_op():
+    assert not tracing.enabled()
+    assert tracing.span("a") is tracing.span("b")
+
+
+def load_events(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)["traceEvents"]
+
+
+def test_trace_file_has_spans_phases_and_threads(tmp_path):
+    path = str(tmp_path / "trace.json")
+    tracing.enable(path)
+    try:
+        with tracing.span("install", version="1.20.1") as span:
+            span.set(files=3)
+        with pytest.raises(ValueError):
+            with tracing.span("broken"):
+                raise ValueError("bad")
+        phase = tracing.phases("startup")
+        phase("window")
+        phase("tabs")
+        phase.end()
+        tracing.instant("window shown")
+        worker = threading.Thread(target=lambda: tracing.complete("in worker", 0, 1000, files=1), name="worker")
+        worker.start()
+        worker.join()
+    finally:
+        tracing.disable()
+
+    events = load_events(path)
+    complete = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert list(complete) == ["install", "broken", "startup: window", "startup: tabs", "in worker"]
+    assert complete["install"]["args"] == {"version": "1.20.1", "files": 3}
+    assert complete["broken"]["args"] == {"error": "ValueError('bad')"}
+    assert complete["startup: window"]["ts"] <= complete["startup: tabs"]["ts"]
+    assert complete["in worker"]["dur"] == 1
+    assert [event["name"] for event in events if event["ph"] == "i"] == ["window shown"]
+    threads = {event["args"]["name"] for event in events if event["ph"] == "M"}
+    assert {"MainThread", "worker"} <= threads
+    assert not tracing.enabled()
+
+
+def test_summary_orders_phases_by_total_time(tmp_path):
+    tracer = tracing.Tracer(str(tmp_path / "trace.json"))
+    tracer.complete("resolve", 0, 2_000_000)
+    tracer.complete("download", 0, 5_000_000)
+    tracer.complete("resolve", 0, 4_000_000)
+    tracer.instant("done")
+    assert tracer.summary() == [("resolve", 2, 6.0, 4.0), ("download", 1, 5.0, 5.0)]
+
+
+def test_install_is_traced_by_file_category(tmp_path, fixture_server):
+    from fixtures import VERSION_ID
+    from installer import install_version
+
+    path = str(tmp_path / "trace.json")
+    tracing.enable(path)
+    try:
+        install_version(VERSION_ID, str(tmp_path / "minecraft"), workers=4)
+    finally:
+        tracing.disable()
+
+    names = {event["name"]: event for event in load_events(path) if event["ph"] == "X"}
+    assert {"resolve version", "download", "download libraries", "download assets", "download client"} <= set(names)
+    assert names["download assets"]["args"] == {"files": 200}
@@ -0,0 +1,62 @@
+import os
+
+import installer
+from fixtures import VERSION_ID
+from installer import install_version
+from verification import VerifiedFiles
+
+
+def test_marked_file_is_verified_until_it_changes(tmp_path):
+    path = tmp_path / "libraries" / "lib.jar"
+    path.parent.mkdir()
+    path.write_bytes(b"library")
+    verified = VerifiedFiles(str(tmp_path))
+    assert not verified.is_verified(str(path))
+
+    verified.mark(str(path), "a" * 40)
+    assert verified.is_verified(str(path))
+    assert verified.is_verified(str(path), "a" * 40, len(b"library"))
+    assert not verified.is_verified(str(path), "b" * 40)
+    assert not verified.is_verified(str(path), size=1)
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert not verified.is_verified(str(path))
+
+
+def test_manifest_is_saved_and_reloaded(tmp_path):
+    path = tmp_path / "lib.jar"
+    path.write_bytes(b"library")
+    verified = VerifiedFiles(str(tmp_path))
+    verified.mark(str(path), "a" * 40)
+    verified.save()
+    assert VerifiedFiles(str(tmp_path)).is_verified(str(path), "a" * 40)
+
+    verified.clear()
+    verified.save()
+    assert not VerifiedFiles(str(tmp_path)).is_verified(str(path))
+
+
+def test_missing_file_is_not_verified(tmp_path):
+    path = tmp_path / "lib.jar"
+    path.write_bytes(b"library")
+    verified = VerifiedFiles(str(tmp_path))
+    verified.mark(str(path))
+    os.remove(path)
+    assert not verified.is_verified(str(path))
+    verified.mark(str(path))
+    assert not verified.is_verified(str(path))
+
+
+def test_reinstall_skips_hashing_unless_repairing(tmp_path, fixture_server, monkeypatch):
+    minecraft_directory = str(tmp_path / "minecraft")
+    install_version(VERSION_ID, minecraft_directory, workers=4)
+
+    hashed = []
+    file_sha1 = installer.file_sha1
+    monkeypatch.setattr(installer, "file_sha1", lambda path: hashed.append(path) or file_sha1(path))
+    install_version(VERSION_ID, minecraft_directory, workers=4)
+    assert hashed == []
+
+    install_version(VERSION_ID, minecraft_directory, workers=4, repair=True)
+    assert len(hashed) > 200